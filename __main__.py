@@ -1,19 +1,66 @@
-from src.agents.agents import PublicationWorkflow
+from src.agents.agents import PhaseChunk, PublicationWorkflow
+from src.agents.batch import BatchRunner, load_topics
 from agno.utils.pprint import pprint_run_response
+from src.utils.candidates import SELECTION_POLICIES
+from src.utils.checkpoints import CheckpointStore
+from src.utils.database import Database
 from src.utils.knowledge import Knowledge
+from src.utils.loop_controller import LoopBudget
+from src.utils.metrics import metrics, summary_table
+import argparse
+import asyncio
 import logging
+import os
+from rich.console import Console
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.table import Table
 from src.utils.prompt_loader import PromptLoader
 
 logger = logging.getLogger(__name__)
 
 
-def main():
-    # Load and index documents into the knowledge base (creates ChromaDB collection)
+def load_knowledge():
+    # Incrementally index documents into the knowledge base (creates ChromaDB
+    # collection); only new or modified docs are embedded
     try:
-        Knowledge.knowledge_base.load(recreate=False)
+        Knowledge.sync_index()
     except Exception as e:
         logging.getLogger(__name__).warning(f"Knowledge base load warning: {e}")
 
+
+def print_streaming(responses, console: Console | None = None):
+    """Render workflow responses, showing streamed phases progressively."""
+    console = console or Console()
+    live = None
+    buffer = ""
+    for response in responses:
+        if isinstance(response, PhaseChunk):
+            if live is None:
+                buffer = f"# {response.label}\n\n"
+                live = Live(console=console, transient=True, refresh_per_second=8)
+                live.start()
+            buffer += response.content
+            live.update(Markdown(buffer))
+            continue
+        if live is not None:
+            live.stop()
+            live = None
+        pprint_run_response(response, markdown=True)
+    if live is not None:
+        live.stop()
+
+
+def main(
+    stream: bool = False,
+    num_posts: int = 1,
+    max_revisions: int = 10,
+    budget: LoopBudget | None = None,
+    candidates: int = 1,
+    candidate_policy: str = "best_score",
+):
+    load_knowledge()
+
     # Instead of prompting in console, load the instructions file for Orchestrator
     detalles_publicacion = PromptLoader.load("instrucciones")
 
@@ -21,10 +68,215 @@ def main():
     generate_publications = PublicationWorkflow(
         session_id="generate-publication-session"
     )
-    for phase_response in generate_publications.run(topic=detalles_publicacion):
-        pprint_run_response(phase_response, markdown=True)
+    responses = generate_publications.run(
+        topic=detalles_publicacion,
+        stream=stream,
+        num_posts=num_posts,
+        max_revisions=max_revisions,
+        budget=budget,
+        candidates=candidates,
+        candidate_policy=candidate_policy,
+    )
+    # The id to pass to --resume if the run is interrupted
+    Console().print(f"Run id: [bold]{generate_publications.run_id}[/]")
+    print_streaming(responses)
+    Console().print(summary_table(metrics.events(run_id=generate_publications.run_id)))
     # End of process
 
 
+def main_resume(run_id: str, stream: bool = False):
+    """Continue a run interrupted before publishing, from its last checkpoint."""
+    load_knowledge()
+    workflow = PublicationWorkflow(session_id="generate-publication-session")
+    print_streaming(workflow.resume(run_id, stream=stream))
+    Console().print(summary_table(metrics.events(run_id=run_id)))
+
+
+def main_list_runs(limit: int = 100):
+    """Print the runs that stopped before publishing (see --resume)."""
+    runs = CheckpointStore(Database.shared()).unfinished(limit)
+    table = Table(title="Unfinished runs")
+    for column in ("Run id", "Topic", "Next phase", "Iteration", "Updated (UTC)"):
+        table.add_column(column)
+    for checkpoint in runs:
+        table.add_row(
+            checkpoint.run_id,
+            checkpoint.topic.splitlines()[0][:60] if checkpoint.topic else "",
+            checkpoint.phase,
+            str(checkpoint.iteration),
+            checkpoint.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+    Console().print(table if runs else "No unfinished runs.")
+
+
+def main_batch(
+    topics: list[str],
+    max_workers: int = 4,
+    num_posts: int = 1,
+    max_revisions: int = 10,
+    use_async: bool = False,
+    budget: LoopBudget | None = None,
+    candidates: int = 1,
+    candidate_policy: str = "best_score",
+):
+    """Run the workflow for many topics concurrently and print a timing summary."""
+    load_knowledge()
+
+    console = Console()
+    runner = BatchRunner(
+        max_workers=max_workers,
+        num_posts=num_posts,
+        max_revisions=max_revisions,
+        budget=budget,
+        candidates=candidates,
+        candidate_policy=candidate_policy,
+    )
+
+    def show(event):
+        console.rule(
+            f"[bold cyan]Topic {event.index}[/] · {event.phase} · "
+            f"run {event.response.run_id}"
+        )
+        pprint_run_response(event.response, markdown=True)
+
+    if use_async:
+
+        async def consume():
+            async for event in runner.arun(topics):
+                show(event)
+
+        asyncio.run(consume())
+    else:
+        for event in runner.run(topics):
+            show(event)
+
+    table = Table(title="Batch summary")
+    for column in ("#", "Topic", "Status", "Total", "Phases"):
+        table.add_column(column)
+    for row in runner.summary_rows():
+        table.add_row(*row)
+    console.print(table)
+    console.print(summary_table(metrics.events(), title="Phase metrics (all topics)"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate publications for X")
+    parser.add_argument(
+        "--topics-file",
+        help="Run in batch mode over the topics in this file (.txt one per line, or .json list)",
+    )
+    parser.add_argument(
+        "--topic",
+        action="append",
+        default=[],
+        help="Topic to run in batch mode (can be repeated)",
+    )
+    parser.add_argument(
+        "--max-workers", type=int, default=4, help="Concurrent topics in batch mode"
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Drive batch topics with PublicationWorkflow.arun on one event loop",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue an interrupted run from its last checkpoint",
+    )
+    parser.add_argument(
+        "--list-runs",
+        action="store_true",
+        help="List the runs that stopped before publishing, to use with --resume",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream partial content of every phase as it is generated",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Append per-phase metrics events to this JSONL file",
+    )
+    parser.add_argument(
+        "--db-file",
+        help="SQLite file for the workflow persistence (default: src/db/publication_generation.db)",
+    )
+    parser.add_argument(
+        "--durability",
+        choices=["batched", "sync"],
+        help="Write phase artifacts behind the workflow in batches, or synchronously",
+    )
+    parser.add_argument("--num-posts", type=int, default=1)
+    parser.add_argument("--max-revisions", type=int, default=10)
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=1,
+        help="Write this many drafts in parallel and keep the best one",
+    )
+    parser.add_argument(
+        "--candidate-policy",
+        choices=sorted(SELECTION_POLICIES),
+        default="best_score",
+        help="How the draft candidate to revise is chosen",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        help="Per-topic wall-clock budget; the best draft so far is published",
+    )
+    parser.add_argument(
+        "--max-tokens", type=int, help="Per-topic token budget (input + output)"
+    )
+    parser.add_argument(
+        "--max-cost", type=float, help="Per-topic estimated cost budget in USD"
+    )
+    args = parser.parse_args()
+    if args.stream and (args.topic or args.topics_file):
+        # Streamed chunks of concurrent topics would interleave on the console
+        parser.error("--stream is not supported in batch mode")
+    return args
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.db_file:
+        os.environ["PUBLICATION_DB_FILE"] = args.db_file
+    if args.durability:
+        os.environ["PUBLICATION_DB_DURABILITY"] = args.durability
+    if args.metrics_file:
+        metrics.jsonl_path = args.metrics_file
+    budget = LoopBudget(
+        max_seconds=args.max_seconds,
+        max_tokens=args.max_tokens,
+        max_cost=args.max_cost,
+    )
+    batch_topics = list(args.topic)
+    if args.topics_file:
+        batch_topics.extend(load_topics(args.topics_file))
+    if args.list_runs:
+        main_list_runs()
+    elif args.resume:
+        main_resume(args.resume, stream=args.stream)
+    elif batch_topics:
+        main_batch(
+            batch_topics,
+            max_workers=args.max_workers,
+            num_posts=args.num_posts,
+            max_revisions=args.max_revisions,
+            use_async=args.use_async,
+            budget=budget,
+            candidates=args.candidates,
+            candidate_policy=args.candidate_policy,
+        )
+    else:
+        main(
+            stream=args.stream,
+            num_posts=args.num_posts,
+            max_revisions=args.max_revisions,
+            budget=budget,
+            candidates=args.candidates,
+            candidate_policy=args.candidate_policy,
+        )
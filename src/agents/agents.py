@@ -1,19 +1,63 @@
+import asyncio
+import itertools
 import json
 from agno.agent import Agent
-from agno.models.openai import OpenAIResponses
 from agno.workflow import Workflow, RunResponse, RunEvent
 from dotenv import load_dotenv
 from ..utils.tools import FileSystemTools
 from agno.utils.log import logger
+from ..utils.candidates import Candidate, SelectionPolicy, get_policy
+from ..utils.checkpoints import DONE, DRAFT, LOOP, PUBLISH, Checkpoint
+from ..utils.compaction import action_items, compact_items, count_tokens, fit_prompt
+from ..utils.evaluation import PublicationEvaluation, parse_evaluation
+from ..utils.loop_controller import LoopBudget, RevisionLoopController
 from ..utils.memory import Memory
+from ..utils.metrics import (
+    MetricsRegistry,
+    PhaseEvent,
+    apply_run_response,
+    compaction_stats,
+    metrics,
+    prompt_cache_stats,
+    summarize,
+)
+from ..utils.openai_responses import OpenAIResponses
+from ..utils.phase_cache import PhaseCache
+from ..utils.pre_evaluator import (
+    PreEvaluator,
+    RuleViolation,
+    replace_posts,
+    split_posts,
+)
+from ..utils.scheduler import CallStats, RequestScheduler, scheduler
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Iterator,
+    Union,
+)
+from uuid import uuid4
+import time
 from ..utils.knowledge import Knowledge
 from ..utils.prompt_loader import PromptLoader
 
 load_dotenv()
 
+REWRITE_TASK = "Rewrite the draft addressing all feedback points."
+POST_REWRITE_TASK = (
+    "Rewrite only this post addressing the feedback; keep its "
+    "role in the thread. Return only the new post text."
+)
+
 
 class Publication(BaseModel):
     """Model for storing the final generated publication permanently"""
@@ -27,17 +71,55 @@ class Publication(BaseModel):
     )
 
 
+@dataclass
+class AgentCall:
+    """A pending agent invocation produced by the workflow phase logic"""
+
+    agent: Agent
+    message: str
+    # Phase name: plan, draft, evaluation, revision or publish
+    phase: str = ""
+    # Revision loop iteration (0 outside the loop)
+    iteration: int = 0
+    # Human readable label, matching the "# 2.{iteration} ..." headers
+    label: str = ""
+    # "miss" when the phase cache was consulted, None when not cached
+    cache: Optional[str] = None
+    # Queue time and retries, filled in by the RequestScheduler
+    stats: CallStats = field(default_factory=CallStats)
+
+
+@dataclass
+class ParallelCalls:
+    """Agent invocations the driver runs concurrently (never streamed).
+
+    The driver sends back one result per call, in order: the agent's content,
+    or the exception the call raised.
+    """
+
+    calls: List[AgentCall]
+
+
+@dataclass
+class PhaseChunk(RunResponse):
+    """Partial content of a phase, yielded by ``run(stream=True)``"""
+
+    phase: str = ""
+    iteration: int = 0
+    label: str = ""
+
+
 class PublicationWorkflow(Workflow):
     """Workflow for generating publications and chatting through dms for x using ia"""
 
     orchestrator: Agent = Agent(
         name="Orchestrator",
         role="Orchestrate all the members of the content creation team",
-        model=OpenAIResponses(id="gpt-4.1"),
-        instructions=lambda *args, **kwargs: PromptLoader.load(
-            "orchestrator", knowledge_desc=Knowledge.knowledge_base
-        ),
-        knowledge=Knowledge.knowledge_base,
+        model=OpenAIResponses(id="gpt-4.1", max_retries=0),
+        # Retries go through the workflow's RequestScheduler, not the client
+        # Prompts are static so every call shares a byte-identical prefix
+        # (provider-side prompt caching); per-call data goes in the message
+        instructions=lambda *args, **kwargs: PromptLoader.load("orchestrator"),
         search_knowledge=True,
         markdown=True,
         show_tool_calls=True,
@@ -46,13 +128,10 @@ class PublicationWorkflow(Workflow):
     publication_writer: Agent = Agent(
         name="Writer",
         role="ByteWriter-X, the content engine for BytesBricks AI",
-        model=OpenAIResponses(id="gpt-4.1"),
-        instructions=lambda *args, **kwargs: PromptLoader.load(
-            "instrucciones", plan="${plan}", num_posts="${num_posts}"
-        ),
+        model=OpenAIResponses(id="gpt-4.1", max_retries=0),
+        instructions=lambda *args, **kwargs: PromptLoader.load("instrucciones"),
         reasoning=False,
         tools=[FileSystemTools()],
-        knowledge=Knowledge.knowledge_base,
         search_knowledge=True,
         markdown=True,
         show_tool_calls=True,
@@ -60,9 +139,9 @@ class PublicationWorkflow(Workflow):
     publication_evaluator: Agent = Agent(
         name="Evaluator",
         role="Assesses drafts and decides Publish / Do Not Publish with actionable feedback",
-        model=OpenAIResponses(id="o4-mini"),
+        model=OpenAIResponses(id="o4-mini", max_retries=0),
         instructions=lambda *args, **kwargs: PromptLoader.load("evaluator"),
-        knowledge=Knowledge.knowledge_base,
+        response_model=PublicationEvaluation,
         search_knowledge=True,
         reasoning=False,
         markdown=True,
@@ -71,15 +150,50 @@ class PublicationWorkflow(Workflow):
     publication_publisher: Agent = Agent(
         name="Publisher",
         role="Formats and publishes the approved content to X, returning confirmation",
-        model=OpenAIResponses(id="gpt-4.1"),
+        model=OpenAIResponses(id="gpt-4.1", max_retries=0),
         instructions=lambda *args, **kwargs: PromptLoader.load("publisher"),
-        knowledge=Knowledge.knowledge_base,
         search_knowledge=True,
         tools=[FileSystemTools()],
         markdown=True,
         show_tool_calls=True,
     )
 
+    # Prompt template used by each agent (part of the phase cache key)
+    prompt_templates = {
+        "Orchestrator": "orchestrator",
+        "Writer": "instrucciones",
+        "Evaluator": "evaluator",
+        "Publisher": "publisher",
+    }
+
+    # Stop revising when this many scored evaluations in a row improve no
+    # criterion (nor the total) by at least plateau_min_delta
+    plateau_patience: int = 2
+    plateau_min_delta: float = 1.0
+    # ... when a revision changes less than this fraction of the draft's words
+    min_draft_change: float = 0.02
+    # ... or when the evaluator repeats its feedback (word similarity 0-1)
+    repeated_feedback_similarity: float = 0.9
+    # Per-topic wall-clock/token/cost limits (unlimited by default)
+    budget: LoopBudget = LoopBudget()
+    # Drafts written in parallel for the plan (1 = a single draft), the
+    # policy that picks the one to revise (see utils.candidates) and the
+    # writer temperatures the candidates cycle through
+    candidates: int = 1
+    candidate_policy: str = "best_score"
+    candidate_temperatures = (1.0, 0.7, 1.2, 0.4)
+    # Revisions get the feedback as at most max_action_items fixes, and their
+    # writer message is capped per phase (approximate tokens, see
+    # compaction.count_tokens): over budget the last fixes and then the
+    # neighbouring posts are dropped
+    max_action_items: int = 8
+    prompt_token_budget: Dict[str, int] = {"revision": 4000}
+    # Output tokens assumed when a call is admitted against a model's
+    # tokens-per-minute limit (replaced by the real usage afterwards)
+    expected_output_tokens: int = 1000
+    # Controller of the run in progress; every recorded phase is charged to it
+    _loop_controller: Optional[RevisionLoopController] = None
+
     # --- Cache methods fro each phase --- #
     def get_cached_initial_publication(topic: str) -> Optional[str]:
         session_state = Memory.get_cached_initial_publication(topic)
@@ -131,10 +245,61 @@ class PublicationWorkflow(Workflow):
         delete_publication = Memory.delete_final_publication(topic)
         return delete_publication
 
-    def __init__(self, session_id: str | None = None):
+    def __init__(
+        self,
+        session_id: str | None = None,
+        metrics_registry: Optional[MetricsRegistry] = None,
+        on_duplicate: str = "stop",
+        request_scheduler: Optional[RequestScheduler] = None,
+    ):
         super().__init__(session_id=session_id)
         # Shared memory backend for this workflow
         self.memory: Memory = Memory(session_id=session_id)
+        # Per-phase timings, tokens and tool calls (see utils.metrics)
+        self.metrics: MetricsRegistry = metrics_registry or metrics
+        # Rate limits, priorities and retries of every agent call; shared by
+        # all the workflows of the process unless one is given
+        self.scheduler: RequestScheduler = request_scheduler or scheduler
+        # What to do when the first draft nearly duplicates published
+        # content: "stop" ends the run before the evaluator, "flag" only warns
+        if on_duplicate not in ("stop", "flag"):
+            raise ValueError(
+                f"on_duplicate must be 'stop' or 'flag', got {on_duplicate!r}"
+            )
+        self.on_duplicate = on_duplicate
+        # Local hard-rule checks run before every LLM evaluation
+        self.pre_evaluator = PreEvaluator()
+        # Build the duplicate index while the plan and draft are generated
+        self.memory.duplicates.warm_up(background=True)
+        # Each workflow instance gets its own copy of the agents so several
+        # workflows can run concurrently without sharing run state.
+        self._isolate_agents()
+
+    def _isolate_agents(self) -> None:
+        """Replace the class-level agents with per-instance copies.
+
+        Agents with ``search_knowledge`` search through ``Knowledge.search``,
+        which builds the shared knowledge base on the first search (see
+        ``Knowledge.get``), so neither importing this module nor creating a
+        workflow builds it. It is shared on purpose: it is read-only at run
+        time and copying it would open a new ChromaDB client per workflow.
+        Repeated queries hit the shared retrieval cache.
+        """
+        for name, value in type(self).__dict__.items():
+            if isinstance(value, Agent):
+                setattr(self, name, self._copy_agent(value))
+
+    def _copy_agent(self, agent: Agent, temperature: Optional[float] = None) -> Agent:
+        """Copy of *agent* for this workflow, optionally at another temperature."""
+        update = {"knowledge": agent.knowledge, "session_id": self.session_id}
+        # The retriever alone enables the search tool; the knowledge base is
+        # resolved by Knowledge.search on the first query, not here
+        if agent.search_knowledge and agent.retriever is None:
+            update["retriever"] = Knowledge.search
+        agent_copy = agent.deep_copy(update=update)
+        if temperature is not None and agent_copy.model is not None:
+            agent_copy.model.temperature = temperature
+        return agent_copy
 
     def run(
         self,
@@ -142,174 +307,1190 @@ class PublicationWorkflow(Workflow):
         use_cache: bool = True,
         max_revisions: int = 10,
         num_posts: int = 1,
+        stream: bool = False,
+        pre_evaluate: bool = True,
+        budget: Optional[LoopBudget] = None,
+        candidates: Optional[int] = None,
+        candidate_policy: Optional[str] = None,
+        resume_from: Optional[Checkpoint] = None,
     ) -> Iterator[RunResponse]:
         """End‑to‑end publication workflow.
 
         Fases:
         0. Plan – Orchestrator diseña la estructura del contenido.
-        1. Draft – Writer genera contenido inicial según el plan.
-        2. Evaluation – Evaluator revisa; si *no* aprueba, Writer revisa (loop).
+        1. Draft – Writer genera contenido inicial según el plan (o
+           ``candidates`` borradores en paralelo, y ``candidate_policy`` elige
+           uno); si casi duplica algo ya publicado se detiene (o avisa, ver
+           ``on_duplicate``).
+        2. Evaluation – reglas locales (``pre_evaluate``) y luego Evaluator
+           revisa; si *no* aprueba, Writer revisa (loop). El loop termina al
+           aprobar, al agotar ``max_revisions`` o el ``budget`` (tiempo,
+           tokens, costo) o cuando las revisiones ya no mejoran; sin
+           aprobación se publica el borrador con mejor puntaje.
         3. Publish – Publisher formatea/publica; se persiste la versión final.
+
+        With ``stream=True`` every agent call is streamed and its partial
+        content is yielded as ``PhaseChunk`` responses before the usual
+        per-phase ``RunResponse`` (parallel candidate calls are not streamed).
+
+        Progress is checkpointed under the run id after every phase (and every
+        evaluation and revision of the loop); see :meth:`resume`.
         """
-        logger.info(f"Publication workflow for topic '{topic}' (cache={use_cache})")
-        logger.debug(
-            f"[Workflow] Attempting to retrieve planned publication from memory (use_cache={use_cache}) for topic: {topic}"
+        if resume_from is not None:
+            # Continue under the interrupted run's id, not agno's new one
+            self.run_id = resume_from.run_id
+        steps = self._steps(
+            topic,
+            use_cache,
+            max_revisions,
+            num_posts,
+            pre_evaluate,
+            budget,
+            candidates,
+            candidate_policy,
+            resume_from,
         )
-        plan = self.memory.get_planned_publication(topic) if use_cache else None
-        logger.debug(f"[Workflow] Retrieved plan: {'CACHED' if plan else 'NONE'}")
-        if plan:
-            yield RunResponse(
-                content=f"# 0. Plan (cached)\n\n{plan}", event=RunEvent.run_response
+        result: Optional[str] = None
+        error: Optional[Exception] = None
+        while True:
+            try:
+                step = steps.throw(error) if error else steps.send(result)
+            except StopIteration:
+                return
+            result, error = None, None
+            if isinstance(step, RunResponse):
+                yield step
+                continue
+            if isinstance(step, ParallelCalls):
+                result = self._run_parallel(topic, step)
+                continue
+            started = time.perf_counter()
+            response = None
+            try:
+                if not stream:
+                    response = self.scheduler.call(
+                        partial(step.agent.run, step.message, stream=False),
+                        **self._schedule(step),
+                    )
+                    result = response.content
+                else:
+                    responses = self.scheduler.call(
+                        partial(self._open_stream, step.agent, step.message),
+                        **self._schedule(step),
+                    )
+                    if isinstance(responses, RunResponse):
+                        # Agents with a response_model do not stream
+                        response = responses
+                        result = response.content
+                    else:
+                        result = ""
+                        for chunk in self._stream_chunks(step, responses):
+                            result += chunk.content
+                            yield chunk
+                        response = step.agent.run_response
+            except Exception as e:
+                error = e
+            self._record_call(
+                topic, step, time.perf_counter() - started, response, error
             )
-        else:
-            plan_prompt = {
-                "topic": topic,
-                "task": "Design an outline/plan for an engaging thread for X",
-                "requirements": {"format": "markdown", "structure": "sections"},
-            }
+
+    async def arun(
+        self,
+        topic: str,
+        use_cache: bool = True,
+        max_revisions: int = 10,
+        num_posts: int = 1,
+        stream: bool = False,
+        pre_evaluate: bool = True,
+        budget: Optional[LoopBudget] = None,
+        candidates: Optional[int] = None,
+        candidate_policy: Optional[str] = None,
+        resume_from: Optional[Checkpoint] = None,
+    ) -> AsyncIterator[RunResponse]:
+        """Async version of :meth:`run`.
+
+        Runs the same phases and yields the same ``RunResponse`` sequence, but
+        every agent call goes through ``Agent.arun`` so many workflows can be
+        driven concurrently from a single event loop.
+        """
+        self.set_workflow_id()
+        self.set_session_id()
+        self.run_id = resume_from.run_id if resume_from else str(uuid4())
+        steps = self._steps(
+            topic,
+            use_cache,
+            max_revisions,
+            num_posts,
+            pre_evaluate,
+            budget,
+            candidates,
+            candidate_policy,
+            resume_from,
+        )
+        result: Optional[str] = None
+        error: Optional[Exception] = None
+        while True:
             try:
-                plan_resp = self.orchestrator.run(
-                    json.dumps(plan_prompt, indent=4), stream=False
-                )
-                plan = plan_resp.content
-                self.memory.add_planened_publication(topic, plan)
-                yield RunResponse(
-                    content=f"# 0. Plan\n\n{plan}", event=RunEvent.run_response
+                step = steps.throw(error) if error else steps.send(result)
+            except StopIteration:
+                return
+            result, error = None, None
+            if isinstance(step, RunResponse):
+                step.run_id = self.run_id
+                step.session_id = self.session_id
+                step.workflow_id = self.workflow_id
+                yield step
+                continue
+            if isinstance(step, ParallelCalls):
+                result = await self._arun_parallel(topic, step)
+                continue
+            started = time.perf_counter()
+            response = None
+            try:
+                if not stream:
+                    response = await self.scheduler.acall(
+                        partial(step.agent.arun, step.message, stream=False),
+                        **self._schedule(step),
+                    )
+                else:
+                    response = await self.scheduler.acall(
+                        partial(self._aopen_stream, step.agent, step.message),
+                        **self._schedule(step),
+                    )
+                if not stream or isinstance(response, RunResponse):
+                    result = response.content
+                else:
+                    result = ""
+                    async for part in response:
+                        for chunk in self._stream_chunks(step, [part]):
+                            chunk.run_id = self.run_id
+                            chunk.session_id = self.session_id
+                            chunk.workflow_id = self.workflow_id
+                            result += chunk.content
+                            yield chunk
+                    response = step.agent.run_response
+            except Exception as e:
+                error = e
+            self._record_call(
+                topic, step, time.perf_counter() - started, response, error
+            )
+
+    def _resume_kwargs(self, run_id: str) -> Dict[str, Any]:
+        """Arguments of :meth:`run` that continue the checkpointed run."""
+        checkpoint = self.memory.get_checkpoint(run_id)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint for run {run_id!r}")
+        if checkpoint.phase == DONE:
+            raise ValueError(f"Run {run_id!r} already finished")
+        logger.info(
+            f"[Workflow] Resuming run {run_id} for '{checkpoint.topic}' at "
+            f"{checkpoint.phase} (iteration {checkpoint.iteration})"
+        )
+        options = dict(checkpoint.options)
+        options["budget"] = LoopBudget(**options.get("budget", {}))
+        return {"topic": checkpoint.topic, "resume_from": checkpoint, **options}
+
+    def resume(self, run_id: str, stream: bool = False) -> Iterator[RunResponse]:
+        """Continue an interrupted run from its last checkpoint.
+
+        The run keeps its id and its original arguments; phases already
+        completed are not run again, the revision loop goes on from the
+        checkpointed iteration (reusing the last verdict if the writer had
+        not acted on it yet) with the budget it had left.
+        """
+        return self.run(stream=stream, **self._resume_kwargs(run_id))
+
+    def aresume(self, run_id: str, stream: bool = False) -> AsyncIterator[RunResponse]:
+        """Async version of :meth:`resume`."""
+        return self.arun(stream=stream, **self._resume_kwargs(run_id))
+
+    def _save_checkpoint(self, checkpoint: Checkpoint, **changes) -> None:
+        """Update *checkpoint* with *changes* and the loop state, and store it."""
+        for name, value in changes.items():
+            setattr(checkpoint, name, value)
+        if self._loop_controller is not None:
+            checkpoint.loop = self._loop_controller.state()
+        self.memory.save_checkpoint(checkpoint)
+
+    def _schedule(self, step: AgentCall) -> Dict[str, Any]:
+        """Scheduler arguments of *step*: model, phase and token estimate."""
+        model = step.agent.model
+        model_id = model.id if model is not None else ""
+        template = self.prompt_templates.get(step.agent.name)
+        tokens = count_tokens(step.message, model_id) + self.expected_output_tokens
+        if template:
+            tokens += count_tokens(PromptLoader.source(template), model_id)
+        return {
+            "model_id": model_id,
+            "phase": step.phase,
+            "tokens": tokens,
+            "stats": step.stats,
+        }
+
+    @staticmethod
+    def _open_stream(agent: Agent, message: str):
+        """Start a streamed run and wait for its first response.
+
+        Errors of the request itself surface here, where the scheduler can
+        still retry them; once content flows a failure ends the phase.
+        """
+        responses = agent.run(message, stream=True)
+        if isinstance(responses, RunResponse):
+            return responses
+        responses = iter(responses)
+        first = next(responses, None)
+        return itertools.chain([first] if first is not None else [], responses)
+
+    @staticmethod
+    async def _aopen_stream(agent: Agent, message: str):
+        """Async version of :meth:`_open_stream`."""
+        responses = await agent.arun(message, stream=True)
+        if isinstance(responses, RunResponse):
+            return responses
+        try:
+            first = await responses.__anext__()
+        except StopAsyncIteration:
+            first = None
+
+        async def chained():
+            if first is not None:
+                yield first
+            async for part in responses:
+                yield part
+
+        return chained()
+
+    def _run_parallel(self, topic: str, step: ParallelCalls) -> List[Any]:
+        """Run the calls of *step* on threads, see :class:`ParallelCalls`."""
+
+        def call(agent_call: AgentCall):
+            started = time.perf_counter()
+            try:
+                response = self.scheduler.call(
+                    partial(agent_call.agent.run, agent_call.message, stream=False),
+                    **self._schedule(agent_call),
                 )
+                return time.perf_counter() - started, response, None
             except Exception as e:
-                logger.error(f"Plan generation failed: {e}")
-                yield RunResponse(
-                    content=f"Error during plan generation: {e}",
-                    event=RunEvent.run_error,
+                return time.perf_counter() - started, None, e
+
+        with ThreadPoolExecutor(max_workers=len(step.calls)) as pool:
+            outcomes = list(pool.map(call, step.calls))
+        return self._parallel_results(topic, step, outcomes)
+
+    async def _arun_parallel(self, topic: str, step: ParallelCalls) -> List[Any]:
+        """Async version of :meth:`_run_parallel`, on the running event loop."""
+
+        async def call(agent_call: AgentCall):
+            started = time.perf_counter()
+            try:
+                response = await self.scheduler.acall(
+                    partial(agent_call.agent.arun, agent_call.message, stream=False),
+                    **self._schedule(agent_call),
                 )
-                return
+                return time.perf_counter() - started, response, None
+            except Exception as e:
+                return time.perf_counter() - started, None, e
 
-        # ---------------- 1) DRAFT ---------------- #
-        logger.debug(
-            f"[Workflow] Attempting to retrieve initial draft from memory (use_cache={use_cache}) for topic: {topic}"
-        )
-        draft = self.memory.get_cached_initial_publication(topic) if use_cache else None
-        logger.debug(f"[Workflow] Retrieved draft: {'CACHED' if draft else 'NONE'}")
-        if draft:
-            yield RunResponse(
-                content=f"# 1. Draft (cached)\n\n{draft}",
+        outcomes = await asyncio.gather(*(call(c) for c in step.calls))
+        return self._parallel_results(topic, step, outcomes)
+
+    def _parallel_results(
+        self, topic: str, step: ParallelCalls, outcomes: List[tuple]
+    ) -> List[Any]:
+        # Recorded from the driver's thread, like sequential calls
+        results = []
+        for agent_call, (duration, response, error) in zip(step.calls, outcomes):
+            self._record_call(topic, agent_call, duration, response, error)
+            results.append(error if error else response.content)
+        return results
+
+    @staticmethod
+    def _stream_chunks(step: AgentCall, responses) -> Iterator[PhaseChunk]:
+        """Turn an agent's streamed responses into ``PhaseChunk`` deltas.
+
+        Agents that cannot stream (e.g. with a ``response_model``) return a
+        single ``RunResponse``; it is forwarded as one chunk.
+        """
+        if isinstance(responses, RunResponse):
+            responses = [responses]
+        for response in responses:
+            if response.event != RunEvent.run_response:
+                continue
+            if not isinstance(response.content, str) or not response.content:
+                continue
+            yield PhaseChunk(
+                content=response.content,
                 event=RunEvent.run_response,
+                phase=step.phase,
+                iteration=step.iteration,
+                label=step.label,
             )
-        else:
-            writer_prompt = {
-                "plan": plan,
-                "num_posts": num_posts,
-            }
-            try:
-                draft_resp = self.publication_writer.run(
-                    json.dumps(writer_prompt, indent=4), stream=False
+
+    def _record_phase(
+        self,
+        topic: str,
+        phase: str,
+        agent: Agent,
+        iteration: int = 0,
+        label: str = "",
+        cache: Optional[str] = None,
+        duration: float = 0.0,
+        response: Optional[RunResponse] = None,
+        error: Optional[Exception] = None,
+        termination: Optional[str] = None,
+        stats: Optional[CallStats] = None,
+        prompt_tokens: int = 0,
+        uncompacted_prompt_tokens: int = 0,
+    ) -> PhaseEvent:
+        """Record a ``PhaseEvent`` for a phase in ``self.metrics``."""
+        event = PhaseEvent(
+            run_id=self.run_id,
+            session_id=self.session_id,
+            topic=topic,
+            phase=phase,
+            iteration=iteration,
+            label=label,
+            agent=agent.name or "",
+            model_id=agent.model.id if agent.model is not None else "",
+            cache=cache,
+            duration=duration,
+            status="error" if error else "ok",
+            error=str(error) if error else None,
+            termination=termination,
+            retries=stats.retries if stats else 0,
+            queue_time=stats.wait if stats else 0.0,
+            prompt_tokens=prompt_tokens,
+            uncompacted_prompt_tokens=uncompacted_prompt_tokens,
+        )
+        if error is None:
+            apply_run_response(event, response)
+        self.metrics.record(event)
+        if self._loop_controller is not None:
+            self._loop_controller.charge(event)
+        return event
+
+    def _record_call(
+        self,
+        topic: str,
+        step: AgentCall,
+        duration: float,
+        response: Optional[RunResponse],
+        error: Optional[Exception],
+    ) -> PhaseEvent:
+        return self._record_phase(
+            topic,
+            step.phase,
+            step.agent,
+            iteration=step.iteration,
+            label=step.label,
+            cache=step.cache,
+            duration=duration,
+            response=response,
+            error=error,
+            stats=step.stats,
+        )
+
+    def _phase_key(self, phase: str, agent: Agent, topic: str, **inputs) -> str:
+        """Content-addressed cache key for a phase run by *agent*."""
+        template = PromptLoader.source(self.prompt_templates[agent.name])
+        model_id = agent.model.id if agent.model is not None else ""
+        return PhaseCache.make_key(
+            phase=phase, topic=topic, template=template, model_id=model_id, **inputs
+        )
+
+    @staticmethod
+    def _agent_input(task: str, **data) -> str:
+        """Message for an agent: the static task first, per-call data after.
+
+        With the static instructions in the system prompt this keeps a long
+        byte-identical prefix across calls, which the provider's prompt cache
+        reuses; order *data* from the most to the least stable value.
+        """
+        return json.dumps({"task": task, **data}, ensure_ascii=False, indent=4)
+
+    @classmethod
+    def _evaluation_message(cls, draft: str) -> str:
+        return cls._agent_input(
+            "Evaluate the draft and return your structured verdict.", draft=draft
+        )
+
+    @classmethod
+    def _draft_message(cls, plan: str, num_posts: int) -> str:
+        return cls._agent_input(
+            "Write the posts that execute the plan.", num_posts=num_posts, plan=plan
+        )
+
+    def _draft_candidates(
+        self,
+        topic: str,
+        message: str,
+        num_posts: int,
+        count: int,
+        policy: SelectionPolicy,
+        pre_evaluate: bool,
+        cache: Optional[str],
+    ) -> Generator[ParallelCalls, List[Any], Optional[Candidate]]:
+        """Write *count* drafts in parallel and pick one with *policy*.
+
+        Every candidate goes through the local rule checks; with an evaluating
+        policy the ones that pass are scored by the evaluator in parallel too
+        (verdicts are cached by draft like in the loop). Returns the chosen
+        candidate, or None when every writer call failed.
+        """
+        temperatures = [
+            self.candidate_temperatures[k % len(self.candidate_temperatures)]
+            for k in range(count)
+        ]
+        results = yield ParallelCalls(
+            [
+                AgentCall(
+                    self._copy_agent(self.publication_writer, temperature=t),
+                    message,
+                    phase="draft",
+                    label=f"1.{k} Candidate",
+                    cache=cache,
                 )
-                draft = draft_resp.content
-                self.memory.add_initial_publication_to_cache(topic, draft)
-                logger.debug(
-                    f"[Workflow] Initial draft saved to memory for topic: {topic}"
+                for k, t in enumerate(temperatures, 1)
+            ]
+        )
+        candidates: List[Candidate] = []
+        for k, (temperature, result) in enumerate(zip(temperatures, results), 1):
+            if isinstance(result, Exception):
+                logger.warning(f"[Workflow] Draft candidate {k} failed: {result}")
+                continue
+            candidates.append(
+                Candidate(
+                    index=k,
+                    draft=result,
+                    temperature=temperature,
+                    pre_evaluation=(
+                        self.pre_evaluator.evaluate(result, num_posts=num_posts)
+                        if pre_evaluate
+                        else None
+                    ),
                 )
-                yield RunResponse(
-                    content=f"# 1. Draft\n\n{draft}", event=RunEvent.run_response
+            )
+        scored = [c for c in candidates if not c.violations] if policy.evaluate else []
+        if scored:
+            keys = [
+                self._phase_key(
+                    "evaluation", self.publication_evaluator, topic, draft=c.draft
                 )
-            except Exception as e:
-                logger.error(f"Draft generation failed: {e}")
-                yield RunResponse(
-                    content=f"Error during draft generation: {e}",
-                    event=RunEvent.run_error,
+                for c in scored
+            ]
+            verdicts = yield ParallelCalls(
+                [
+                    AgentCall(
+                        self._copy_agent(self.publication_evaluator),
+                        self._evaluation_message(c.draft),
+                        phase="evaluation",
+                        label=f"1.{c.index} Candidate evaluation",
+                        cache=cache,
+                    )
+                    for c in scored
+                ]
+            )
+            for candidate, key, result in zip(scored, keys, verdicts):
+                if isinstance(result, Exception):
+                    logger.warning(
+                        f"[Workflow] Evaluation of candidate {candidate.index} "
+                        f"failed: {result}"
+                    )
+                    continue
+                candidate.verdict = parse_evaluation(result)
+                self.memory.add_evaluation_to_cache(
+                    topic, candidate.verdict.model_dump_json(), key=key
                 )
-                return
+        if not candidates:
+            return None
+        chosen = policy.select(candidates)
+        logger.info(
+            f"[Workflow] Chose draft candidate {chosen.index} of {count} for "
+            f"'{topic}' ({policy.name}, score={chosen.score}, "
+            f"violations={chosen.violations})"
+        )
+        return chosen
 
-        # ---------------- 2) EVALUACIÓN & REVISIONES ---------------- #
-        approved = False
-        iteration = 0
-        while not approved and iteration < max_revisions:
-            evaluation = (
-                self.memory.get_cached_evaluation(topic)
-                if use_cache and iteration == 0
-                else None
+    @staticmethod
+    def _post_issues(
+        posts: List[str],
+        verdict: Optional[PublicationEvaluation] = None,
+        violations: Optional[List[RuleViolation]] = None,
+    ) -> Optional[Dict[int, List[str]]]:
+        """Issues by post number when only some of the *posts* must change.
+
+        None means the whole draft is rewritten: a single post, thread-level
+        problems (failed gates, general recommendations, rules without a
+        post) or no post-specific feedback at all.
+        """
+        if len(posts) < 2:
+            return None
+        issues: Dict[int, List[str]] = {}
+        if violations:
+            for violation in violations:
+                if violation.post is None:
+                    return None
+                issues.setdefault(violation.post, []).append(
+                    f"{violation.rule}: {violation.message}"
+                )
+        elif verdict is not None:
+            if verdict.failed_gates or verdict.recommendations:
+                return None
+            issues = verdict.failed_posts()
+        if not issues or not all(1 <= n <= len(posts) for n in issues):
+            return None
+        return issues
+
+    def _fit_revision(self, task: str, data: Dict[str, Any], trim: tuple) -> str:
+        """Writer message for *task*, within the "revision" token budget."""
+        model = self.publication_writer.model
+        return fit_prompt(
+            partial(self._agent_input, task),
+            data,
+            self.prompt_token_budget.get("revision"),
+            trim=trim,
+            model_id=model.id if model is not None else "gpt-4.1",
+        )
+
+    def _revision_message(self, draft: str, items: List[str]) -> str:
+        return self._fit_revision(
+            REWRITE_TASK, {"draft": draft, "feedback": items}, ("feedback",)
+        )
+
+    def _post_messages(
+        self, posts: List[str], issues: Dict[int, List[str]]
+    ) -> Dict[int, str]:
+        """Writer message of every failed post, by post number."""
+        return {
+            number: self._fit_revision(
+                POST_REWRITE_TASK,
+                {
+                    "total_posts": len(posts),
+                    "post_number": number,
+                    "previous_post": posts[number - 2] if number > 1 else None,
+                    "post": posts[number - 1],
+                    "next_post": posts[number] if number < len(posts) else None,
+                    "feedback": compact_items(issues[number], self.max_action_items),
+                },
+                ("feedback", "next_post", "previous_post"),
+            )
+            for number in sorted(issues)
+        }
+
+    def _record_compaction(
+        self,
+        topic: str,
+        iteration: int,
+        draft: str,
+        evaluation: str,
+        messages: List[str],
+    ) -> PhaseEvent:
+        """Record the writer prompt tokens of a revision before/after compaction.
+
+        "Before" is the full draft plus the full evaluation text, the prompt
+        a revision used to send.
+        """
+        model = self.publication_writer.model
+        model_id = model.id if model is not None else "gpt-4.1"
+        before = count_tokens(
+            self._agent_input(REWRITE_TASK, draft=draft, feedback=evaluation),
+            model_id,
+        )
+        after = sum(count_tokens(message, model_id) for message in messages)
+        logger.info(
+            f"[Workflow] Revision {iteration} prompt for '{topic}': "
+            f"{before} -> {after} tokens"
+        )
+        return self._record_phase(
+            topic,
+            "compaction",
+            self.publication_writer,
+            iteration=iteration,
+            label=f"2.{iteration} Compaction",
+            prompt_tokens=after,
+            uncompacted_prompt_tokens=before,
+        )
+
+    def _rewrite_posts(
+        self,
+        iteration: int,
+        messages: Dict[int, str],
+        cache: Optional[str],
+    ) -> Generator[ParallelCalls, List[Any], Dict[int, str]]:
+        """Rewrite the failed posts in parallel, one writer call per post.
+
+        Each call (see :meth:`_post_messages`) sees its post, the feedback on
+        it and its neighbours (for continuity), so a revision costs in
+        proportion to the failing posts and not to the length of the thread.
+        Returns the new text of the rewritten posts by number (a post whose
+        call fails is left out, kept as it was); if every call fails the first
+        error is raised.
+        """
+        numbers = sorted(messages)
+        calls = [
+            AgentCall(
+                self._copy_agent(self.publication_writer),
+                messages[number],
+                phase="revision",
+                iteration=iteration,
+                label=f"2.{iteration}.{number} Post revision",
+                cache=cache,
             )
+            for number in numbers
+        ]
+        results = yield ParallelCalls(calls)
+        rewritten = {}
+        errors = []
+        for number, result in zip(numbers, results):
+            if isinstance(result, Exception):
+                logger.warning(f"[Workflow] Rewrite of post {number} failed: {result}")
+                errors.append(result)
+            else:
+                rewritten[number] = result.strip()
+        if len(errors) == len(numbers):
+            raise errors[0]
+        return rewritten
+
+    def _steps(
+        self, *args, **kwargs
+    ) -> Generator[Union[RunResponse, AgentCall, ParallelCalls], Any, None]:
+        """:meth:`_phases`, closed by :meth:`_finish_run` on every exit path.
+
+        Published, stopped as a duplicate, ended by a phase error or abandoned
+        by the caller: the run's queued writes are flushed either way.
+        """
+        try:
+            yield from self._phases(*args, **kwargs)
+        finally:
+            self._finish_run()
+
+    def _finish_run(self) -> None:
+        """Make the run's artifacts durable and log its summary."""
+        # Write-behind: make this run's artifacts durable before returning
+        self.memory.flush()
+        logger.info(f"[Workflow] Phase cache stats: {self.memory.phase_cache.stats()}")
+        logger.info(f"[Workflow] Retrieval stats: {Knowledge.retrieval_stats()}")
+        events = self.metrics.events(run_id=self.run_id)
+        logger.info(f"[Workflow] Phase metrics: {summarize(events)}")
+        logger.info(f"[Workflow] Prompt cache: {prompt_cache_stats(events)}")
+        logger.info(f"[Workflow] Prompt compaction: {compaction_stats(events)}")
+        logger.info(f"[Workflow] Scheduler stats: {self.scheduler.stats()}")
+
+    def _phases(
+        self,
+        topic: str,
+        use_cache: bool,
+        max_revisions: int,
+        num_posts: int,
+        pre_evaluate: bool = True,
+        budget: Optional[LoopBudget] = None,
+        candidates: Optional[int] = None,
+        candidate_policy: Optional[str] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Generator[Union[RunResponse, AgentCall, ParallelCalls], Any, None]:
+        """Phase logic shared by :meth:`run` and :meth:`arun`.
+
+        Yields ``RunResponse`` objects to hand to the caller and ``AgentCall``
+        objects that the driver executes; the agent's content is sent back
+        into the generator (or the agent's exception is thrown into it).
+        ``ParallelCalls`` get the list of their results back.
+        """
+        logger.info(f"Publication workflow for topic '{topic}' (cache={use_cache})")
+        num_candidates = self.candidates if candidates is None else candidates
+        if num_candidates < 1:
+            raise ValueError(f"candidates must be >= 1, got {num_candidates}")
+        policy = get_policy(candidate_policy or self.candidate_policy)
+        # Budgets cover the whole run: plan and draft are charged too
+        controller = self._loop_controller = RevisionLoopController(
+            max_revisions,
+            budget or self.budget,
+            min_draft_change=self.min_draft_change,
+            repeat_similarity=self.repeated_feedback_similarity,
+            plateau_patience=self.plateau_patience,
+            plateau_min_delta=self.plateau_min_delta,
+        )
+        # Durable progress of the run, see resume()
+        if checkpoint is None:
+            checkpoint = Checkpoint(
+                run_id=self.run_id or self.session_id or str(uuid4()),
+                session_id=self.session_id,
+                topic=topic,
+                options={
+                    "use_cache": use_cache,
+                    "max_revisions": max_revisions,
+                    "num_posts": num_posts,
+                    "pre_evaluate": pre_evaluate,
+                    "budget": (budget or self.budget).model_dump(),
+                    "candidates": num_candidates,
+                    "candidate_policy": policy.name,
+                },
+            )
+            self._save_checkpoint(checkpoint)
+        else:
+            controller.restore(checkpoint.loop)
+            yield RunResponse(
+                content=(
+                    f"# Resumed ({checkpoint.phase}, iteration {checkpoint.iteration})"
+                    f"\n\nRun {checkpoint.run_id} continues from its last checkpoint."
+                ),
+                event=RunEvent.run_response,
+            )
+        cache = "miss" if use_cache else None
+        plan = checkpoint.plan
+        if plan is None:
             logger.debug(
-                f"[Workflow] Retrieved evaluation: {'CACHED' if evaluation else 'NONE'}"
+                f"[Workflow] Attempting to retrieve planned publication from memory (use_cache={use_cache}) for topic: {topic}"
+            )
+            plan_key = self._phase_key("plan", self.orchestrator, topic)
+            plan = (
+                self.memory.get_planned_publication(topic, key=plan_key)
+                if use_cache
+                else None
             )
-            if not evaluation:
-                eval_prompt = {
-                    "draft": draft,
-                    "task": "Evaluate the draft. Reply 'Publish' or provide feedback.",
-                }
+            logger.debug(f"[Workflow] Retrieved plan: {'CACHED' if plan else 'NONE'}")
+            if plan:
+                self._record_phase(
+                    topic, "plan", self.orchestrator, label="0. Plan", cache="hit"
+                )
+                yield RunResponse(
+                    content=f"# 0. Plan (cached)\n\n{plan}", event=RunEvent.run_response
+                )
+            else:
+                plan_prompt = self._agent_input(
+                    "Design an outline/plan for an engaging thread for X",
+                    requirements={"format": "markdown", "structure": "sections"},
+                    topic=topic,
+                )
                 try:
-                    eval_resp = self.publication_evaluator.run(
-                        json.dumps(eval_prompt, indent=4), stream=False
+                    plan = yield AgentCall(
+                        self.orchestrator,
+                        plan_prompt,
+                        phase="plan",
+                        label="0. Plan",
+                        cache=cache,
                     )
-                    evaluation = eval_resp.content
-                    self.memory.add_evaluation_to_cache(topic, evaluation)
-                    logger.debug(
-                        f"[Workflow] Evaluation saved to memory for topic: {topic}"
+                    self.memory.add_planened_publication(topic, plan, key=plan_key)
+                    yield RunResponse(
+                        content=f"# 0. Plan\n\n{plan}", event=RunEvent.run_response
                     )
                 except Exception as e:
-                    logger.error(f"Evaluation failed: {e}")
+                    logger.error(f"Plan generation failed: {e}")
                     yield RunResponse(
-                        content=f"Error during evaluation: {e}",
+                        content=f"Error during plan generation: {e}",
                         event=RunEvent.run_error,
                     )
                     return
-            yield RunResponse(
-                content=f"# 2.{iteration} Evaluation\n\n{evaluation}",
-                event=RunEvent.run_response,
-            )
+            self._save_checkpoint(checkpoint, phase=DRAFT, plan=plan)
 
-            # Determine approval status strictly:
-            eval_lower = evaluation.lower()
-            positive = any(word in eval_lower for word in ("publish", "approved"))
-            negative = any(
-                phrase in eval_lower
-                for phrase in ("do not publish", "revision_required", "do not publish")
+        # ---------------- 1) DRAFT ---------------- #
+        draft = checkpoint.draft
+        # Verdict on the draft not acted upon yet (the chosen candidate's, or
+        # the last one of a resumed run), reused by the next loop evaluation
+        seeded: Optional[PublicationEvaluation] = checkpoint.evaluation
+        if draft is None:
+            logger.debug(
+                f"[Workflow] Attempting to retrieve initial draft from memory (use_cache={use_cache}) for topic: {topic}"
             )
-            if positive and not negative:
-                approved = True
-                break
-
-            # Solicitar revisión al Writer
-            iteration += 1
-            rewrite_prompt = {
-                "draft": draft,
-                "feedback": evaluation,
-                "task": "Rewrite the draft addressing all feedback points.",
-            }
-            try:
-                rev_resp = self.publication_writer.run(
-                    json.dumps(rewrite_prompt, indent=4), stream=False
+            # The chosen candidate is cached apart from single drafts
+            multi = (
+                {"candidates": num_candidates, "policy": policy.name}
+                if num_candidates > 1
+                else {}
+            )
+            draft_key = self._phase_key(
+                "draft",
+                self.publication_writer,
+                topic,
+                plan=plan,
+                num_posts=num_posts,
+                **multi,
+            )
+            draft = (
+                self.memory.get_cached_initial_publication(topic, key=draft_key)
+                if use_cache
+                else None
+            )
+            logger.debug(f"[Workflow] Retrieved draft: {'CACHED' if draft else 'NONE'}")
+            if draft:
+                self._record_phase(
+                    topic,
+                    "draft",
+                    self.publication_writer,
+                    label="1. Draft",
+                    cache="hit",
+                )
+                yield RunResponse(
+                    content=f"# 1. Draft (cached)\n\n{draft}",
+                    event=RunEvent.run_response,
                 )
-                draft = rev_resp.content
-                self.memory.add_improved_publication_to_cache(topic, draft)
-                logger.debug(
-                    f"[Workflow] Improved draft saved to memory for topic: {topic}"
+            elif num_candidates > 1:
+                chosen = yield from self._draft_candidates(
+                    topic,
+                    self._draft_message(plan, num_posts),
+                    num_posts,
+                    num_candidates,
+                    policy,
+                    pre_evaluate,
+                    cache,
+                )
+                if chosen is None:
+                    yield RunResponse(
+                        content=(
+                            "Error during draft generation: all "
+                            f"{num_candidates} candidates failed"
+                        ),
+                        event=RunEvent.run_error,
+                    )
+                    return
+                draft, seeded = chosen.draft, chosen.verdict
+                self.memory.add_initial_publication_to_cache(
+                    topic, draft, key=draft_key
                 )
                 yield RunResponse(
-                    content=f"# 2.{iteration} Revision\n\n{draft}",
+                    content=(
+                        f"# 1. Draft (candidate {chosen.index} of {num_candidates}, "
+                        f"{policy.name})\n\n{draft}"
+                    ),
                     event=RunEvent.run_response,
                 )
-            except Exception as e:
-                logger.error(f"Revision failed: {e}")
+            else:
+                try:
+                    draft = yield AgentCall(
+                        self.publication_writer,
+                        self._draft_message(plan, num_posts),
+                        phase="draft",
+                        label="1. Draft",
+                        cache=cache,
+                    )
+                    self.memory.add_initial_publication_to_cache(
+                        topic, draft, key=draft_key
+                    )
+                    logger.debug(
+                        f"[Workflow] Initial draft saved to memory for topic: {topic}"
+                    )
+                    yield RunResponse(
+                        content=f"# 1. Draft\n\n{draft}", event=RunEvent.run_response
+                    )
+                except Exception as e:
+                    logger.error(f"Draft generation failed: {e}")
+                    yield RunResponse(
+                        content=f"Error during draft generation: {e}",
+                        event=RunEvent.run_error,
+                    )
+                    return
+
+            # Near-duplicate of something already published? Check before spending
+            # evaluator and revision calls on it.
+            duplicate = self.memory.find_duplicate_publication(draft)
+            if duplicate is not None:
+                logger.warning(
+                    f"Draft for '{topic}' is a near-duplicate of {duplicate.key} "
+                    f"(similarity {duplicate.similarity:.2f})"
+                )
                 yield RunResponse(
-                    content=f"Error during revision: {e}", event=RunEvent.run_error
+                    content=(
+                        f"# 1. Duplicate\n\nThe draft is {duplicate.similarity:.0%} similar "
+                        f"to the already published {duplicate.key}."
+                    ),
+                    event=RunEvent.run_response,
                 )
-                return
+                if self.on_duplicate == "stop":
+                    self._save_checkpoint(checkpoint, phase=DONE)
+                    return
+            self._save_checkpoint(
+                checkpoint, phase=LOOP, draft=draft, evaluation=seeded
+            )
+
+        # ---------------- 2) EVALUACIÓN & REVISIONES ---------------- #
+        approved = checkpoint.approved
+        iteration = checkpoint.iteration
+        if checkpoint.phase == LOOP:
+            loop_started = time.perf_counter()
+            while controller.check_budget(iteration) is None:
+                # Hard rules are checked locally first: a draft that breaks one
+                # goes back to the writer without spending an evaluator call.
+                started = time.perf_counter()
+                pre_evaluation = (
+                    self.pre_evaluator.evaluate(draft, num_posts=num_posts)
+                    if pre_evaluate
+                    else None
+                )
+                if pre_evaluation is not None and not pre_evaluation.passed:
+                    evaluation = pre_evaluation.feedback()
+                    items = action_items(
+                        violations=pre_evaluation.violations,
+                        max_items=self.max_action_items,
+                    )
+                    posts = pre_evaluation.posts
+                    post_issues = self._post_issues(
+                        posts, violations=pre_evaluation.violations
+                    )
+                    self._record_phase(
+                        topic,
+                        "pre_evaluation",
+                        self.publication_evaluator,
+                        iteration=iteration,
+                        label=f"2.{iteration} Pre-evaluation",
+                        duration=time.perf_counter() - started,
+                    )
+                    yield RunResponse(
+                        content=f"# 2.{iteration} Pre-evaluation\n\n{evaluation}",
+                        event=RunEvent.run_response,
+                    )
+                    self.memory.add_revision_to_history(
+                        self.run_id or self.session_id,
+                        topic,
+                        iteration,
+                        draft,
+                        evaluation,
+                    )
+                    # Rejected drafts count too: the same violations twice in
+                    # a row stop the loop, and the least-violating draft is
+                    # the fallback to publish
+                    if controller.record_pre_evaluation(
+                        iteration, draft, pre_evaluation
+                    ):
+                        break
+                else:
+                    # Evaluations are keyed by the draft content, so a cached verdict
+                    # is valid at any iteration, not only the first one.
+                    eval_key = self._phase_key(
+                        "evaluation", self.publication_evaluator, topic, draft=draft
+                    )
+                    cached = (
+                        self.memory.get_cached_evaluation(topic, key=eval_key)
+                        if use_cache and seeded is None
+                        else None
+                    )
+                    logger.debug(
+                        f"[Workflow] Retrieved evaluation: {'CACHED' if cached else 'NONE'}"
+                    )
+                    if seeded is not None:
+                        # Already scored (and recorded) as a draft candidate
+                        verdict, seeded = seeded, None
+                    elif cached:
+                        verdict = parse_evaluation(cached)
+                        self._record_phase(
+                            topic,
+                            "evaluation",
+                            self.publication_evaluator,
+                            iteration=iteration,
+                            label=f"2.{iteration} Evaluation",
+                            cache="hit",
+                        )
+                    else:
+                        try:
+                            verdict = parse_evaluation(
+                                (
+                                    yield AgentCall(
+                                        self.publication_evaluator,
+                                        self._evaluation_message(draft),
+                                        phase="evaluation",
+                                        iteration=iteration,
+                                        label=f"2.{iteration} Evaluation",
+                                        cache=cache,
+                                    )
+                                )
+                            )
+                            self.memory.add_evaluation_to_cache(
+                                topic, verdict.model_dump_json(), key=eval_key
+                            )
+                            logger.debug(
+                                f"[Workflow] Evaluation saved to memory for topic: {topic}"
+                            )
+                        except Exception as e:
+                            logger.error(f"Evaluation failed: {e}")
+                            yield RunResponse(
+                                content=f"Error during evaluation: {e}",
+                                event=RunEvent.run_error,
+                            )
+                            return
+                    evaluation = verdict.feedback()
+                    # Resuming from here reuses this verdict instead of re-evaluating
+                    self._save_checkpoint(
+                        checkpoint, iteration=iteration, draft=draft, evaluation=verdict
+                    )
+                    items = action_items(
+                        verdict=verdict, max_items=self.max_action_items
+                    )
+                    posts = (
+                        pre_evaluation.posts if pre_evaluation else split_posts(draft)
+                    )
+                    post_issues = self._post_issues(posts, verdict=verdict)
+                    yield RunResponse(
+                        content=f"# 2.{iteration} Evaluation\n\n{evaluation}",
+                        event=RunEvent.run_response,
+                    )
+                    self.memory.add_revision_to_history(
+                        self.run_id or self.session_id,
+                        topic,
+                        iteration,
+                        draft,
+                        evaluation,
+                    )
+
+                    # The loop is driven by the structured verdict, not by its text
+                    if controller.record_evaluation(iteration, draft, verdict):
+                        approved = verdict.approved
+                        break
+
+                # No budget left for another revision: stop before paying for it
+                if controller.check_budget(iteration + 1):
+                    break
+
+                # Solicitar revisión al Writer
+                iteration += 1
+                previous = draft
+                rev_key = self._phase_key(
+                    "revision",
+                    self.publication_writer,
+                    topic,
+                    draft=draft,
+                    feedback=evaluation,
+                )
+                revision = (
+                    self.memory.get_cached_improved_publication(topic, key=rev_key)
+                    if use_cache
+                    else None
+                )
+                if revision:
+                    draft = revision
+                    self._record_phase(
+                        topic,
+                        "revision",
+                        self.publication_writer,
+                        iteration=iteration,
+                        label=f"2.{iteration} Revision",
+                        cache="hit",
+                    )
+                    yield RunResponse(
+                        content=f"# 2.{iteration} Revision (cached)\n\n{draft}",
+                        event=RunEvent.run_response,
+                    )
+                elif post_issues:
+                    # Only the failed posts are rewritten (in parallel), the rest
+                    # of the thread is kept as is
+                    messages = self._post_messages(posts, post_issues)
+                    self._record_compaction(
+                        topic, iteration, draft, evaluation, list(messages.values())
+                    )
+                    try:
+                        rewritten = yield from self._rewrite_posts(
+                            iteration, messages, cache
+                        )
+                    except Exception as e:
+                        logger.error(f"Revision failed: {e}")
+                        yield RunResponse(
+                            content=f"Error during revision: {e}",
+                            event=RunEvent.run_error,
+                        )
+                        return
+                    # Splice the rewritten posts into the draft: the others
+                    # keep their markup, titles and separators
+                    draft = replace_posts(draft, rewritten)
+                    self.memory.add_improved_publication_to_cache(
+                        topic, draft, key=rev_key
+                    )
+                    numbers = ", ".join(str(n) for n in sorted(post_issues))
+                    yield RunResponse(
+                        content=f"# 2.{iteration} Revision (posts {numbers})\n\n{draft}",
+                        event=RunEvent.run_response,
+                    )
+                else:
+                    # The feedback goes as a short list of fixes, not the verdict
+                    rewrite_prompt = self._revision_message(draft, items)
+                    self._record_compaction(
+                        topic, iteration, draft, evaluation, [rewrite_prompt]
+                    )
+                    try:
+                        draft = yield AgentCall(
+                            self.publication_writer,
+                            rewrite_prompt,
+                            phase="revision",
+                            iteration=iteration,
+                            label=f"2.{iteration} Revision",
+                            cache=cache,
+                        )
+                        self.memory.add_improved_publication_to_cache(
+                            topic, draft, key=rev_key
+                        )
+                        logger.debug(
+                            f"[Workflow] Improved draft saved to memory for topic: {topic}"
+                        )
+                        yield RunResponse(
+                            content=f"# 2.{iteration} Revision\n\n{draft}",
+                            event=RunEvent.run_response,
+                        )
+                    except Exception as e:
+                        logger.error(f"Revision failed: {e}")
+                        yield RunResponse(
+                            content=f"Error during revision: {e}",
+                            event=RunEvent.run_error,
+                        )
+                        return
+                self._save_checkpoint(
+                    checkpoint, iteration=iteration, draft=draft, evaluation=None
+                )
+                if controller.record_revision(previous, draft):
+                    break
 
-        if not approved:
-            logger.warning("Maximum revision iterations reached without approval")
+            # Why the loop ended goes to the run summary ("loop" phase)
+            self._record_phase(
+                topic,
+                "loop",
+                self.publication_evaluator,
+                iteration=iteration,
+                label="2. Loop",
+                duration=time.perf_counter() - loop_started,
+                termination=controller.reason,
+            )
+            if not approved:
+                # Publish the best-scored draft seen, not necessarily the last one
+                final = controller.final_draft(draft)
+                if final is draft:
+                    chosen = "the last draft"
+                elif final is controller.best_draft:
+                    chosen = (
+                        f"the draft of iteration {controller.best_iteration} "
+                        f"(score {controller.best_score:g})"
+                    )
+                else:
+                    chosen = (
+                        f"the draft of iteration {controller.fallback_iteration} "
+                        f"({controller.fallback_violations} rule violations)"
+                    )
+                logger.warning(
+                    f"[Workflow] Revision loop for '{topic}' stopped without approval "
+                    f"({controller.reason}); publishing {chosen}"
+                )
+                draft = final
+                yield RunResponse(
+                    content=f"# 2. Stopped ({controller.reason})\n\nPublishing {chosen}.",
+                    event=RunEvent.run_response,
+                )
+            self._save_checkpoint(
+                checkpoint,
+                phase=PUBLISH,
+                draft=draft,
+                approved=approved,
+                evaluation=None,
+            )
 
         # ---------------- 3) PUBLICACIÓN ---------------- #
-        publish_prompt = {
-            "content": draft,
-            "task": "Format and publish the thread; save markdown using write_file.",
-        }
+        publish_prompt = self._agent_input(
+            "Format and publish the thread; save markdown using write_file.",
+            content=draft,
+        )
         try:
-            pub_resp = self.publication_publisher.run(
-                json.dumps(publish_prompt, indent=4), stream=False
+            published = yield AgentCall(
+                self.publication_publisher,
+                publish_prompt,
+                phase="publish",
+                label="3. Published",
             )
-            published = pub_resp.content
             self.memory.save_final_publication(topic, published)
+            self._save_checkpoint(checkpoint, phase=DONE)
             logger.debug(
                 f"[Workflow] Final publication saved to memory for topic: {topic}"
             )
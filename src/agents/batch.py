@@ -0,0 +1,258 @@
+import asyncio
+import json
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List
+from uuid import uuid4
+
+from agno.utils.log import logger
+from agno.workflow import RunEvent, RunResponse
+from pydantic import BaseModel, Field
+
+from .agents import PhaseChunk, PublicationWorkflow
+
+
+@dataclass
+class BatchEvent:
+    """A single phase result produced by one topic of a batch run"""
+
+    index: int
+    topic: str
+    session_id: str
+    # Phase label taken from the response header, e.g. "0. Plan"
+    phase: str
+    # Seconds spent on this phase
+    elapsed: float
+    response: RunResponse
+
+
+class TopicTiming(BaseModel):
+    """Timing summary for a single topic of a batch run"""
+
+    index: int
+    topic: str
+    session_id: str
+    phases: Dict[str, float] = Field(default_factory=dict)
+    total: float = 0.0
+    status: str = "pending"
+
+
+def load_topics(path: str | Path) -> List[str]:
+    """Load topics from a file.
+
+    ``.json`` files must contain a list of strings; any other file is read as
+    one topic per line, skipping blank lines and lines starting with ``#``.
+    """
+    path = Path(path)
+    content = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        topics = json.loads(content)
+        if not isinstance(topics, list) or not all(isinstance(t, str) for t in topics):
+            raise ValueError(f"Expected a JSON list of strings in {path}")
+        return topics
+    return [
+        line.strip()
+        for line in content.splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+def phase_label(response: RunResponse) -> str:
+    """Extract the phase label from the markdown header of a workflow response."""
+    if response.event == RunEvent.run_error:
+        return "error"
+    content = response.content if isinstance(response.content, str) else ""
+    first_line = content.split("\n", 1)[0]
+    return first_line.lstrip("#").strip() or "response"
+
+
+class BatchRunner:
+    """Run :class:`PublicationWorkflow` over many topics with a bounded pool.
+
+    Every topic gets its own workflow instance (and therefore its own session
+    id, ``Memory`` state and agent copies). Phase results are streamed back
+    through :meth:`run` as soon as any worker produces them.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        session_prefix: str = "generate-publication-session",
+        **run_kwargs,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self.max_workers = max_workers
+        self.session_prefix = session_prefix
+        self.run_kwargs = run_kwargs
+        self.timings: List[TopicTiming] = []
+
+    def _session_id(self, index: int) -> str:
+        return f"{self.session_prefix}-{index}-{uuid4().hex[:8]}"
+
+    def _record(self, timing, response, put, last: float, now: float) -> float:
+        if isinstance(response, PhaseChunk):
+            # Partial content (stream=True): forward it without closing the phase
+            put(
+                BatchEvent(
+                    index=timing.index,
+                    topic=timing.topic,
+                    session_id=timing.session_id,
+                    phase=response.label,
+                    elapsed=now - last,
+                    response=response,
+                )
+            )
+            return last
+        phase = phase_label(response)
+        timing.phases[phase] = now - last
+        if response.event == RunEvent.run_error:
+            timing.status = "error"
+        put(
+            BatchEvent(
+                index=timing.index,
+                topic=timing.topic,
+                session_id=timing.session_id,
+                phase=phase,
+                elapsed=now - last,
+                response=response,
+            )
+        )
+        return now
+
+    def _record_failure(self, timing, error: Exception, put, last: float) -> None:
+        logger.error(f"[Batch] Topic {timing.index} failed: {error}")
+        timing.status = "error"
+        put(
+            BatchEvent(
+                index=timing.index,
+                topic=timing.topic,
+                session_id=timing.session_id,
+                phase="error",
+                elapsed=time.perf_counter() - last,
+                response=RunResponse(
+                    content=f"Error during batch run: {error}",
+                    event=RunEvent.run_error,
+                ),
+            )
+        )
+
+    def _run_topic(self, timing: TopicTiming, events: queue.Queue) -> None:
+        workflow = PublicationWorkflow(session_id=timing.session_id)
+        timing.status = "running"
+        start = last = time.perf_counter()
+        try:
+            for response in workflow.run(topic=timing.topic, **self.run_kwargs):
+                now = time.perf_counter()
+                last = self._record(timing, response, events.put, last, now)
+            if timing.status == "running":
+                timing.status = "done"
+        except Exception as e:
+            self._record_failure(timing, e, events.put, last)
+        finally:
+            timing.total = time.perf_counter() - start
+            events.put(self._DONE)
+
+    def run(self, topics: List[str]) -> Iterator[BatchEvent]:
+        """Run all topics and yield a :class:`BatchEvent` per finished phase."""
+        self.timings = [
+            TopicTiming(index=i, topic=topic, session_id=self._session_id(i))
+            for i, topic in enumerate(topics)
+        ]
+        if not self.timings:
+            return
+        logger.info(
+            f"[Batch] Running {len(self.timings)} topics with max_workers={self.max_workers}"
+        )
+        events: queue.Queue = queue.Queue()
+        pending = len(self.timings)
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="publication-batch"
+        ) as pool:
+            for timing in self.timings:
+                pool.submit(self._run_topic, timing, events)
+            while pending:
+                event = events.get()
+                if event is self._DONE:
+                    pending -= 1
+                    continue
+                yield event
+
+    async def _arun_topic(
+        self,
+        timing: TopicTiming,
+        events: asyncio.Queue,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        async with semaphore:
+            timing.status = "running"
+            start = last = time.perf_counter()
+            try:
+                # Building the workflow opens the DB and copies the agents;
+                # keep that blocking work off the event loop
+                workflow = await asyncio.to_thread(
+                    PublicationWorkflow, session_id=timing.session_id
+                )
+                async for response in workflow.arun(
+                    topic=timing.topic, **self.run_kwargs
+                ):
+                    now = time.perf_counter()
+                    last = self._record(timing, response, events.put_nowait, last, now)
+                if timing.status == "running":
+                    timing.status = "done"
+            except Exception as e:
+                self._record_failure(timing, e, events.put_nowait, last)
+            finally:
+                timing.total = time.perf_counter() - start
+                events.put_nowait(self._DONE)
+
+    async def arun(self, topics: List[str]) -> AsyncIterator[BatchEvent]:
+        """Async version of :meth:`run` driven by ``PublicationWorkflow.arun``.
+
+        ``max_workers`` bounds the number of in-flight topic pipelines; no
+        threads are used, so it can be set much higher than for :meth:`run`.
+        """
+        self.timings = [
+            TopicTiming(index=i, topic=topic, session_id=self._session_id(i))
+            for i, topic in enumerate(topics)
+        ]
+        if not self.timings:
+            return
+        logger.info(
+            f"[Batch] Running {len(self.timings)} topics (async) with max_workers={self.max_workers}"
+        )
+        events: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        tasks = [
+            asyncio.create_task(self._arun_topic(timing, events, semaphore))
+            for timing in self.timings
+        ]
+        pending = len(tasks)
+        try:
+            while pending:
+                event = await events.get()
+                if event is self._DONE:
+                    pending -= 1
+                    continue
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def summary_rows(self) -> List[List[str]]:
+        """Return one row per topic of the last run: index, topic, status, total, phases."""
+        return [
+            [
+                str(timing.index),
+                timing.topic.splitlines()[0][:60] if timing.topic else "",
+                timing.status,
+                f"{timing.total:.1f}s",
+                ", ".join(f"{k}: {v:.1f}s" for k, v in timing.phases.items()),
+            ]
+            for timing in self.timings
+        ]
@@ -0,0 +1,142 @@
+"""Benchmark of browsing and searching the final-publication archive.
+
+Fills a temporary database with synthetic publications and compares the
+previous access paths (``ORDER BY timestamp ... OFFSET`` without an index and
+``LIKE '%term%'`` scans) with the archive (timestamp index + keyset cursor,
+FTS5 index):
+
+* first page and a deep page (offset vs keyset cursor);
+* search for a common and for a rare term;
+* a one-week date-range filter.
+
+Usage::
+
+    python -m src.benchmarks.archive --rows 10000 100000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict
+
+from src.utils.archive import PublicationArchive, encode_cursor
+from src.utils.database import Database
+
+WORDS = (
+    "agentes automatización datos modelo equipo cliente producto mercado "
+    "estrategia contenido lanzamiento métricas crecimiento aprendizaje nube "
+    "seguridad talento liderazgo innovación comunidad"
+).split()
+RARE_TERM = "quasar"
+PAGE = 50
+
+LEGACY_LIST_SQL = """SELECT topic, final_prompt, timestamp FROM final_prompts
+    NOT INDEXED ORDER BY timestamp DESC LIMIT ? OFFSET ?;"""
+LEGACY_SEARCH_SQL = """SELECT topic, final_prompt, timestamp FROM final_prompts
+    NOT INDEXED WHERE final_prompt LIKE ? ORDER BY timestamp DESC LIMIT ?;"""
+LEGACY_RANGE_SQL = """SELECT topic, final_prompt, timestamp FROM final_prompts
+    NOT INDEXED WHERE timestamp >= ? AND timestamp < ?
+    ORDER BY timestamp DESC LIMIT ?;"""
+
+
+def populate(db: Database, rows: int, seed: int = 7) -> datetime:
+    """Insert *rows* publications spread over a year; returns the newest date."""
+    rng = random.Random(seed)
+    newest = datetime(2025, 1, 1)
+    step = timedelta(days=365) / rows
+
+    def publication(i: int) -> str:
+        text = " ".join(rng.choice(WORDS) for _ in range(120))
+        # One publication in a thousand mentions the rare term
+        return f"{text} {RARE_TERM}" if i % 1000 == 0 else text
+
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO final_prompts (topic, final_prompt, timestamp) "
+            "VALUES (?, ?, ?);",
+            (
+                (f"topic {i}", publication(i), (newest - step * i).isoformat())
+                for i in range(rows)
+            ),
+        )
+    return newest
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time of *fn* in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, repeat: int, workdir: Path) -> Dict[str, Dict[str, float]]:
+    db = Database(str(workdir / f"archive_{rows}.db"))
+    newest = populate(db, rows)
+    archive = PublicationArchive(db)
+
+    deep_offset = rows // 2
+    deep_row = db.query(
+        "SELECT timestamp, rowid FROM final_prompts "
+        "ORDER BY timestamp DESC, rowid DESC LIMIT 1 OFFSET ?;",
+        (deep_offset - 1,),
+    )[0]
+    deep_cursor = encode_cursor(*deep_row)
+    since, until = newest - timedelta(days=200), newest - timedelta(days=193)
+
+    results = {
+        "first page": (
+            lambda: db.query(LEGACY_LIST_SQL, (PAGE, 0)),
+            lambda: archive.browse(limit=PAGE),
+        ),
+        "deep page": (
+            lambda: db.query(LEGACY_LIST_SQL, (PAGE, deep_offset)),
+            lambda: archive.browse(limit=PAGE, cursor=deep_cursor),
+        ),
+        "search common": (
+            lambda: db.query(LEGACY_SEARCH_SQL, (f"%{WORDS[3]}%", PAGE)),
+            lambda: archive.search(WORDS[3], limit=PAGE),
+        ),
+        "search rare": (
+            lambda: db.query(LEGACY_SEARCH_SQL, (f"%{RARE_TERM}%", PAGE)),
+            lambda: archive.search(RARE_TERM, limit=PAGE),
+        ),
+        "date range": (
+            lambda: db.query(
+                LEGACY_RANGE_SQL, (since.isoformat(), until.isoformat(), PAGE)
+            ),
+            lambda: archive.browse(limit=PAGE, since=since, until=until),
+        ),
+    }
+    timings = {
+        name: {"legacy": timed(legacy, repeat), "archive": timed(new, repeat)}
+        for name, (legacy, new) in results.items()
+    }
+    db.close()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            print(f"{rows} publications (median ms, legacy -> archive)")
+            for name, timing in run(rows, args.repeat, Path(tmp)).items():
+                print(
+                    f"  {name:<14} {timing['legacy']:9.2f} -> {timing['archive']:8.2f}"
+                    f"  ({timing['legacy'] / max(timing['archive'], 1e-6):6.1f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark of the near-duplicate check run after the first draft.
+
+Indexes synthetic publications (threads of random words from a fixed
+vocabulary) and measures the per-check latency of ``NearDuplicateIndex.query``
+for unrelated drafts and for lightly edited copies of indexed ones, together
+with the detection rate of those copies.
+
+Usage::
+
+    python -m src.benchmarks.dedup --publications 10000 50000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from src.utils.dedup import NearDuplicateIndex
+
+VOCABULARY = [f"palabra{i}" for i in range(5000)]
+
+
+def thread(rng: random.Random, words: int = 250) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def edit(rng: random.Random, text: str, changes: int = 5) -> str:
+    """Replace a few words, as a writer rephrasing a published thread would."""
+    words = text.split()
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+
+def run(publications: int, checks: int, seed: int = 3) -> dict:
+    rng = random.Random(seed)
+    index = NearDuplicateIndex()
+    texts = [thread(rng) for _ in range(publications)]
+    started = time.perf_counter()
+    for i, text in enumerate(texts):
+        index.add(f"final:{i}", text)
+    build = time.perf_counter() - started
+
+    def timed(drafts):
+        samples, found = [], 0
+        for draft in drafts:
+            t0 = time.perf_counter()
+            found += index.query(draft) is not None
+            samples.append((time.perf_counter() - t0) * 1000)
+        return statistics.median(samples), max(samples), found
+
+    unrelated = timed([thread(rng) for _ in range(checks)])
+    copies = timed([edit(rng, rng.choice(texts)) for _ in range(checks)])
+    return {
+        "build_s": build,
+        "unrelated": unrelated,
+        "copies": copies,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--publications", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--checks", type=int, default=500)
+    args = parser.parse_args()
+
+    for publications in args.publications:
+        result = run(publications, args.checks)
+        print(f"{publications} publications (index built in {result['build_s']:.1f}s)")
+        for name in ("unrelated", "copies"):
+            median, worst, found = result[name]
+            print(
+                f"  {name:<9} median={median:.3f} ms  max={worst:.3f} ms  "
+                f"flagged={found}/{args.checks}"
+            )
+
+
+if __name__ == "__main__":
+    main()
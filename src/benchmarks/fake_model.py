@@ -0,0 +1,141 @@
+"""Deterministic stand-in for ``OpenAIResponses`` used by the offline benchmarks.
+
+``FakeModel`` goes through agno's normal model machinery (message building,
+metrics, streaming) but answers locally after a configurable latency, so the
+orchestration overhead of the workflow can be measured without network calls.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+# Feedback of the fake evaluator, a different one per call so the revision
+# loop does not stop on repeated feedback
+SUGGESTIONS = (
+    "sharpen the hook.",
+    "cite a source for the statistic.",
+    "end with a direct question.",
+    "cut the second post by half.",
+)
+# Stream this many words per delta
+STREAM_WORDS_PER_DELTA = 8
+# Non-evaluator answers are shaped as a thread of posts of this many words,
+# separated by "---" and ending with a hashtag, so they pass the pre-evaluator
+POST_WORDS = 30
+
+
+@dataclass
+class FakeModel(Model):
+    """Local model with configurable latency, output size and approval.
+
+    Args:
+        latency: Seconds to wait before answering (per call).
+        output_tokens: Number of words (≈ tokens) in every answer; keep it
+            at most ``7 * POST_WORDS`` for drafts to pass the pre-evaluator.
+        evaluator: Answer as the evaluator, with a JSON verdict: not approved
+            (with feedback and rising scores) until the ``approve_on``-th call.
+        approve_on: 1-based evaluation call that approves the draft.
+    """
+
+    id: str = "fake-model"
+    name: str = "FakeModel"
+    provider: str = "Fake"
+    latency: float = 0.0
+    output_tokens: int = 200
+    evaluator: bool = False
+    approve_on: int = 1
+    # Calls answered so far; use one instance per agent and workflow
+    calls: int = 0
+
+    def _answer(self, messages: List[Message]) -> Dict[str, Any]:
+        self.calls += 1
+        call = self.calls
+        prompt = "\n".join(str(m.content) for m in messages if m.content)
+        digest = hashlib.sha256(f"{call}:{prompt}".encode("utf-8")).hexdigest()
+        if self.evaluator:
+            if call >= self.approve_on:
+                words = ["Publish.", "The", "draft", "is", "approved."]
+            else:
+                suggestion = SUGGESTIONS[(call - 1) % len(SUGGESTIONS)]
+                words = ["Do", "not", "publish:", *suggestion.split()]
+        else:
+            words = [f"w{digest[i % 64]}{i}" for i in range(self.output_tokens)]
+        content = " ".join(words)
+        if self.evaluator:
+            # Structured verdict (see PublicationEvaluation)
+            approved = call >= self.approve_on
+            content = json.dumps(
+                {
+                    "approved": approved,
+                    "decision": "Publish" if approved else "Revise",
+                    "failed_gates": [],
+                    "scores": [{"criterion": "Engagement", "score": 6 + call}],
+                    "total_score": 60 + 10 * call,
+                    "recommendations": [] if approved else [" ".join(words[3:])],
+                    "post_feedback": [],
+                }
+            )
+        else:
+            posts = [
+                " ".join(words[i : i + POST_WORDS])
+                for i in range(0, len(words), POST_WORDS)
+            ]
+            content = "\n\n---\n\n".join(posts) + " #IA"
+        return {
+            "content": content,
+            "usage": {
+                # Rough 4 characters per token estimate for the prompt
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": len(words),
+            },
+        }
+
+    def invoke(self, messages: List[Message]) -> Dict[str, Any]:
+        time.sleep(self.latency)
+        return self._answer(messages)
+
+    async def ainvoke(self, messages: List[Message]) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency)
+        return self._answer(messages)
+
+    def _deltas(self, answer: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        words = answer["content"].split(" ")
+        for i in range(0, len(words), STREAM_WORDS_PER_DELTA):
+            last = i + STREAM_WORDS_PER_DELTA >= len(words)
+            text = " ".join(words[i : i + STREAM_WORDS_PER_DELTA])
+            yield {
+                "content": text if last else text + " ",
+                "usage": answer["usage"] if last else None,
+            }
+
+    def invoke_stream(self, messages: List[Message]) -> Iterator[Dict[str, Any]]:
+        time.sleep(self.latency)
+        yield from self._deltas(self._answer(messages))
+
+    async def ainvoke_stream(
+        self, messages: List[Message]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        await asyncio.sleep(self.latency)
+        for delta in self._deltas(self._answer(messages)):
+            yield delta
+
+    def parse_provider_response(self, response: Dict[str, Any]) -> ModelResponse:
+        return ModelResponse(
+            role=self.assistant_message_role,
+            content=response["content"],
+            response_usage=response["usage"],
+        )
+
+    def parse_provider_response_delta(self, response: Dict[str, Any]) -> ModelResponse:
+        return ModelResponse(
+            role=self.assistant_message_role,
+            content=response["content"],
+            response_usage=response["usage"],
+        )
@@ -0,0 +1,166 @@
+"""Benchmark of the final-publication persistence path.
+
+Compares the previous behaviour of ``Memory.save_final_publication`` (a new
+``sqlite3.connect`` plus ``CREATE TABLE IF NOT EXISTS`` per call, rollback
+journal) with the pooled, WAL-mode ``Database`` layer:
+
+* sequential upserts per second;
+* concurrent writers and readers: throughput and failed operations
+  ("database is locked").
+
+Usage::
+
+    python -m src.benchmarks.persistence --upserts 2000 --writers 4 --readers 4
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+from src.utils.database import Database
+from src.utils.memory import SELECT_FINAL_SQL, UPSERT_FINAL_SQL
+
+
+def legacy_upsert(db_path: str, topic: str, publication: str) -> None:
+    """What save_final_publication did before the shared Database layer."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS final_prompts (
+            topic TEXT PRIMARY KEY,
+            final_prompt TEXT,
+            timestamp TEXT
+        );
+        """
+    )
+    conn.execute(
+        """INSERT OR REPLACE INTO final_prompts (topic, final_prompt, timestamp)
+           VALUES (?, ?, ?);""",
+        (topic, publication, datetime.utcnow().isoformat()),
+    )
+    conn.commit()
+
+
+def legacy_read(db_path: str, topic: str) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute(SELECT_FINAL_SQL, (topic,)).fetchall()
+    conn.close()
+
+
+class Backend:
+    """Upsert/read functions for one implementation."""
+
+    def __init__(self, name: str, upsert: Callable, read: Callable):
+        self.name = name
+        self.upsert = upsert
+        self.read = read
+
+
+def backends(tmp: Path) -> Dict[str, Backend]:
+    legacy_path = str(tmp / "legacy.db")
+    legacy_upsert(legacy_path, "warm-up", "")
+    db = Database(str(tmp / "pooled.db"))
+    return {
+        "legacy": Backend(
+            "legacy",
+            lambda topic, text: legacy_upsert(legacy_path, topic, text),
+            lambda topic: legacy_read(legacy_path, topic),
+        ),
+        "pooled": Backend(
+            "pooled",
+            lambda topic, text: db.execute(
+                UPSERT_FINAL_SQL, (topic, text, datetime.utcnow().isoformat())
+            ),
+            lambda topic: db.query(SELECT_FINAL_SQL, (topic,)),
+        ),
+    }
+
+
+def sequential(backend: Backend, upserts: int, size: int) -> float:
+    text = "x" * size
+    started = time.perf_counter()
+    for i in range(upserts):
+        backend.upsert(f"topic {i % 100}", text)
+    return upserts / (time.perf_counter() - started)
+
+
+def concurrent(
+    backend: Backend, writers: int, readers: int, ops: int, size: int
+) -> Dict[str, float]:
+    """*writers* threads do *ops* upserts each while *readers* threads read."""
+    text = "x" * size
+    done = threading.Event()
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def count(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def write(worker: int) -> None:
+        for i in range(ops):
+            try:
+                backend.upsert(f"topic {worker}-{i % 50}", text)
+                count("writes")
+            except sqlite3.OperationalError:
+                count("errors")
+
+    def read(worker: int) -> None:
+        i = 0
+        while not done.is_set():
+            try:
+                backend.read(f"topic {worker}-{i % 50}")
+                count("reads")
+            except sqlite3.OperationalError:
+                count("errors")
+            i += 1
+
+    reader_threads = [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    writer_threads = [threading.Thread(target=write, args=(i,)) for i in range(writers)]
+    started = time.perf_counter()
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+    return {
+        "writes_per_s": counts["writes"] / elapsed,
+        "reads_per_s": counts["reads"] / elapsed,
+        "errors": counts["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--upserts", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=250, help="Upserts per writer")
+    parser.add_argument(
+        "--size", type=int, default=2000, help="Publication size in characters"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, backend in backends(Path(tmp)).items():
+            rate = sequential(backend, args.upserts, args.size)
+            result = concurrent(
+                backend, args.writers, args.readers, args.ops, args.size
+            )
+            print(
+                f"{name:<7} sequential={rate:9.0f} upserts/s  "
+                f"concurrent writes={result['writes_per_s']:8.0f}/s "
+                f"reads={result['reads_per_s']:9.0f}/s errors={result['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
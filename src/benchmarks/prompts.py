@@ -0,0 +1,131 @@
+"""Micro-benchmark of prompt template rendering.
+
+Replays the prompt loads of a batch run (agent instructions on every call
+plus the template sources read for the phase cache keys) with the previous
+``PromptLoader`` (resolve, ``exists()``, read and compile on every call) and
+with the cached ``TemplateRegistry``, reporting render latency and the
+number of files opened.
+
+Usage::
+
+    python -m src.benchmarks.prompts --topics 500 --revisions 3
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from string import Template
+from typing import Callable, Dict, List, Tuple
+
+from src.utils.prompt_loader import PROMPTS_DIR, TemplateRegistry
+
+
+def legacy_source(template_name: str) -> str:
+    """What PromptLoader.source did before the template registry."""
+    template_path = PROMPTS_DIR / f"{template_name}.md"
+    if not template_path.exists():
+        raise FileNotFoundError(f"Prompt template not found: {template_path}")
+    return template_path.read_text(encoding="utf-8")
+
+
+def legacy_load(template_name: str, **kwargs) -> str:
+    return Template(legacy_source(template_name)).safe_substitute(**kwargs)
+
+
+class FileOpenCounter:
+    """Counts files opened under ``PROMPTS_DIR`` (via an audit hook)."""
+
+    installed = False
+    active = False
+    opens = 0
+
+    @classmethod
+    def _hook(cls, event: str, args: tuple) -> None:
+        if cls.active and event == "open" and str(args[0]).startswith(str(PROMPTS_DIR)):
+            cls.opens += 1
+
+    @classmethod
+    def count(cls, fn: Callable[[], None]) -> int:
+        if not cls.installed:
+            # Audit hooks cannot be removed, so it is installed once
+            sys.addaudithook(cls._hook)
+            cls.installed = True
+        cls.opens, cls.active = 0, True
+        try:
+            fn()
+        finally:
+            cls.active = False
+        return cls.opens
+
+
+def batch_loads(topics: int, revisions: int) -> List[Tuple[str, str, Dict[str, str]]]:
+    """(kind, template, kwargs) of every prompt load of a batch run."""
+    loads = []
+    writer = {"plan": "${plan}", "num_posts": "${num_posts}"}
+    for _ in range(topics):
+        loads.append(("load", "orchestrator", {"knowledge_desc": "Knowledge base"}))
+        loads.append(("source", "orchestrator", {}))
+        loads += [("load", "instrucciones", writer), ("source", "instrucciones", {})]
+        for _ in range(revisions + 1):
+            loads += [("load", "evaluator", {}), ("source", "evaluator", {})]
+        for _ in range(revisions):
+            loads += [
+                ("load", "instrucciones", writer),
+                ("source", "instrucciones", {}),
+            ]
+        loads.append(("load", "publisher", {}))
+    return loads
+
+
+def replay(loads, load: Callable, source: Callable) -> List[float]:
+    timings = []
+    for kind, name, kwargs in loads:
+        started = time.perf_counter()
+        if kind == "load":
+            load(name, **kwargs)
+        else:
+            source(name)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run(topics: int, revisions: int) -> Dict[str, Dict[str, float]]:
+    loads = batch_loads(topics, revisions)
+    registry = TemplateRegistry()
+    results = {}
+    for name, load, source in (
+        ("legacy", legacy_load, legacy_source),
+        ("registry", registry.render, registry.source),
+    ):
+        timings: List[float] = []
+        opens = FileOpenCounter.count(
+            lambda: timings.extend(replay(loads, load, source))
+        )
+        results[name] = {
+            "calls": len(timings),
+            "file_opens": opens,
+            "total_ms": sum(timings) * 1000,
+            "p50_us": statistics.median(timings) * 1e6,
+            "p95_us": statistics.quantiles(timings, n=20)[-1] * 1e6,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--revisions", type=int, default=3)
+    args = parser.parse_args()
+    results = run(args.topics, args.revisions)
+    print(f"{args.topics} topics x {args.revisions} revisions")
+    for name, row in results.items():
+        print(
+            f"  {name:<9} calls={row['calls']:<6} file opens={row['file_opens']:<6} "
+            f"total={row['total_ms']:8.1f} ms  p50={row['p50_us']:7.1f} µs  "
+            f"p95={row['p95_us']:7.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Startup-time benchmark for the workflow module.
+
+Measures, in fresh interpreters, the cold import of ``src.agents.agents`` and
+the cost of building the knowledge base afterwards (``Knowledge.warm_up``),
+which used to be paid at import time. Optionally compares against another git
+revision checked out in a temporary worktree.
+
+Usage::
+
+    python -m src.benchmarks.startup --runs 5
+    python -m src.benchmarks.startup --runs 5 --baseline <git-rev>
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import src.agents.agents
+t1 = time.perf_counter()
+from src.utils.knowledge import Knowledge
+if hasattr(Knowledge, "warm_up"):
+    Knowledge.warm_up()
+else:
+    Knowledge.knowledge_base.vector_db.client
+t2 = time.perf_counter()
+print(f"{t1 - t0:.6f} {t2 - t1:.6f}")
+"""
+
+
+def measure(cwd: Path, runs: int) -> tuple[list[float], list[float]]:
+    """Run the import snippet *runs* times in fresh interpreters under *cwd*."""
+    env = {**os.environ, "PYTHONPATH": str(cwd), "AGNO_TELEMETRY": "false"}
+    imports, warm_ups = [], []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        import_time, warm_up_time = map(float, out.splitlines()[-1].split())
+        imports.append(import_time)
+        warm_ups.append(warm_up_time)
+    return imports, warm_ups
+
+
+def report(label: str, imports: list[float], warm_ups: list[float]) -> None:
+    print(
+        f"{label:<10} import median={statistics.median(imports) * 1000:8.1f} ms"
+        f"  min={min(imports) * 1000:8.1f} ms"
+        f"  | +knowledge median={statistics.median(warm_ups) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--baseline", help="git revision to compare against (e.g. a commit id)"
+    )
+    args = parser.parse_args()
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            worktree = Path(tmp) / "baseline"
+            subprocess.run(
+                ["git", "worktree", "add", "--detach", str(worktree), args.baseline],
+                cwd=REPO_ROOT,
+                check=True,
+                capture_output=True,
+            )
+            try:
+                report("baseline", *measure(worktree, args.runs))
+            finally:
+                subprocess.run(
+                    ["git", "worktree", "remove", "--force", str(worktree)],
+                    cwd=REPO_ROOT,
+                    check=True,
+                )
+    report("current", *measure(REPO_ROOT, args.runs))
+
+
+if __name__ == "__main__":
+    main()
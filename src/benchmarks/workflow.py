@@ -0,0 +1,261 @@
+"""Offline end-to-end benchmark of ``PublicationWorkflow``.
+
+Every agent's model is replaced by ``FakeModel`` so the benchmark measures
+the orchestration overhead (agents, ``Memory``, phase cache, SQLite) without
+network access. Runs N topics and reports throughput, p50/p95 latency per
+phase, the memory high-water mark and SQLite write counts. All persistence
+goes to a temporary database (``PUBLICATION_DB_FILE``).
+
+Usage::
+
+    python -m src.benchmarks.workflow --topics 20 --latency 0.01
+    python -m src.benchmarks.workflow --topics 20 --approve-on 3 --json
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from agno.utils.log import logger
+
+from src.agents.agents import PublicationWorkflow
+from src.benchmarks.fake_model import FakeModel
+from src.utils.knowledge import Knowledge
+from src.utils.metrics import MetricsRegistry, summarize
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+class SQLiteWriteCounter:
+    """Counts write statements and commits on every sqlite3 connection opened
+    while :meth:`install` is active (the workflow's raw sqlite3 connections and
+    the SQLAlchemy-backed agno storage alike)."""
+
+    def __init__(self):
+        self.writes = 0
+        self.commits = 0
+
+    def _trace(self, statement: str) -> None:
+        keyword = statement.lstrip().split(" ", 1)[0].upper()
+        if keyword in WRITE_STATEMENTS:
+            self.writes += 1
+        elif keyword in ("COMMIT", "END"):
+            self.commits += 1
+
+    @contextmanager
+    def install(self) -> Iterator["SQLiteWriteCounter"]:
+        original = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            conn = original(*args, **kwargs)
+            conn.set_trace_callback(self._trace)
+            return conn
+
+        sqlite3.connect = sqlite3.dbapi2.connect = connect
+        try:
+            yield self
+        finally:
+            sqlite3.connect = sqlite3.dbapi2.connect = original
+
+
+@contextmanager
+def temporary_db(path: Path) -> Iterator[Path]:
+    """Point the workflow persistence at ``path/publication_generation.db``."""
+    db_file = path / "publication_generation.db"
+    previous = os.environ.get("PUBLICATION_DB_FILE")
+    os.environ["PUBLICATION_DB_FILE"] = str(db_file)
+    try:
+        yield db_file
+    finally:
+        if previous is None:
+            os.environ.pop("PUBLICATION_DB_FILE", None)
+        else:
+            os.environ["PUBLICATION_DB_FILE"] = previous
+
+
+def build_workflow(
+    index: int,
+    registry: MetricsRegistry,
+    latency: float,
+    output_tokens: int,
+    approve_on: int,
+) -> PublicationWorkflow:
+    """A workflow whose agents answer through fresh ``FakeModel`` instances."""
+    workflow = PublicationWorkflow(
+        session_id=f"benchmark-session-{index}", metrics_registry=registry
+    )
+    for agent in (
+        workflow.orchestrator,
+        workflow.publication_writer,
+        workflow.publication_evaluator,
+        workflow.publication_publisher,
+    ):
+        agent.model = FakeModel(
+            latency=latency,
+            output_tokens=output_tokens,
+            evaluator=agent is workflow.publication_evaluator,
+            approve_on=approve_on,
+        )
+    return workflow
+
+
+def percentile(values: List[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def run_benchmark(
+    topics: int = 10,
+    latency: float = 0.0,
+    output_tokens: int = 200,
+    approve_on: int = 1,
+    max_revisions: int = 10,
+    concurrency: int = 1,
+    workdir: Optional[Path] = None,
+    candidates: int = 1,
+) -> Dict[str, Any]:
+    """Run *topics* workflows end to end against ``FakeModel`` and report."""
+    registry = MetricsRegistry()
+    counter = SQLiteWriteCounter()
+
+    def run_topic(index: int) -> float:
+        started = time.perf_counter()
+        workflow = build_workflow(index, registry, latency, output_tokens, approve_on)
+        for _ in workflow.run(
+            topic=f"Benchmark topic {index}",
+            max_revisions=max_revisions,
+            candidates=candidates,
+        ):
+            pass
+        return time.perf_counter() - started
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        temporary_db(Path(workdir or tmp)),
+        counter.install(),
+    ):
+        # One-off knowledge base build is startup cost (see benchmarks.startup)
+        Knowledge.get()
+        tracemalloc.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            totals = list(pool.map(run_topic, range(topics)))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    durations: Dict[str, List[float]] = {}
+    for event in registry.events():
+        durations.setdefault(event.phase, []).append(event.duration)
+    return {
+        "topics": topics,
+        "concurrency": concurrency,
+        "latency": latency,
+        "approve_on": approve_on,
+        "candidates": candidates,
+        "elapsed": elapsed,
+        "throughput": topics / elapsed if elapsed else 0.0,
+        "topic_p50": percentile(totals, 50),
+        "topic_p95": percentile(totals, 95),
+        "phases": {
+            phase: {
+                "calls": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+            for phase, values in durations.items()
+        },
+        # Why each topic's revision loop ended
+        "terminations": summarize(registry.events())
+        .get("loop", {})
+        .get("terminations", {}),
+        "tracemalloc_peak_mb": peak / 2**20,
+        # ru_maxrss is reported in KiB on Linux and bytes on macOS
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / (2**20 if sys.platform == "darwin" else 2**10),
+        "sqlite_writes": counter.writes,
+        "sqlite_commits": counter.commits,
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['topics']} topics in {result['elapsed']:.2f}s "
+        f"({result['throughput']:.2f} topics/s, concurrency={result['concurrency']}, "
+        f"latency={result['latency']}s, approve_on={result['approve_on']}, "
+        f"candidates={result['candidates']})"
+    )
+    print(
+        f"topic latency p50={result['topic_p50'] * 1000:.1f} ms "
+        f"p95={result['topic_p95'] * 1000:.1f} ms"
+    )
+    for phase, row in result["phases"].items():
+        print(
+            f"  {phase:<11} calls={row['calls']:<4} "
+            f"p50={row['p50'] * 1000:8.1f} ms  p95={row['p95'] * 1000:8.1f} ms"
+        )
+    print(f"loop stopped by: {result['terminations']}")
+    print(
+        f"memory: tracemalloc peak={result['tracemalloc_peak_mb']:.1f} MB "
+        f"max rss={result['max_rss_mb']:.1f} MB"
+    )
+    print(
+        f"sqlite: writes={result['sqlite_writes']} commits={result['sqlite_commits']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Fake model latency per call (s)"
+    )
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument(
+        "--approve-on",
+        type=int,
+        default=1,
+        help="The evaluator approves on its k-th evaluation of a topic",
+    )
+    parser.add_argument("--max-revisions", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--candidates", type=int, default=1, help="Parallel draft candidates per topic"
+    )
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    parser.add_argument("--verbose", action="store_true", help="Keep INFO logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Agents reset the agno log level on every run, so filter instead
+        logger.addFilter(lambda record: record.levelno >= logging.WARNING)
+    result = run_benchmark(
+        topics=args.topics,
+        latency=args.latency,
+        output_tokens=args.output_tokens,
+        approve_on=args.approve_on,
+        max_revisions=args.max_revisions,
+        concurrency=args.concurrency,
+        candidates=args.candidates,
+    )
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
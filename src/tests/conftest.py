@@ -0,0 +1,106 @@
+import re
+
+import pytest
+from agno.agent import Agent
+from agno.run.response import RunResponse
+
+from src.utils import database
+from src.utils.evaluation import CriterionScore, PostFeedback, PublicationEvaluation
+from src.utils.memory import Memory
+
+
+@pytest.fixture(autouse=True)
+def isolated_db(tmp_path, monkeypatch):
+    """
+    Point the workflow's SQLite persistence at a temporary file so tests never
+    touch src/db/publication_generation.db.
+    """
+    db_file = tmp_path / "publication_generation.db"
+    monkeypatch.delenv("PUBLICATION_DB_FILE", raising=False)
+    monkeypatch.setattr(database, "DEFAULT_DB_FILE", str(db_file))
+    return db_file
+
+
+@pytest.fixture(autouse=True)
+def unlimited_scheduler(monkeypatch):
+    """
+    Tests run many calls on real model ids within a minute: lift the shared
+    scheduler's rate limits so they are never throttled.
+    """
+    from src.utils.scheduler import scheduler
+
+    monkeypatch.setattr(scheduler, "limits", {})
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    """
+    Replace the model calls of every agent with ``reply(agent, message)``.
+
+    The reply is a RunResponse or just its content; it serves both
+    ``Agent.run`` and ``Agent.arun``, and with ``stream=True`` text content is
+    streamed word by word. Final publications are not saved unless
+    ``keep_publications`` is set.
+    """
+
+    def install(reply, keep_publications: bool = False):
+        def respond(agent, message, stream):
+            response = reply(agent, message)
+            if not isinstance(response, RunResponse):
+                response = RunResponse(content=response)
+            if stream and isinstance(response.content, str):
+                words = re.findall(r"\s*\S+", response.content)
+                return iter([RunResponse(content=word) for word in words])
+            return response
+
+        def run(self, message=None, stream=False, **kwargs):
+            return respond(self, message, stream)
+
+        async def arun(self, message=None, stream=False, **kwargs):
+            return respond(self, message, stream)
+
+        monkeypatch.setattr(Agent, "run", run)
+        monkeypatch.setattr(Agent, "arun", arun)
+        if not keep_publications:
+            monkeypatch.setattr(Memory, "save_final_publication", lambda *args: None)
+
+    return install
+
+
+@pytest.fixture
+def make_verdict():
+    """
+    Build evaluator verdicts: ``make_verdict(approved, total, advice=...)``.
+
+    ``total`` also scores one "Claridad" criterion (``total / 10``) unless
+    ``scores`` maps criteria to their scores; ``failed_post`` adds per-post
+    feedback for a three-post thread with that post failed. Any other field
+    of PublicationEvaluation can be given as is.
+    """
+
+    def make(
+        approved: bool = False,
+        total=None,
+        advice=(),
+        scores=None,
+        failed_post=None,
+        **fields,
+    ) -> PublicationEvaluation:
+        if scores is None:
+            scores = {} if total is None else {"Claridad": total / 10}
+        values = dict(
+            approved=approved,
+            decision="Publish" if approved else "Revise",
+            failed_gates=[],
+            scores=[CriterionScore(criterion=c, score=s) for c, s in scores.items()],
+            total_score=total,
+            recommendations=[advice] if isinstance(advice, str) else list(advice),
+            post_feedback=[
+                PostFeedback(post=n, approved=n != failed_post, issues=[])
+                for n in ((1, 2, 3) if failed_post is not None else ())
+            ],
+        )
+        values.update(fields)
+        return PublicationEvaluation(**values)
+
+    return make
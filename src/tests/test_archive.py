@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+from src.utils.database import Database
+from src.utils.memory import Memory
+
+
+def _fill(db: Database, count: int) -> datetime:
+    start = datetime(2025, 1, 1)
+    db.executemany(
+        "INSERT INTO final_prompts (topic, final_prompt, timestamp) VALUES (?, ?, ?);",
+        [
+            (
+                f"topic {i}",
+                f"Publicación {i} sobre {'automatización' if i % 3 else 'liderazgo'}",
+                (start + timedelta(days=i)).isoformat(),
+            )
+            for i in range(count)
+        ],
+    )
+    return start
+
+
+def test_archive_keyset_pages_and_date_filters(isolated_db):
+    """
+    Browsing walks every publication exactly once, newest first, and date
+    ranges are half-open [since, until).
+    """
+    start = _fill(Database.shared(str(isolated_db)), 25)
+    memory = Memory(session_id="archive", db_file=str(isolated_db), durability="sync")
+
+    seen, cursor = [], None
+    while True:
+        page = memory.browse_final_publications(limit=10, cursor=cursor)
+        seen.extend(p.topic for p in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [f"topic {i}" for i in reversed(range(25))]
+
+    page = memory.browse_final_publications(
+        since=start + timedelta(days=5), until=start + timedelta(days=8)
+    )
+    assert [p.topic for p in page.items] == ["topic 7", "topic 6", "topic 5"]
+    assert page.next_cursor is None
+
+    # Aware bounds are compared in UTC: 02:00+02:00 is the stored 00:00
+    plus_two = timezone(timedelta(hours=2))
+    page = memory.browse_final_publications(
+        since=(start + timedelta(days=5, hours=2)).replace(tzinfo=plus_two),
+        until=(start + timedelta(days=8)).replace(tzinfo=timezone.utc),
+    )
+    assert [p.topic for p in page.items] == ["topic 7", "topic 6", "topic 5"]
+
+
+def test_archive_search_follows_upserts_and_deletes(isolated_db):
+    """
+    Full-text search ignores accents and case, paginates, and the FTS index
+    stays in sync when a publication is replaced or deleted.
+    """
+    _fill(Database.shared(str(isolated_db)), 12)
+    memory = Memory(session_id="archive", db_file=str(isolated_db))
+
+    first = memory.search_final_publications("LIDERAZGO", limit=3)
+    assert [p.topic for p in first.items] == ["topic 9", "topic 6", "topic 3"]
+    assert "[liderazgo]" in first.items[0].snippet
+    rest = memory.search_final_publications("liderazgo", cursor=first.next_cursor)
+    assert [p.topic for p in rest.items] == ["topic 0"]
+
+    memory.save_final_publication("topic 9", "Ahora trata de automatizacion")
+    memory.delete_final_publication("topic 6")
+    topics = [p.topic for p in memory.search_final_publications("liderazgo").items]
+    assert topics == ["topic 3", "topic 0"]
+    assert memory.search_final_publications('automatizacion"').items[0].topic == (
+        "topic 9"
+    )
+    assert memory.search_final_publications("  ()").items == []
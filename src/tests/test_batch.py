@@ -0,0 +1,92 @@
+import asyncio
+
+from src.agents.agents import PhaseChunk, PublicationWorkflow
+from src.agents.batch import BatchRunner, load_topics
+
+
+def test_load_topics_skips_blank_and_comment_lines(tmp_path):
+    """
+    Text files are read one topic per line, ignoring blanks and '#' comments.
+    """
+    topics_file = tmp_path / "topics.txt"
+    topics_file.write_text("# daily batch\nIA en pymes\n\nAgentes autónomos\n")
+    assert load_topics(topics_file) == ["IA en pymes", "Agentes autónomos"]
+
+
+def test_batch_runner_isolates_sessions(fake_agents):
+    """
+    Every topic runs in its own session and streams all four phases back.
+    """
+
+    def reply(agent, message):
+        if agent.name == "Evaluator":
+            return "Publish"
+        return f"{agent.name}:{agent.session_id}"
+
+    fake_agents(reply)
+
+    runner = BatchRunner(max_workers=2, pre_evaluate=False)
+    events = list(runner.run(["topic a", "topic b", "topic c"]))
+
+    assert len(events) == 3 * 4
+    session_ids = {timing.session_id for timing in runner.timings}
+    assert len(session_ids) == 3
+    for event in events:
+        if event.phase == "1. Draft":
+            assert event.response.content.endswith(f"Writer:{event.session_id}")
+    assert all(timing.status == "done" for timing in runner.timings)
+
+
+def test_async_batch_runner_matches_sync_sequence(fake_agents):
+    """
+    PublicationWorkflow.arun yields the same phases as run, via Agent.arun.
+    """
+    evaluations = iter(["Do not publish: add a hook", "Publish"] * 2)
+    calls = iter(range(100))
+
+    def reply(agent, message):
+        if agent.name == "Evaluator":
+            return next(evaluations)
+        return f"{agent.name} output {next(calls)}"
+
+    fake_agents(reply)
+
+    async def collect():
+        runner = BatchRunner(max_workers=2, pre_evaluate=False)
+        return [event async for event in runner.arun(["topic a", "topic b"])]
+
+    events = asyncio.run(collect())
+    for index in (0, 1):
+        phases = [event.phase for event in events if event.index == index]
+        assert phases == [
+            "0. Plan",
+            "1. Draft",
+            "2.0 Evaluation",
+            "2.1 Revision",
+            "2.1 Evaluation",
+            "3. Published",
+        ]
+
+
+def test_workflow_streams_tagged_phase_chunks(fake_agents):
+    """
+    With stream=True every agent delta is yielded as a PhaseChunk tagged with
+    its phase, before the regular per-phase RunResponse.
+    """
+    fake_agents(
+        lambda agent, message: (
+            "Publish" if agent.name == "Evaluator" else f"{agent.name} output"
+        )
+    )
+
+    workflow = PublicationWorkflow(session_id="stream-test")
+    responses = list(
+        workflow.run(topic="topic", use_cache=False, stream=True, pre_evaluate=False)
+    )
+
+    chunks = [r for r in responses if isinstance(r, PhaseChunk)]
+    assert [c.content for c in chunks if c.phase == "draft"] == ["Writer", " output"]
+    evaluation = [c for c in chunks if c.phase == "evaluation"]
+    assert evaluation[0].label == "2.0 Evaluation" and evaluation[0].iteration == 0
+    finals = [r.content for r in responses if not isinstance(r, PhaseChunk)]
+    assert finals[1] == "# 1. Draft\n\nWriter output"
@@ -0,0 +1,27 @@
+import sqlite3
+
+from src.benchmarks.workflow import run_benchmark
+
+
+def test_offline_benchmark_runs_full_workflow(tmp_path):
+    """
+    The fake model drives every phase offline; approval on the 2nd evaluation
+    means one revision per topic, and SQLite writes are counted.
+    """
+    original_connect = sqlite3.connect
+    result = run_benchmark(topics=2, approve_on=2, output_tokens=20, workdir=tmp_path)
+
+    assert {phase: row["calls"] for phase, row in result["phases"].items()} == {
+        "plan": 2,
+        "draft": 2,
+        "evaluation": 4,
+        "revision": 2,
+        "compaction": 2,
+        "loop": 2,
+        "publish": 2,
+    }
+    assert result["terminations"] == {"approved": 2}
+    assert result["throughput"] > 0
+    assert result["sqlite_writes"] > 0
+    assert (tmp_path / "publication_generation.db").exists()
+    assert sqlite3.connect is original_connect
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+from src.agents.agents import PublicationWorkflow
+
+GOOD_THREAD = "\n\n---\n\n".join(
+    [
+        "1/ ¿Tu equipo pierde horas revisando hilos?",
+        "2/ Un agente de IA revisa formato, tono y hashtags en segundos.",
+        "3/ ¿Lo probarías en tu próxima campaña? #IA",
+    ]
+)
+
+
+def test_candidates_are_written_and_scored_in_parallel(fake_agents):
+    """
+    K writer calls run concurrently at different temperatures, every
+    candidate is scored, and the approved one skips the loop's evaluation.
+    """
+    calls = []
+    # Every writer call waits for the other two: they must run concurrently
+    barrier = threading.Barrier(3, timeout=5)
+
+    def reply(agent, message):
+        calls.append(agent.name)
+        if agent.name == "Writer":
+            barrier.wait()
+            return f"Draft at {agent.model.temperature}"
+        if agent.name == "Evaluator":
+            good = "0.7" in message
+            score = 90 if good else 60
+            return (
+                f"**Decision:** {'Publish' if good else 'Revise'}\n\n"
+                f"**Soft-Quality Score:** {score} / 100"
+            )
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="candidates")
+    responses = list(
+        workflow.run(
+            topic="candidates topic",
+            use_cache=False,
+            pre_evaluate=False,
+            candidates=3,
+        )
+    )
+    assert calls.count("Writer") == 3 and calls.count("Evaluator") == 3
+    assert calls[-1] == "Publisher"
+    assert responses[1].content.startswith(
+        "# 1. Draft (candidate 2 of 3, best_score)\n\nDraft at 0.7"
+    )
+    assert responses[2].content.startswith("# 2.0 Evaluation\n\n**Decision:** Publish")
+
+
+def test_fewest_violations_policy_skips_candidate_evaluations(fake_agents):
+    """
+    The rules-only policy picks the candidate that passes the local checks;
+    only that one reaches the evaluator, inside the loop (arun).
+    """
+    evaluated = []
+    drafts = {1.0: "Sin hashtags", 0.7: GOOD_THREAD, 1.2: "x" * 300}
+
+    def reply(agent, message):
+        if agent.name == "Writer":
+            return drafts[agent.model.temperature]
+        if agent.name == "Evaluator":
+            evaluated.append(message)
+            return "Publish"
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+
+    async def collect():
+        workflow = PublicationWorkflow(session_id="candidates-rules")
+        return [
+            r
+            async for r in workflow.arun(
+                topic="rules topic",
+                use_cache=False,
+                candidates=3,
+                candidate_policy="fewest_violations",
+            )
+        ]
+
+    responses = asyncio.run(collect())
+    assert len(evaluated) == 1 and "2/ Un agente" in evaluated[0]
+    assert responses[1].content.startswith("# 1. Draft (candidate 2 of 3")
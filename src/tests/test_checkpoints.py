@@ -0,0 +1,79 @@
+import pytest
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.checkpoints import DONE, LOOP
+from src.utils.loop_controller import RevisionLoopController
+
+
+class Crash(BaseException):
+    """Stands for the process dying: not caught by the workflow"""
+
+
+ADVICE = "Sumar un dato concreto"
+
+
+def test_resume_continues_where_the_run_stopped(fake_agents, make_verdict):
+    """
+    A crash during the first revision loses nothing already paid for: the
+    resumed run keeps its id and options, skips the plan, the draft and the
+    evaluation of the draft, and goes on with the revision.
+    """
+    calls, drafts = [], iter(range(1, 10))
+    crash = {"revision": True}
+    verdicts = iter([make_verdict(False, 60, ADVICE), make_verdict(True, 85)])
+
+    def reply(agent, message):
+        calls.append(agent.name)
+        if agent.name == "Writer":
+            if "feedback" in message and crash.pop("revision", False):
+                raise Crash()
+            return f"Borrador {next(drafts)} #IA"
+        if agent.name == "Evaluator":
+            return next(verdicts)
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="checkpoints")
+    with pytest.raises(Crash):
+        list(workflow.run(topic="checkpoint topic", use_cache=False, num_posts=1))
+    run_id = workflow.run_id
+    checkpoint = workflow.memory.get_checkpoint(run_id)
+    assert checkpoint.phase == LOOP and checkpoint.iteration == 0
+    assert checkpoint.evaluation.total_score == 60
+    assert [c.run_id for c in workflow.memory.list_unfinished_runs()] == [run_id]
+    assert calls == ["Orchestrator", "Writer", "Evaluator", "Writer"]
+
+    calls.clear()
+    resumed = PublicationWorkflow(session_id="checkpoints")
+    responses = list(resumed.resume(run_id))
+
+    assert calls == ["Writer", "Evaluator", "Publisher"]
+    assert resumed.run_id == run_id
+    headers = [r.content.split("\n", 1)[0] for r in responses]
+    assert headers[0] == "# Resumed (loop, iteration 0)"
+    assert "# 2.1 Revision" in headers and "# 3. Published" in headers
+    assert resumed.memory.get_checkpoint(run_id).phase == DONE
+    assert resumed.memory.list_unfinished_runs() == []
+    with pytest.raises(ValueError):
+        resumed.resume(run_id)
+
+
+def test_controller_state_round_trip(make_verdict):
+    """The spent budget, best draft and score history survive a restart."""
+    controller = RevisionLoopController(plateau_patience=2)
+    controller.tokens, controller.cost = 1200, 0.01
+    controller.record_evaluation(0, "draft A", make_verdict(False, 70, ADVICE))
+    controller.record_evaluation(1, "draft B", make_verdict(False, 70.5, ADVICE))
+
+    restored = RevisionLoopController(plateau_patience=2)
+    restored.restore(controller.state())
+    assert (restored.tokens, restored.cost) == (1200, 0.01)
+    assert restored.best_draft == "draft B" and restored.best_iteration == 1
+    assert restored.scores.history == controller.scores.history
+    # One more stale evaluation reaches the plateau, as it would have before
+    restored._last_feedback = None
+    assert (
+        restored.record_evaluation(2, "draft C", make_verdict(False, 70, ADVICE))
+        == "score_plateau"
+    )
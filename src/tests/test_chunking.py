@@ -0,0 +1,49 @@
+from agno.document.base import Document
+
+from src.utils.chunking import MarkdownChunking
+
+MARKDOWN = (
+    """# Guía
+
+## 1. Propósito
+Texto corto sobre el propósito.
+
+## 2. Formato
+```python
+# not a heading
+```
+"""
+    + "Párrafo largo sobre formato. " * 40
+)
+
+
+def test_chunks_follow_headings_with_metadata():
+    """
+    Chunks start at headings, carry the heading path and map back to the source
+    by offset; '#' lines inside code fences are not headings.
+    """
+    chunking = MarkdownChunking(chunk_size=400, overlap=50)
+    chunks = chunking.chunk(
+        Document(content=MARKDOWN, name="guia.md", meta_data={"source": "guia.md"})
+    )
+
+    paths = [chunk.meta_data["heading_path"] for chunk in chunks]
+    assert paths[0] == "Guía > 1. Propósito"
+    assert set(paths[1:]) == {"Guía > 2. Formato"}
+    assert len(chunks) > 2
+    for chunk in chunks:
+        assert chunk.meta_data["source"] == "guia.md"
+        assert len(chunk.content) <= 400
+        offset = chunk.meta_data["offset"]
+        assert MARKDOWN[offset:].lstrip().startswith(chunk.content[:30])
+
+
+def test_long_sections_overlap():
+    """
+    Consecutive windows of a long section share up to ``overlap`` characters.
+    """
+    chunking = MarkdownChunking(chunk_size=400, overlap=50)
+    chunks = chunking.chunk(Document(content=MARKDOWN, name="guia.md"))[1:]
+    for previous, current in zip(chunks, chunks[1:]):
+        previous_end = previous.meta_data["offset"] + len(previous.content)
+        assert 0 < previous_end - current.meta_data["offset"] <= 50
@@ -0,0 +1,79 @@
+import json
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.compaction import action_items, count_tokens, fit_prompt
+from src.utils.evaluation import PostFeedback
+from src.utils.metrics import compaction_stats
+from src.utils.pre_evaluator import RuleViolation
+
+
+def test_action_items_are_short_deduplicated_and_prioritized(make_verdict):
+    items = action_items(
+        verdict=make_verdict(
+            total=60,
+            failed_gates=["Falta CTA"],
+            advice=["Acortar el hook.", "acortar el HOOK", "Sumar un dato"],
+            post_feedback=[PostFeedback(post=2, approved=False, issues=["Muy largo"])],
+        ),
+        violations=[RuleViolation(rule="hashtags", message="missing", post=3)],
+        max_items=4,
+    )
+    assert items == [
+        "Post 3: hashtags: missing",
+        "Falta CTA",
+        "Post 2: Muy largo",
+        "Acortar el hook.",
+    ]
+
+
+def test_fit_prompt_trims_optional_fields_in_order():
+    def render(**data):
+        return json.dumps(data)
+
+    data = {"post": "p" * 40, "context": "c" * 400, "feedback": ["a" * 40] * 10}
+    fitted = json.loads(
+        fit_prompt(render, data, max_tokens=60, trim=("feedback", "context"))
+    )
+    assert fitted["post"] == data["post"]
+    assert fitted["feedback"] == ["a" * 40]
+    assert fitted["context"] is None
+    # Without a budget nothing is trimmed
+    assert fit_prompt(render, data, max_tokens=None) == render(**data)
+    assert count_tokens("") == 0
+
+
+def test_revisions_send_compacted_feedback(fake_agents, make_verdict):
+    """
+    The writer gets the draft plus a list of fixes (not the verdict markdown),
+    and the prompt tokens before/after compaction are reported per iteration.
+    """
+    prompts = []
+    verdicts = iter(
+        [
+            make_verdict(
+                total=60, advice=[f"Recomendación número {n}" for n in range(12)]
+            ),
+            make_verdict(True, 90),
+        ]
+    )
+
+    def reply(agent, message):
+        if agent.name == "Writer":
+            prompts.append(json.loads(message))
+            return f"Borrador {len(prompts)} #IA"
+        if agent.name == "Evaluator":
+            return next(verdicts)
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="compaction")
+    workflow.max_action_items = 5
+    list(workflow.run(topic="compaction topic", use_cache=False, pre_evaluate=False))
+
+    revision = prompts[-1]
+    assert revision["draft"] == "Borrador 1 #IA"
+    assert revision["feedback"] == [f"Recomendación número {n}" for n in range(5)]
+    stats = compaction_stats(workflow.metrics.events(run_id=workflow.run_id))
+    assert list(stats) == [1]
+    assert 0 < stats[1]["after"] < stats[1]["before"]
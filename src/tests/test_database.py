@@ -0,0 +1,43 @@
+import threading
+
+from src.utils.database import MIGRATIONS, Database
+from src.utils.memory import Memory
+
+
+def test_database_is_wal_migrated_once_and_per_thread(isolated_db):
+    """
+    The shared instance is migrated once, uses WAL and gives every thread its
+    own reusable connection.
+    """
+    db = Database.shared(str(isolated_db))
+    assert Database.shared(str(isolated_db)) is db
+    assert db.query("PRAGMA journal_mode;")[0][0] == "wal"
+    assert db.query("PRAGMA user_version;")[0][0] == MIGRATIONS[-1][0]
+    assert db.connection is db.connection
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.connection))
+    thread.start()
+    thread.join()
+    assert other[0] is not db.connection
+
+
+def test_memory_final_publications_roundtrip(isolated_db):
+    """
+    Final publications are saved, read, listed and deleted through the
+    configured database, also from a fresh Memory without session state.
+    """
+    memory = Memory(session_id="db-test", db_file=str(isolated_db))
+    memory.save_final_publication("topic a", "first")
+    memory.save_final_publication("topic b", "second")
+    memory.save_final_publication("topic a", "first, edited")
+
+    fresh = Memory(session_id="db-test-2", db_file=str(isolated_db))
+    assert fresh.get_final_publication("topic a").final_publication == ("first, edited")
+    assert {p.topic for p in fresh.list_final_publications()} == {
+        "topic a",
+        "topic b",
+    }
+    assert fresh.delete_final_publication("topic b") is True
+    assert fresh.delete_final_publication("topic b") is False
+    assert fresh.get_final_publication("topic b") is None
@@ -0,0 +1,60 @@
+from src.agents.agents import PublicationWorkflow
+from src.utils.dedup import NearDuplicateIndex
+
+THREAD = (
+    "1/ ¿Dejarías en manos de una IA la creación de tu próximo hilo? Según "
+    "Forbes, el 79% de las empresas que usan IA en contenidos han reducido su "
+    "carga de trabajo.\n2/ La IA ya no solo redacta: piensa estratégicamente y "
+    "mantiene la coherencia con tu voz de marca.\n3/ Una fintech usó IA para "
+    "generar hilos diarios y aumentó sus guardados en X un 15% mensual. #IA"
+)
+
+
+def test_index_finds_near_duplicates_only():
+    """
+    Light edits (case, accents, emojis, one changed word) are still detected;
+    unrelated text and removed entries are not.
+    """
+    index = NearDuplicateIndex(threshold=0.7)
+    index.add("final:ia", THREAD)
+    index.add("final:other", "Cinco errores comunes al migrar una base de datos")
+
+    edited = THREAD.upper().replace("79%", "80%").replace("IA", "IA 🤖", 1)
+    match = index.query(edited)
+    assert match is not None and match.key == "final:ia"
+    assert match.similarity >= 0.7
+    assert index.query("Guía práctica de liderazgo para equipos remotos") is None
+
+    index.remove("final:ia")
+    assert index.query(edited) is None
+    assert len(index) == 1
+
+
+def test_workflow_stops_duplicate_draft_before_evaluation(fake_agents):
+    """
+    A draft that repeats a published thread ends the run before the
+    evaluator is called; with on_duplicate="flag" the run goes on.
+    """
+    calls = []
+
+    def reply(agent, message):
+        calls.append(agent.name)
+        if agent.name == "Evaluator":
+            return "Publish"
+        if agent.name == "Writer":
+            return THREAD
+        return f"{agent.name} output"
+
+    fake_agents(reply, keep_publications=True)
+
+    workflow = PublicationWorkflow(session_id="dedup")
+    workflow.memory.save_final_publication("old topic", THREAD)
+    responses = list(workflow.run(topic="new topic"))
+    assert responses[-1].content.startswith("# 1. Duplicate")
+    assert "final:old topic" in responses[-1].content
+    assert calls == ["Orchestrator", "Writer"]
+
+    calls.clear()
+    flagged = PublicationWorkflow(session_id="dedup-flag", on_duplicate="flag")
+    list(flagged.run(topic="new topic", use_cache=False))
+    assert calls == ["Orchestrator", "Writer", "Evaluator", "Publisher"]
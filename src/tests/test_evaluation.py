@@ -0,0 +1,94 @@
+from src.agents.agents import PublicationWorkflow
+from src.utils.evaluation import ScoreTracker, parse_evaluation
+
+TEMPLATE_VERDICT = """**Decision:** Revise
+
+**Hard-Gate Compliance:**
+
+- Format & Length: ✓
+- Hashtags: ✗
+
+**Soft-Quality Score:** 72 / 100
+| Criterion | Score/10 | Note (optional) |
+|-----------|----------|-----------------|
+| Claridad | 8 | |
+| Engagement | 6 | weak hook |
+
+**Feedback & Actionable Suggestions:**
+
+- Move the hashtags to the end
+- Publish the stat source
+"""
+
+
+ADVICE = "Sharpen the hook"
+
+
+def test_parse_evaluation_reads_structured_and_markdown_verdicts(make_verdict):
+    """
+    Structured outputs, cached JSON and the markdown template all give the
+    same verdict; words like "publish" in the feedback do not approve.
+    """
+    structured = make_verdict(False, 72, ADVICE, scores={"Engagement": 6})
+    assert parse_evaluation(structured) is structured
+    assert parse_evaluation(structured.model_dump_json()) == structured
+
+    parsed = parse_evaluation(TEMPLATE_VERDICT)
+    assert parsed.approved is False
+    assert parsed.failed_gates == ["Hashtags"]
+    assert parsed.total_score == 72
+    assert parsed.score_map() == {"claridad": 8, "engagement": 6}
+    assert parsed.recommendations[1] == "Publish the stat source"
+
+    assert parse_evaluation("Publish. The draft is approved.").approved
+    assert not parse_evaluation("Do not publish: add a hook").approved
+    assert not parse_evaluation(
+        "Looks close, approved once you publish a source"
+    ).approved
+
+
+def test_score_tracker_detects_plateaus(make_verdict):
+    """
+    Two evaluations in a row without a 1-point gain on any criterion (or the
+    total) is a plateau; any real gain resets it.
+    """
+    tracker = ScoreTracker(patience=2, min_delta=1.0)
+    for engagement, total, plateaued in [
+        (5, 60, False),
+        (7, 70, False),
+        (7.5, 70, False),
+        (7, 70.5, True),
+        (9, 70, False),
+    ]:
+        tracker.record(
+            make_verdict(False, total, ADVICE, scores={"Engagement": engagement})
+        )
+        assert tracker.plateaued is plateaued
+
+
+def test_workflow_stops_revising_when_scores_plateau(fake_agents, make_verdict):
+    """
+    The loop follows the structured verdict and stops early (and publishes)
+    once the scores stop improving, instead of using every revision.
+    """
+    calls = []
+    stale = make_verdict(False, 70, ADVICE, scores={"Engagement": 6})
+
+    def reply(agent, message):
+        calls.append(agent.name)
+        if agent.name == "Evaluator":
+            return stale
+        return f"{agent.name} output {len(calls)}"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="plateau")
+    workflow.plateau_patience = 1
+    responses = list(
+        workflow.run(
+            topic="plateau topic", use_cache=False, max_revisions=10, pre_evaluate=False
+        )
+    )
+    assert calls.count("Evaluator") == 2
+    assert calls[-1] == "Publisher"
+    assert "**Soft-Quality Score:** 70 / 100" in responses[2].content
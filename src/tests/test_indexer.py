@@ -0,0 +1,111 @@
+from agno.document import Document
+from agno.embedder.base import Embedder
+from agno.vectordb.chroma import ChromaDb
+
+from src.utils.indexer import IncrementalIndexer
+
+
+class CountingEmbedder(Embedder):
+    """Deterministic offline embedder that counts how many texts it embedded."""
+
+    calls: int = 0
+
+    def get_embedding(self, text):
+        self.calls += 1
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0]
+
+    def get_embedding_and_usage(self, text):
+        return self.get_embedding(text), None
+
+
+def test_sync_only_embeds_changed_files(tmp_path):
+    """
+    A second sync embeds only modified/new docs and drops vectors of removed ones.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\nalpha")
+    (docs / "b.md").write_text("# B\nbeta")
+    embedder = CountingEmbedder(dimensions=3)
+    vector_db = ChromaDb(
+        collection="documents",
+        path=str(tmp_path / "chroma"),
+        persistent_client=True,
+        embedder=embedder,
+    )
+    indexer = IncrementalIndexer(docs_dir=docs, vector_db=vector_db)
+
+    first = indexer.sync()
+    assert sorted(first.added) == ["a.md", "b.md"] and embedder.calls == 2
+
+    second = indexer.sync()
+    assert not second.changed and embedder.calls == 2
+
+    (docs / "a.md").write_text("# A\nalpha, revised")
+    (docs / "b.md").unlink()
+    (docs / "c.md").write_text("# C\ngamma")
+    third = indexer.sync()
+    assert third.updated == ["a.md"] and third.added == ["c.md"]
+    assert third.removed == ["b.md"]
+    assert embedder.calls == 4
+    assert vector_db.get_count() == 2
+
+
+def test_shared_chunk_survives_removal_of_one_file(tmp_path):
+    """
+    Identical content maps to one vector id: removing one of the files that
+    produce it must not delete the vector the other file still uses.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# Shared\nsame text")
+    (docs / "b.md").write_text("# Shared\nsame text")
+    vector_db = ChromaDb(
+        collection="documents",
+        path=str(tmp_path / "chroma"),
+        persistent_client=True,
+        embedder=CountingEmbedder(dimensions=3),
+    )
+    indexer = IncrementalIndexer(docs_dir=docs, vector_db=vector_db)
+    indexer.sync()
+    assert vector_db.get_count() == 1
+
+    (docs / "b.md").unlink()
+    report = indexer.sync()
+    assert report.removed == ["b.md"]
+    assert vector_db.get_count() == 1
+
+    (docs / "a.md").write_text("# A\nnow different")
+    indexer.sync()
+    assert vector_db.get_count() == 1
+
+
+def test_repeated_chunk_within_a_file_is_upserted_once(tmp_path):
+    """A file whose chunks repeat indexes (and references) each vector once."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("intro---same---same")
+    vector_db = ChromaDb(
+        collection="documents",
+        path=str(tmp_path / "chroma"),
+        persistent_client=True,
+        embedder=CountingEmbedder(dimensions=3),
+    )
+
+    def chunks(path, content):
+        return [
+            Document(content=part, name=path.name, meta_data={"source": path.name})
+            for part in content.split("---")
+        ]
+
+    indexer = IncrementalIndexer(
+        docs_dir=docs, vector_db=vector_db, build_documents=chunks
+    )
+    report = indexer.sync()
+    assert report.added == ["a.md"] and report.embedded == 2
+    assert vector_db.get_count() == 2
+
+    (docs / "a.md").write_text("intro---other")
+    indexer.sync()
+    assert vector_db.get_count() == 2
+    assert len(indexer.load_manifest()["a.md"]["ids"]) == 2
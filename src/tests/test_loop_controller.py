@@ -0,0 +1,116 @@
+from agno.run.response import RunResponse
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.loop_controller import LoopBudget, RevisionLoopController
+from src.utils.metrics import MetricsRegistry, PhaseEvent
+
+
+def test_controller_stops_on_budgets_and_diminishing_returns(make_verdict):
+    """
+    Tokens charged from phase events exhaust the budget; near-identical
+    revisions and repeated feedback stop the loop; the best draft wins.
+    """
+    controller = RevisionLoopController(
+        max_revisions=10, budget=LoopBudget(max_tokens=1000)
+    )
+    assert controller.check_budget(0) is None
+    controller.charge(PhaseEvent(None, None, "t", "draft", input_tokens=900))
+    assert controller.check_budget(1) is None
+    controller.charge(PhaseEvent(None, None, "t", "revision", output_tokens=100))
+    assert controller.check_budget(1) == "token_budget"
+    assert RevisionLoopController(max_revisions=2).check_budget(2) is None
+    assert RevisionLoopController(max_revisions=2).check_budget(3) == "max_revisions"
+
+    controller = RevisionLoopController()
+    hook, source = (
+        make_verdict(total=70, advice="Add a hook"),
+        make_verdict(total=60, advice="Cite a source"),
+    )
+    assert controller.record_evaluation(0, "draft A", hook) is None
+    assert controller.record_evaluation(1, "draft B", source) is None
+    assert (
+        controller.record_revision("draft B text", "Draft B text") == "draft_converged"
+    )
+    assert controller.final_draft("draft C") == "draft A"
+
+    controller = RevisionLoopController()
+    hook, same_hook = (
+        make_verdict(total=70, advice="Add a hook, please"),
+        make_verdict(total=71, advice="add a hook please!"),
+    )
+    controller.record_evaluation(0, "draft A", hook)
+    assert controller.record_evaluation(1, "draft B", same_hook) == "repeated_feedback"
+    assert controller.final_draft("draft B") == "draft B"
+
+
+def test_workflow_publishes_best_draft_when_budget_runs_out(fake_agents, make_verdict):
+    """
+    Without approval the loop ends on the cost budget, the best-scored draft
+    is published and the reason is recorded in the run's "loop" event.
+    """
+    published, writes = [], []
+    scores = iter([70, 85, 65, 60, 55])
+    advice = iter(["Add a hook", "Cite a source", "Shorten post 2", "End with a CTA"])
+
+    def reply(agent, message):
+        tokens = {"input_tokens": [10000], "output_tokens": [1000]}
+        if agent.name == "Evaluator":
+            content = make_verdict(False, next(scores), next(advice))
+        elif agent.name == "Publisher":
+            published.append(message)
+            content = "Published"
+        else:
+            writes.append(agent.name)
+            content = f"{agent.name} output {len(writes)}"
+        return RunResponse(content=content, metrics=tokens)
+
+    fake_agents(reply)
+    registry = MetricsRegistry()
+
+    workflow = PublicationWorkflow(session_id="budget", metrics_registry=registry)
+    # gpt-4.1 call: 10k in + 1k out = $0.028; o4-mini evaluation: $0.0154
+    responses = list(
+        workflow.run(
+            topic="budget topic",
+            use_cache=False,
+            pre_evaluate=False,
+            budget=LoopBudget(max_cost=0.15),
+        )
+    )
+    loop = [e for e in registry.events(run_id=workflow.run_id) if e.phase == "loop"]
+    assert [e.termination for e in loop] == ["cost_budget"]
+    assert "# 2. Stopped (cost_budget)" in [r.content.split("\n")[0] for r in responses]
+    best = [r.content for r in responses if r.content.startswith("# 2.1 Revision")]
+    assert best and best[0].split("\n\n", 1)[1] in published[0]
+
+
+def test_max_revisions_is_the_number_of_revisions(fake_agents, make_verdict):
+    """max_revisions=1 runs exactly one revision, and it is scored too."""
+    revisions, evaluations = [], []
+    advice = iter(["Add a hook", "Cite a source", "Shorten post 2"])
+
+    def reply(agent, message):
+        if agent.name == "Evaluator":
+            evaluations.append(message)
+            return make_verdict(False, 60 + 10 * len(evaluations), next(advice))
+        if agent.name == "Writer" and "feedback" in message:
+            revisions.append(message)
+            return "A fully rewritten thread #IA"
+        return f"{agent.name} output #IA"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="max-revisions")
+    list(
+        workflow.run(
+            topic="max revisions topic",
+            use_cache=False,
+            pre_evaluate=False,
+            max_revisions=1,
+        )
+    )
+    assert len(revisions) == 1 and len(evaluations) == 2
+    loop = [
+        e for e in workflow.metrics.events(run_id=workflow.run_id) if e.phase == "loop"
+    ]
+    assert [e.termination for e in loop] == ["max_revisions"]
@@ -0,0 +1,56 @@
+import json
+
+from agno.run.response import RunResponse
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.metrics import MetricsRegistry, summarize
+
+
+def test_workflow_records_phase_events(fake_agents, tmp_path):
+    """
+    Every phase is recorded with its tokens and tool calls, mirrored to JSONL,
+    and a cached re-run shows up as cache hits.
+    """
+
+    def reply(agent, message):
+        content = "Publish" if agent.name == "Evaluator" else f"{agent.name} output"
+        return RunResponse(
+            content=content,
+            metrics={"input_tokens": [100, 20], "output_tokens": [30]},
+            tools=[
+                {"tool_name": "search_knowledge_base", "metrics": {"time": 0.5}},
+                {"tool_name": "create_file"},
+            ],
+        )
+
+    fake_agents(reply)
+    registry = MetricsRegistry(jsonl_path=str(tmp_path / "metrics.jsonl"))
+
+    workflow = PublicationWorkflow(session_id="metrics", metrics_registry=registry)
+    list(workflow.run(topic="metrics topic", pre_evaluate=False))
+    events = registry.events(run_id=workflow.run_id)
+
+    assert [e.phase for e in events] == [
+        "plan",
+        "draft",
+        "evaluation",
+        "loop",
+        "publish",
+    ]
+    assert all(e.cache == "miss" for e in events[:3]) and events[4].cache is None
+    assert events[0].input_tokens == 120 and events[0].output_tokens == 30
+    # gpt-4.1: $2 / $8 per 1M input / output tokens
+    assert abs(events[0].cost - (120 * 2 + 30 * 8) / 1e6) < 1e-12
+    assert events[3].termination == "approved"
+    assert events[1].knowledge_searches == 1
+    assert events[1].knowledge_search_time == 0.5
+    assert events[1].tool_calls == {"create_file": 1}
+    lines = (tmp_path / "metrics.jsonl").read_text().splitlines()
+    assert [json.loads(line)["phase"] for line in lines] == [e.phase for e in events]
+
+    workflow = PublicationWorkflow(session_id="metrics", metrics_registry=registry)
+    list(workflow.run(topic="metrics topic", pre_evaluate=False))
+    summary = summarize(registry.events(run_id=workflow.run_id))
+    assert summary["plan"]["cache_hits"] == 1 and summary["plan"]["calls"] == 0
+    assert summary["publish"]["calls"] == 1
+    assert summary["loop"]["terminations"] == {"approved": 1}
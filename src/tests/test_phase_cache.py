@@ -0,0 +1,136 @@
+import time
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.database import Database, WriteBehindQueue
+from src.utils.phase_cache import PhaseCache
+
+
+def test_key_depends_on_every_input():
+    """
+    Changing the template, model or any phase input produces a different key.
+    """
+    base = PhaseCache.make_key(
+        "draft", "topic", "tpl", "gpt-4.1", plan="p", num_posts=1
+    )
+    assert base == PhaseCache.make_key(
+        "draft", "topic", "tpl", "gpt-4.1", num_posts=1, plan="p"
+    )
+    assert base != PhaseCache.make_key(
+        "draft", "topic", "tpl v2", "gpt-4.1", plan="p", num_posts=1
+    )
+    assert base != PhaseCache.make_key(
+        "draft", "topic", "tpl", "o4-mini", plan="p", num_posts=1
+    )
+    assert base != PhaseCache.make_key(
+        "draft", "topic", "tpl", "gpt-4.1", plan="p", num_posts=2
+    )
+
+
+def test_values_survive_a_new_instance(isolated_db):
+    """
+    Entries are durable: a fresh cache on the same file sees them.
+    """
+    PhaseCache(db_file=str(isolated_db)).put("k", "plan text", phase="plan")
+    cache = PhaseCache(db_file=str(isolated_db))
+    assert cache.get("k", phase="plan") == "plan text"
+    assert cache.get("missing", phase="plan") is None
+    assert cache.stats()["by_phase"]["plan"] == {"hits": 1, "misses": 1}
+
+
+def test_ttl_and_size_eviction(isolated_db):
+    """
+    Expired entries are misses and the least recently used entries are evicted.
+    """
+    cache = PhaseCache(
+        db_file=str(isolated_db), ttl_seconds=0.05, max_entries=2, durability="sync"
+    )
+    cache.put("old", "value")
+    time.sleep(0.1)
+    assert cache.get("old") is None
+
+    cache.ttl_seconds = None
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert cache.evictions >= 2
+
+
+def test_batched_writes_are_grouped_and_read_back(isolated_db):
+    """
+    Batched puts are queued, visible to other readers in the process before
+    they are committed, and committed together in a single transaction.
+    """
+    cache = PhaseCache(db_file=str(isolated_db), durability="batched")
+    queue = cache.db.write_behind
+    queue.flush_interval = 60  # keep the background thread out of the way
+    for i in range(5):
+        cache.put(f"k{i}", f"value {i}", phase="draft")
+    assert queue.submitted_seq - queue.flushed_seq == 5
+
+    other = PhaseCache(db_file=str(isolated_db), durability="batched")
+    batches = queue.batches
+    assert other.get("k3", phase="draft") == "value 3"
+    assert queue.batches == batches
+
+    assert queue.flush() == 5
+    assert queue.batches == batches + 1 and queue.pending(("phase_cache", "k3")) is None
+    assert other.get("k3", phase="draft") == "value 3"
+
+
+def test_flush_fallback_keeps_housekeeping_and_unwritten_writes(
+    isolated_db, monkeypatch
+):
+    """
+    When the batch transaction fails, deferred housekeeping still runs, bad
+    writes are dropped, and writes that failed for another reason stay queued.
+    """
+    db = Database(db_file=str(isolated_db))
+    db.execute("CREATE TABLE t (v TEXT)")
+    queue = WriteBehindQueue(db, flush_interval=60)
+    swept = []
+    queue.submit("INSERT INTO t VALUES (?)", ("a",))
+    queue.submit("INSERT INTO missing VALUES (?)", ("bad",))
+    queue.defer("sweep", lambda conn: swept.append(1))
+    assert queue.flush() == 2
+    assert swept == [1] and queue.errors == 1
+    assert queue.flushed_seq == queue.submitted_seq
+
+    seq = queue.submit("INSERT INTO missing VALUES (?)", ("bad",), overlay=("k", 1))
+    queue.submit("INSERT INTO t VALUES (?)", ("b",))
+    execute = db.execute
+
+    def unavailable(sql, params=()):
+        raise RuntimeError("connection unavailable")
+
+    monkeypatch.setattr(db, "execute", unavailable)
+    assert queue.flush() == 0
+    assert queue.flushed_seq == seq - 1 and queue.pending("k") == 1
+
+    monkeypatch.setattr(db, "execute", execute)
+    assert queue.flush() == 2
+    assert queue.flushed_seq == queue.submitted_seq and queue.pending("k") is None
+    assert db.query("SELECT v FROM t") == [("a",), ("b",)]
+
+
+def test_failed_run_flushes_queued_artifacts(fake_agents):
+    """
+    A run that ends on a phase error still commits what it queued (the plan)
+    before returning, not only a published one.
+    """
+
+    def reply(agent, message):
+        if agent.name == "Writer":
+            raise RuntimeError("writer down")
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+    workflow = PublicationWorkflow(session_id="flush-on-error")
+    queue = workflow.memory.db.write_behind
+    queue.flush_interval = 60  # keep the background thread out of the way
+    responses = list(workflow.run(topic="flush topic", use_cache=True))
+
+    assert responses[-1].content.startswith("Error during draft generation")
+    assert queue.submitted_seq > 0 and queue.flushed_seq == queue.submitted_seq
@@ -0,0 +1,105 @@
+import json
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.pre_evaluator import replace_posts, split_posts
+
+POSTS = [
+    "1/ ¿Tu equipo pierde horas revisando hilos?",
+    "2/ " + "Un agente de IA revisa formato, tono y hashtags. " * 6,
+    "3/ Contanos abajo. #IA",
+]
+
+
+def test_only_failed_posts_are_rewritten(fake_agents, make_verdict):
+    """
+    A rule broken by one post, then an evaluator verdict on another post:
+    each revision rewrites only that post and keeps the rest of the thread.
+    """
+    rewrites, published = [], []
+    verdicts = iter([make_verdict(failed_post=3), make_verdict(True)])
+
+    def reply(agent, message):
+        if agent.name == "Writer":
+            prompt = json.loads(message)
+            if "post_number" not in prompt:
+                return "\n\n---\n\n".join(POSTS)
+            rewrites.append(prompt)
+            return f"{prompt['post_number']}/ Reescrito #IA"
+        if agent.name == "Evaluator":
+            return next(verdicts)
+        if agent.name == "Publisher":
+            published.append(json.loads(message)["content"])
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="post-rewrite")
+    responses = list(workflow.run(topic="post rewrite topic", use_cache=False))
+
+    assert [(r["post_number"], r["previous_post"]) for r in rewrites] == [
+        (2, POSTS[0]),
+        (3, "2/ Reescrito #IA"),
+    ]
+    assert "char_limit" in rewrites[0]["feedback"][0]
+    assert split_posts(published[0]) == [
+        POSTS[0],
+        "2/ Reescrito #IA",
+        "3/ Reescrito #IA",
+    ]
+    headers = [r.content.split("\n", 1)[0] for r in responses]
+    assert "# 2.1 Revision (posts 2)" in headers
+    assert "# 2.2 Revision (posts 3)" in headers
+
+
+def test_thread_level_feedback_rewrites_the_whole_draft(make_verdict):
+    """General recommendations or single-post drafts need a full rewrite."""
+    issues = PublicationWorkflow._post_issues
+    assert issues(POSTS, verdict=make_verdict(failed_post=2)) == {2: []}
+    thread_advice = make_verdict(failed_post=2, advice="Reorder the thread")
+    assert issues(POSTS, verdict=thread_advice) is None
+    assert issues(POSTS[:1], verdict=make_verdict(failed_post=1)) is None
+
+
+def test_untouched_posts_keep_their_source(fake_agents, make_verdict):
+    """
+    Splicing a rewritten post into the draft leaves the front matter, titles,
+    markup and the other posts byte-identical.
+    """
+    draft = (
+        "---\ntitle: Hilo\n---\n## Hilo sobre IA\n\n1/ **¿Tu equipo** pierde horas?"
+        "\n\n---\n\n### 2/ Un agente __revisa__ todo\n\n---\n\n3/ Contanos. #IA\n"
+    )
+    published = []
+    verdicts = iter([make_verdict(failed_post=2), make_verdict(True)])
+
+    def reply(agent, message):
+        if agent.name == "Writer":
+            if "post_number" in json.loads(message):
+                return "2/ Reescrito #IA\n"
+            return draft
+        if agent.name == "Evaluator":
+            return next(verdicts)
+        if agent.name == "Publisher":
+            published.append(json.loads(message)["content"])
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="post-splice")
+    list(workflow.run(topic="post splice topic", use_cache=False, pre_evaluate=False))
+
+    assert published == [
+        draft.replace("### 2/ Un agente __revisa__ todo", "2/ Reescrito #IA")
+    ]
+
+
+def test_replace_posts_in_json_drafts():
+    draft = (
+        '```json\n[\n  "1/ Uno",\n  {"text": "2/ Dos", "n": 2},\n  "3/ Tres"\n]\n```'
+    )
+    assert replace_posts(draft, {2: "2/ Nuevo"}) == draft.replace(
+        '"2/ Dos"', '"2/ Nuevo"'
+    )
+    assert split_posts(replace_posts(draft, {3: 'Con "comillas"'}))[2] == (
+        'Con "comillas"'
+    )
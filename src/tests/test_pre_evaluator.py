@@ -0,0 +1,98 @@
+import json
+
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.pre_evaluator import PreEvaluator, split_posts
+
+GOOD_THREAD = "\n\n---\n\n".join(
+    [
+        "### 1️⃣ ¿Tu equipo pierde horas revisando hilos?",
+        "Un agente de IA revisa formato, tono y hashtags en segundos.",
+        "¿Lo probarías en tu próxima campaña? Contanos abajo. #IA #Automatización",
+    ]
+)
+
+
+def test_rules_report_structured_violations():
+    """
+    Posts are split from markdown and JSON drafts, and every broken hard
+    rule is reported with the post it applies to.
+    """
+    pre_evaluator = PreEvaluator()
+    assert split_posts(GOOD_THREAD)[0] == "1️⃣ ¿Tu equipo pierde horas revisando hilos?"
+    assert pre_evaluator.evaluate(GOOD_THREAD).passed
+
+    draft = json.dumps(["x" * 300 + " #IA", "Dale like y comparte si te sirvió"])
+    result = pre_evaluator.evaluate(draft, num_posts=3)
+    found = {(v.rule, v.post) for v in result.violations}
+    assert found == {
+        ("post_count", None),
+        ("char_limit", 1),
+        ("hashtags", 2),
+        ("banned_phrase", 2),
+    }
+    assert "[post 1] char_limit" in result.feedback()
+
+
+def test_failing_drafts_skip_the_llm_evaluator(fake_agents):
+    """
+    A draft that breaks a rule goes back to the writer with the violations;
+    the evaluator only sees the fixed draft.
+    """
+    calls, feedback = [], []
+    drafts = iter(["Borrador sin hashtags", GOOD_THREAD])
+
+    def reply(agent, message):
+        calls.append(agent.name)
+        if agent.name == "Evaluator":
+            return "Publish"
+        if agent.name == "Writer":
+            feedback.append(json.loads(message).get("feedback"))
+            return next(drafts)
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="pre-evaluation")
+    responses = list(workflow.run(topic="pre-evaluation topic", use_cache=False))
+
+    assert calls == ["Orchestrator", "Writer", "Writer", "Evaluator", "Publisher"]
+    # The violations reach the writer as a list of fixes
+    assert feedback[1][0].startswith("Post 1: hashtags: missing hashtags")
+    headers = [r.content.split("\n", 1)[0] for r in responses]
+    assert "# 2.0 Pre-evaluation" in headers
+    assert "# 2.1 Evaluation" in headers
+
+
+def test_repeated_violations_stop_and_publish_the_least_violating_draft(fake_agents):
+    """
+    Rejected drafts feed the loop controller: the same violations twice in a
+    row stop the loop, and the draft with the fewest violations is published.
+    """
+    calls, published = [], []
+    drafts = iter(
+        [
+            "Borrador sin hashtags",
+            "Borrador sin hashtags " + "muy largo " * 40,
+            "Borrador sin hashtags " + "muy ancho " * 40,
+        ]
+    )
+
+    def reply(agent, message):
+        calls.append(agent.name)
+        if agent.name == "Publisher":
+            published.append(message)
+        if agent.name == "Writer":
+            return next(drafts)
+        return f"{agent.name} output"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="pre-evaluation-loop")
+    responses = list(workflow.run(topic="violations topic", use_cache=False))
+
+    assert "Evaluator" not in calls
+    headers = [r.content.split("\n", 1)[0] for r in responses]
+    assert "# 2. Stopped (repeated_feedback)" in headers
+    assert "Borrador sin hashtags" in published[0]
+    assert "muy" not in published[0]
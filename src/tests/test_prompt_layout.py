@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+from agno.models.message import Message
+from agno.run.response import RunResponse
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.metrics import PhaseEvent, apply_run_response, prompt_cache_stats
+from src.utils.openai_responses import OpenAIResponses
+
+
+def test_system_prompts_are_byte_stable():
+    """
+    The per-call data travels in the user message, so the system prompt of
+    each agent is the same for every workflow and topic (a cacheable prefix).
+    """
+    first = PublicationWorkflow(session_id="layout-a")
+    second = PublicationWorkflow(session_id="layout-b")
+    for name in (
+        "orchestrator",
+        "publication_writer",
+        "publication_evaluator",
+        "publication_publisher",
+    ):
+        a = getattr(first, name).get_system_message("layout-a").content
+        b = getattr(second, name).get_system_message("layout-b").content
+        assert a == b
+    # The writer's template no longer carries per-topic placeholders
+    assert "${" not in first.publication_writer.get_system_message("layout-a").content
+
+
+def test_agent_input_puts_the_static_task_first():
+    draft = PublicationWorkflow._draft_message("plan A", 3)
+    other = PublicationWorkflow._draft_message("plan B", 5)
+    prefix = '{\n    "task": "Write the posts that execute the plan.",\n'
+    assert draft.startswith(prefix) and other.startswith(prefix)
+    # Non-ASCII text is kept as is, not as \u escapes
+    assert "¿Qué" in PublicationWorkflow._evaluation_message("¿Qué?")
+
+
+def test_cached_tokens_are_reported_per_agent():
+    response = RunResponse(
+        metrics={
+            "input_tokens": [1000, 1000],
+            "output_tokens": [50, 50],
+            "cached_tokens": [0, 768],
+        }
+    )
+    event = apply_run_response(
+        PhaseEvent(None, None, "t", "draft", agent="Writer", model_id="gpt-4.1"),
+        response,
+    )
+    assert event.cached_tokens == 768
+    # Cached input is billed at the discounted price
+    assert event.cost == (1232 * 2.0 + 768 * 0.5 + 100 * 8.0) / 1_000_000
+
+    hit = PhaseEvent(
+        None, None, "t", "draft", agent="Writer", cache="hit", input_tokens=1000
+    )
+    evaluation = PhaseEvent(
+        None, None, "t", "evaluate", agent="Evaluator", input_tokens=500
+    )
+    stats = prompt_cache_stats([event, hit, evaluation])
+    assert stats["Writer"] == {
+        "calls": 1,
+        "input_tokens": 2000,
+        "cached_tokens": 768,
+        "cached_ratio": 0.384,
+    }
+    assert stats["Evaluator"]["cached_ratio"] == 0.0
+
+
+def test_responses_model_reads_input_tokens_details():
+    model = OpenAIResponses(id="gpt-4.1", api_key="test")
+    message = Message(role="assistant")
+    usage = SimpleNamespace(
+        input_tokens=1200,
+        output_tokens=80,
+        total_tokens=1280,
+        input_tokens_details=SimpleNamespace(cached_tokens=1024),
+    )
+    model._add_usage_metrics_to_assistant_message(message, usage)
+    assert message.metrics.input_tokens == 1200
+    assert message.metrics.cached_tokens == 1024
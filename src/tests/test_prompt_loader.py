@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from src.utils.prompt_loader import PromptLoader, TemplateRegistry
+
+
+def test_registry_reads_each_template_once_until_it_changes(tmp_path):
+    """
+    Renders are memoized per argument set and the file is only read again
+    when its mtime changes.
+    """
+    template = tmp_path / "writer.md"
+    template.write_text("Plan: ${plan}", encoding="utf-8")
+    registry = TemplateRegistry(tmp_path, check_interval=0)
+
+    assert registry.render("writer", plan="A") == "Plan: A"
+    assert registry.render("writer", plan="A") == "Plan: A"
+    assert registry.render("writer", plan="B") == "Plan: B"
+    assert registry.render("writer") == "Plan: ${plan}"
+    assert registry.stats() == {
+        "loads": 1,
+        "renders": 4,
+        "render_hits": 1,
+        "templates": 1,
+    }
+
+    template.write_text("New plan: ${plan}", encoding="utf-8")
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.render("writer", plan="A") == "New plan: A"
+    assert registry.stats()["loads"] == 2
+
+
+def test_prompt_loader_uses_the_shared_registry():
+    """Every shipped template preloads; a missing one still raises."""
+    registry = TemplateRegistry()
+    assert registry.preload() == len(list(registry.prompts_dir.glob("*.md")))
+    assert PromptLoader.source("evaluator") == registry.source("evaluator")
+    with pytest.raises(FileNotFoundError, match="missing-template.md"):
+        PromptLoader.load("missing-template")
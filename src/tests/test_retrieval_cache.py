@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from agno.document import Document
+from agno.embedder.base import Embedder
+
+from src.utils.knowledge import Knowledge
+from src.utils.retrieval_cache import CachedEmbedder, RetrievalCache
+
+
+class CountingEmbedder(Embedder):
+    """Deterministic offline embedder that counts how many texts it embedded."""
+
+    calls: int = 0
+
+    def get_embedding_and_usage(self, text):
+        self.calls += 1
+        return [float(len(text)), 1.0], {"tokens": len(text)}
+
+
+class FakeKnowledgeBase:
+    def __init__(self, embedder):
+        self.vector_db = SimpleNamespace(embedder=embedder)
+        self.searches = 0
+
+    def search(self, query, num_documents=None, filters=None):
+        self.searches += 1
+        self.vector_db.embedder.get_embedding(query)
+        return [Document(content=f"result for {query}", name="doc.md")]
+
+
+def test_repeated_searches_hit_cache_until_invalidated(monkeypatch):
+    """
+    Normalized repeats are served from the cache for every agent, stats are
+    kept per agent, and invalidation forces a new search.
+    """
+    embedder = CachedEmbedder(embedder=CountingEmbedder(dimensions=2))
+    kb = FakeKnowledgeBase(embedder)
+    monkeypatch.setattr(Knowledge, "_knowledge_base", kb)
+    monkeypatch.setattr(Knowledge, "retrieval_cache", RetrievalCache())
+    writer = SimpleNamespace(name="Writer")
+    evaluator = SimpleNamespace(name="Evaluator")
+
+    first = Knowledge.search("Tono de marca", agent=writer)
+    assert first[0]["content"] == "result for Tono de marca"
+    assert Knowledge.search("  tono DE marca? ", agent=writer) == first
+    assert Knowledge.search("tono de marca", agent=evaluator) == first
+    assert kb.searches == 1
+
+    stats = Knowledge.retrieval_stats()
+    assert stats["by_agent"]["Writer"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert stats["by_agent"]["Evaluator"]["hits"] == 1
+
+    Knowledge.retrieval_cache.invalidate()
+    Knowledge.search("Tono de marca", agent=writer)
+    assert kb.searches == 2
+    # The query embedding itself is reused across the invalidation
+    assert embedder.embedder.calls == 1
+    assert Knowledge.retrieval_stats()["embeddings"]["hits"] == 1
+
+
+def test_workflow_does_not_build_the_knowledge_base(monkeypatch):
+    """Agent copies search through Knowledge.search; the base is built on use."""
+    from src.agents.agents import PublicationWorkflow
+
+    builds = []
+    monkeypatch.setattr(Knowledge, "_knowledge_base", None)
+    monkeypatch.setattr(Knowledge, "_build", lambda: builds.append(1))
+    workflow = PublicationWorkflow(session_id="lazy-knowledge")
+    assert workflow.publication_writer.retriever == Knowledge.search
+    assert not builds
@@ -0,0 +1,54 @@
+from src.agents.agents import PublicationWorkflow
+from src.utils.database import Database
+from src.utils.revision_history import RevisionHistory
+
+
+def test_drafts_are_delta_compressed_and_rebuilt(isolated_db):
+    """
+    Iteration 0 and every 5th iteration are snapshots, the rest deltas; any
+    revision is rebuilt exactly and storage is far below full copies.
+    """
+    history = RevisionHistory(
+        Database.shared(str(isolated_db)), durability="batched", snapshot_every=5
+    )
+    posts = [f"Post {i}: a line about agents and automation.\n" for i in range(40)]
+    drafts = []
+    for iteration in range(8):
+        posts[iteration * 3] = f"Post {iteration * 3}: rewritten in round {iteration}\n"
+        drafts.append("".join(posts))
+    kinds = [
+        history.record("run-1", "topic", i, draft, evaluation=f"feedback {i}")
+        for i, draft in enumerate(drafts)
+    ]
+    assert kinds == ["snapshot"] + ["delta"] * 4 + ["snapshot"] + ["delta"] * 2
+
+    assert history.get("run-1", 3).draft == drafts[3]
+    assert history.get("run-1", 7).evaluation == "feedback 7"
+    assert history.get("run-1", 8) is None
+    assert [r.draft for r in history.history("run-1")] == drafts
+    assert history.runs("topic") == ["run-1"]
+    assert history.stats("run-1")["ratio"] < 0.5
+
+
+def test_workflow_records_every_evaluated_draft(fake_agents):
+    """
+    Each draft of the revision loop is stored with the evaluation it got.
+    """
+    evaluations = iter(["Do not publish: add a hook", "Publish"])
+
+    def reply(agent, message):
+        if agent.name == "Evaluator":
+            return next(evaluations)
+        return f"{agent.name} output for {len(message)}"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(session_id="history")
+    list(workflow.run(topic="history topic", pre_evaluate=False))
+    revisions = workflow.memory.get_revision_history(workflow.run_id)
+
+    assert [r.iteration for r in revisions] == [0, 1]
+    assert revisions[0].evaluation.startswith("**Decision:** Do Not Publish")
+    assert "- Do not publish: add a hook" in revisions[0].evaluation
+    assert revisions[1].evaluation == "**Decision:** Publish"
+    assert revisions[0].draft.startswith("Writer output")
@@ -0,0 +1,132 @@
+import threading
+import time
+
+import httpx
+import openai
+import pytest
+from agno.exceptions import ModelProviderError
+from agno.run.response import RunResponse
+
+from src.agents.agents import PublicationWorkflow
+from src.utils.scheduler import CallStats, ModelLimits, RequestScheduler
+
+
+def rate_limited(retry_after: str = "0.01") -> ModelProviderError:
+    """A 429 as agno raises it: wrapping openai's error."""
+    response = httpx.Response(
+        429,
+        headers={"retry-after": retry_after},
+        request=httpx.Request("POST", "https://api.openai.com/v1/responses"),
+    )
+    try:
+        raise openai.RateLimitError("Rate limit reached", response=response, body=None)
+    except openai.RateLimitError as e:
+        try:
+            raise ModelProviderError(str(e), status_code=429) from e
+        except ModelProviderError as wrapped:
+            return wrapped
+
+
+def wait_until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_queued_calls_are_admitted_by_priority():
+    """
+    With the requests-per-minute window full, queued calls go out as the
+    window frees up: publish first, then evaluation, then draft.
+    """
+    now = [0.0]
+    scheduler = RequestScheduler(
+        limits={"gpt-4.1": ModelLimits(rpm=1)}, clock=lambda: now[0]
+    )
+    scheduler.acquire("gpt-4.1", "plan")
+    order = []
+
+    def call(phase):
+        scheduler.acquire("gpt-4.1", phase)
+        order.append(phase)
+
+    threads = [
+        threading.Thread(target=call, args=(phase,))
+        for phase in ("draft", "publish", "evaluation")
+    ]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: len(scheduler._waiting["gpt-4.1"]) == 3)
+    for admitted in range(1, 4):
+        now[0] += 61
+        with scheduler._cond:
+            scheduler._cond.notify_all()
+        wait_until(lambda: len(order) == admitted)
+    for thread in threads:
+        thread.join()
+    assert order == ["publish", "evaluation", "draft"]
+
+
+def test_transient_errors_are_retried_honoring_retry_after():
+    scheduler = RequestScheduler(limits={}, base_delay=0.001, max_delay=1.0)
+    outcomes = iter([rate_limited("0.02"), "ok"])
+
+    def flaky():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    stats = CallStats()
+    started = time.perf_counter()
+    assert scheduler.call(flaky, model_id="o4-mini", stats=stats) == "ok"
+    assert stats.retries == 1
+    assert time.perf_counter() - started >= 0.02
+    assert scheduler.stats()["retries"] == 1
+
+    # Bugs are not retried
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        scheduler.call(broken, model_id="o4-mini")
+    assert len(calls) == 1
+
+
+def test_token_window_is_charged_with_the_real_usage():
+    scheduler = RequestScheduler(limits={"o4-mini": ModelLimits(tpm=1000)})
+    response = RunResponse(
+        content="ok", metrics={"input_tokens": [300, 200], "output_tokens": [50, 0]}
+    )
+    scheduler.call(lambda: response, model_id="o4-mini", tokens=900)
+    assert scheduler.usage("o4-mini") == {"requests": 1, "tokens": 550}
+
+
+def test_workflow_phase_survives_a_rate_limit(fake_agents):
+    """A 429 on the evaluator is retried instead of ending the run."""
+    failures = [rate_limited()]
+
+    def reply(agent, message):
+        if agent.name == "Evaluator":
+            if failures:
+                raise failures.pop()
+            return "Publish"
+        return f"{agent.name} output #IA"
+
+    fake_agents(reply)
+
+    workflow = PublicationWorkflow(
+        session_id="scheduler",
+        request_scheduler=RequestScheduler(limits={}, base_delay=0.001),
+    )
+    responses = list(
+        workflow.run(topic="scheduler topic", use_cache=False, pre_evaluate=False)
+    )
+
+    assert all("Error" not in r.content for r in responses)
+    assert responses[-1].content.startswith("# 3. Published")
+    events = workflow.metrics.events(run_id=workflow.run_id)
+    assert [e.retries for e in events if e.phase == "evaluation"] == [1]
@@ -0,0 +1,164 @@
+import base64
+import json
+import re
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .database import Database
+
+SNIPPET_SQL = "snippet(final_prompts_fts, 1, '[', ']', '…', 16)"
+
+
+class ArchivedPublication(BaseModel):
+    """A final publication as returned by the archive"""
+
+    id: int = Field(..., description="Row id in final_prompts")
+    topic: str = Field(..., description="The original topic for the publication")
+    final_publication: str = Field(..., description="The published content")
+    timestamp: datetime = Field(..., description="When the publication was saved")
+    snippet: Optional[str] = Field(
+        None, description="Matching excerpt, for full-text searches"
+    )
+
+
+class ArchivePage(BaseModel):
+    """One page of archive results plus the cursor for the next one"""
+
+    items: List[ArchivedPublication] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as ``cursor`` to get the next page (None at the end)"
+    )
+
+
+def encode_cursor(timestamp: str, rowid: int) -> str:
+    raw = json.dumps([timestamp, rowid]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        timestamp, rowid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(timestamp), int(rowid)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid archive cursor: {cursor!r}") from e
+
+
+def stored_timestamp(value: datetime) -> str:
+    """*value* in the stored format (naive UTC, ``isoformat()``), so that it
+    compares correctly as text with the ``timestamp`` column."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match (as a prefix
+    for the last one), with FTS syntax characters neutralised."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class PublicationArchive:
+    """Browse and full-text search the final publications.
+
+    Results are ordered newest first and paginated with an opaque keyset
+    cursor ``(timestamp, rowid)``, so deep pages cost the same as the first
+    one (no OFFSET scans). Browsing uses the timestamp index and searching the
+    ``final_prompts_fts`` FTS5 index (see ``database.MIGRATIONS``).
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def _filters(
+        cursor: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        alias: str = "p",
+    ) -> Tuple[List[str], List]:
+        clauses, params = [], []
+        if since is not None:
+            clauses.append(f"{alias}.timestamp >= ?")
+            params.append(stored_timestamp(since))
+        if until is not None:
+            clauses.append(f"{alias}.timestamp < ?")
+            params.append(stored_timestamp(until))
+        if cursor is not None:
+            timestamp, rowid = decode_cursor(cursor)
+            clauses.append(f"({alias}.timestamp, {alias}.rowid) < (?, ?)")
+            params.extend([timestamp, rowid])
+        return clauses, params
+
+    @staticmethod
+    def _page(rows, limit: int) -> ArchivePage:
+        items = [
+            ArchivedPublication(
+                id=row[0],
+                topic=row[1],
+                final_publication=row[2],
+                timestamp=datetime.fromisoformat(row[3]),
+                snippet=row[4] if len(row) > 4 else None,
+            )
+            for row in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last[3], last[0])
+        return ArchivePage(items=items, next_cursor=next_cursor)
+
+    def browse(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> ArchivePage:
+        """Publications newest first, optionally within ``[since, until)``.
+
+        Naive bounds are taken as UTC (like the stored timestamps); aware ones
+        are converted.
+        """
+        clauses, params = self._filters(cursor, since, until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.query(
+            f"""SELECT p.rowid, p.topic, p.final_prompt, p.timestamp
+                FROM final_prompts AS p {where}
+                ORDER BY p.timestamp DESC, p.rowid DESC LIMIT ?;""",
+            (*params, limit + 1),
+        )
+        return self._page(rows, limit)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> ArchivePage:
+        """Full-text search over topic and content, newest matches first."""
+        match = fts_query(query)
+        if not match:
+            return ArchivePage()
+        clauses, params = self._filters(cursor, since, until)
+        extra = "".join(f" AND {clause}" for clause in clauses)
+        rows = self.db.query(
+            f"""SELECT p.rowid, p.topic, p.final_prompt, p.timestamp, {SNIPPET_SQL}
+                FROM final_prompts_fts
+                JOIN final_prompts AS p ON p.rowid = final_prompts_fts.rowid
+                WHERE final_prompts_fts MATCH ?{extra}
+                ORDER BY p.timestamp DESC, p.rowid DESC LIMIT ?;""",
+            (match, *params, limit + 1),
+        )
+        return self._page(rows, limit)
+
+    def count(self) -> int:
+        return self.db.query("SELECT COUNT(*) FROM final_prompts;")[0][0]
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .evaluation import PublicationEvaluation
+from .loop_controller import RevisionLoopController
+from .pre_evaluator import PreEvaluation
+
+
+class Candidate(BaseModel):
+    """One of the drafts written in parallel for the same plan"""
+
+    index: int = Field(..., description="1-based candidate number")
+    draft: str
+    temperature: Optional[float] = None
+    pre_evaluation: Optional[PreEvaluation] = None
+    verdict: Optional[PublicationEvaluation] = None
+
+    @property
+    def violations(self) -> int:
+        return len(self.pre_evaluation.violations) if self.pre_evaluation else 0
+
+    @property
+    def score(self) -> Optional[float]:
+        return RevisionLoopController.score_of(self.verdict) if self.verdict else None
+
+
+def _best_score_key(candidate: Candidate) -> Tuple:
+    approved = candidate.verdict is not None and candidate.verdict.approved
+    score = candidate.score
+    return (
+        approved,
+        score if score is not None else float("-inf"),
+        -candidate.violations,
+        -candidate.index,
+    )
+
+
+def _fewest_violations_key(candidate: Candidate) -> Tuple:
+    return (-candidate.violations, -candidate.index)
+
+
+@dataclass(frozen=True)
+class SelectionPolicy:
+    """How the candidate that moves on to the revision loop is chosen"""
+
+    name: str
+    # Score the rule-passing candidates with the LLM evaluator (in parallel)
+    evaluate: bool
+    # Sort key, the highest candidate wins
+    key: Callable[[Candidate], Tuple]
+
+    def select(self, candidates: List[Candidate]) -> Candidate:
+        return max(candidates, key=self.key)
+
+
+SELECTION_POLICIES: Dict[str, SelectionPolicy] = {
+    # Approved first, then the highest evaluator score, then fewest violations
+    "best_score": SelectionPolicy("best_score", True, _best_score_key),
+    # Only the local hard-rule checks, no evaluator calls; the loop then
+    # evaluates the chosen draft as usual
+    "fewest_violations": SelectionPolicy(
+        "fewest_violations", False, _fewest_violations_key
+    ),
+}
+
+
+def get_policy(name: str) -> SelectionPolicy:
+    try:
+        return SELECTION_POLICIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown candidate policy {name!r}, expected one of "
+            f"{sorted(SELECTION_POLICIES)}"
+        ) from None
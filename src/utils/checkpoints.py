@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .database import Database
+from .evaluation import PublicationEvaluation
+
+# Next phase of a run (Checkpoint.phase)
+PLAN = "plan"
+DRAFT = "draft"
+LOOP = "loop"
+PUBLISH = "publish"
+DONE = "done"
+
+UPSERT_CHECKPOINT_SQL = """INSERT INTO workflow_checkpoints
+    (run_id, topic, phase, iteration, data, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (run_id) DO UPDATE SET
+    topic = excluded.topic, phase = excluded.phase,
+    iteration = excluded.iteration, data = excluded.data,
+    updated_at = excluded.updated_at;"""
+SELECT_CHECKPOINT_SQL = "SELECT data FROM workflow_checkpoints WHERE run_id = ?;"
+SELECT_UNFINISHED_SQL = """SELECT data FROM workflow_checkpoints
+    WHERE phase != 'done' ORDER BY updated_at LIMIT ?;"""
+DELETE_CHECKPOINT_SQL = "DELETE FROM workflow_checkpoints WHERE run_id = ?;"
+
+
+class Checkpoint(BaseModel):
+    """Progress of a workflow run, enough to resume it after a crash"""
+
+    run_id: str = Field(..., description="Workflow run the checkpoint belongs to")
+    session_id: Optional[str] = None
+    topic: str = Field(..., description="The original topic for the publication")
+    phase: str = Field(PLAN, description="Next phase to run: plan ... publish, done")
+    iteration: int = Field(0, description="Revision loop iteration of the draft")
+    plan: Optional[str] = None
+    draft: Optional[str] = Field(None, description="Latest draft (final in publish)")
+    evaluation: Optional[PublicationEvaluation] = Field(
+        None, description="Verdict on the draft, not yet acted upon"
+    )
+    approved: bool = False
+    # Arguments of the run (use_cache, max_revisions, num_posts, ...)
+    options: Dict[str, Any] = Field(default_factory=dict)
+    # RevisionLoopController.state(): spent budget, best draft, history
+    loop: Dict[str, Any] = Field(default_factory=dict)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class CheckpointStore:
+    """One row per run in ``workflow_checkpoints``, overwritten at each phase.
+
+    Checkpoints are written synchronously whatever the Memory durability:
+    there are only a few per run and a queued one would be lost in exactly
+    the crash it is meant to survive.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        checkpoint.updated_at = datetime.utcnow()
+        self.db.execute(
+            UPSERT_CHECKPOINT_SQL,
+            (
+                checkpoint.run_id,
+                checkpoint.topic,
+                checkpoint.phase,
+                checkpoint.iteration,
+                checkpoint.model_dump_json(),
+                checkpoint.updated_at.isoformat(),
+            ),
+        )
+
+    def get(self, run_id: str) -> Optional[Checkpoint]:
+        rows = self.db.query(SELECT_CHECKPOINT_SQL, (run_id,))
+        return Checkpoint.model_validate_json(rows[0][0]) if rows else None
+
+    def unfinished(self, limit: int = 100) -> List[Checkpoint]:
+        """Runs that stopped before publishing, oldest first."""
+        rows = self.db.query(SELECT_UNFINISHED_SQL, (limit,))
+        return [Checkpoint.model_validate_json(row[0]) for row in rows]
+
+    def delete(self, run_id: str) -> bool:
+        return self.db.execute(DELETE_CHECKPOINT_SQL, (run_id,)).rowcount > 0
@@ -0,0 +1,129 @@
+import re
+from typing import Iterator, List, Tuple
+
+from agno.document.base import Document
+from agno.document.chunking.strategy import ChunkingStrategy
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+
+class MarkdownChunking(ChunkingStrategy):
+    """Heading-aware chunking strategy for markdown documents.
+
+    The document is first split into sections at markdown headings (ignoring
+    ``#`` lines inside code fences). Sections that fit in ``chunk_size``
+    characters become one chunk; longer sections are split on paragraph, line
+    or word boundaries with ``overlap`` characters shared between consecutive
+    chunks. Every chunk carries its ``source``, ``heading_path`` and character
+    ``offset`` in the original document as metadata.
+    """
+
+    def __init__(self, chunk_size: int = 1200, overlap: int = 150):
+        if overlap >= chunk_size:
+            raise ValueError(
+                f"Invalid parameters: overlap ({overlap}) must be less than chunk size ({chunk_size})."
+            )
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    @property
+    def signature(self) -> str:
+        """Identifies the chunking configuration (used to invalidate indexes)."""
+        return f"markdown:{self.chunk_size}:{self.overlap}"
+
+    def _sections(self, text: str) -> List[Tuple[int, int, List[str]]]:
+        """Return ``(start, end, heading_path)`` for every heading section."""
+        sections: List[Tuple[int, int, List[str]]] = []
+        headings: List[Tuple[int, str]] = []
+        current_start = 0
+        current_path: List[str] = []
+        in_fence = False
+        pos = 0
+        for line in text.splitlines(keepends=True):
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+            match = None if in_fence else HEADING_PATTERN.match(line.rstrip("\r\n"))
+            if match:
+                if pos > current_start:
+                    sections.append((current_start, pos, current_path))
+                    current_start = pos
+                level = len(match.group(1))
+                headings = [h for h in headings if h[0] < level] + [
+                    (level, match.group(2))
+                ]
+                current_path = [title for _, title in headings]
+            pos += len(line)
+        if pos > current_start:
+            sections.append((current_start, pos, current_path))
+
+        # Sections made only of headings are merged into the following one
+        merged: List[Tuple[int, int, List[str]]] = []
+        pending_start = None
+        for start, end, path in sections:
+            body = [
+                line
+                for line in text[start:end].splitlines()
+                if line.strip() and not HEADING_PATTERN.match(line)
+            ]
+            if not body:
+                pending_start = start if pending_start is None else pending_start
+                continue
+            merged.append(
+                (start if pending_start is None else pending_start, end, path)
+            )
+            pending_start = None
+        if pending_start is not None:
+            merged.append((pending_start, len(text), sections[-1][2]))
+        return merged
+
+    def _windows(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Split ``text[start:end]`` into overlapping windows on natural breaks."""
+        if end - start <= self.chunk_size:
+            yield start, end
+            return
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + self.chunk_size, end)
+            if window_end < end:
+                lower = window_start + self.chunk_size // 2
+                for separator in ("\n\n", "\n", " "):
+                    cut = text.rfind(separator, lower, window_end)
+                    if cut != -1:
+                        window_end = cut + len(separator)
+                        break
+            yield window_start, window_end
+            if window_end >= end:
+                return
+            next_start = max(window_end - self.overlap, window_start + 1)
+            # Start the overlap on a word boundary when possible
+            space = text.find(" ", next_start, window_end)
+            window_start = space + 1 if space != -1 else next_start
+
+    def chunk(self, document: Document) -> List[Document]:
+        """Split *document* into heading-aware chunks."""
+        text = document.content
+        source = document.meta_data.get("source", document.name)
+        chunks: List[Document] = []
+        for start, end, path in self._sections(text):
+            for chunk_start, chunk_end in self._windows(text, start, end):
+                content = text[chunk_start:chunk_end].strip()
+                if not content:
+                    continue
+                meta_data = {
+                    **document.meta_data,
+                    "source": source,
+                    "heading_path": " > ".join(path),
+                    "offset": chunk_start,
+                    "chunk": len(chunks) + 1,
+                    "chunk_size": len(content),
+                }
+                chunks.append(
+                    Document(
+                        id=f"{source}_{len(chunks) + 1}" if source else None,
+                        name=document.name,
+                        meta_data=meta_data,
+                        content=content,
+                    )
+                )
+        return chunks
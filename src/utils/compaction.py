@@ -0,0 +1,105 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .dedup import normalize
+from .evaluation import PublicationEvaluation
+from .pre_evaluator import RuleViolation
+
+try:
+    import tiktoken
+except ImportError:  # Not a dependency: without it token counts are estimated
+    tiktoken = None
+
+# Encoding of the gpt-4.1 / gpt-4o / o-series models
+DEFAULT_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=None)
+def _encoding(model_id: str):
+    try:
+        return tiktoken.encoding_for_model(model_id)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+def count_tokens(text: str, model_id: str = "gpt-4.1") -> int:
+    """Approximate tokens of *text* for *model_id*.
+
+    ``tiktoken`` is not a project dependency, so by default the count is an
+    estimate of one token per 4 UTF-8 bytes (close for English, slightly
+    high for Spanish); it is exact only where ``tiktoken`` happens to be
+    installed. Budgets built on it are approximate either way.
+    """
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_encoding(model_id).encode(text))
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def compact_items(items: Iterable[str], max_items: Optional[int] = None) -> List[str]:
+    """Non-empty *items* without repeats (ignoring case, accents, punctuation)."""
+    seen, compact = set(), []
+    for item in items:
+        key = " ".join(normalize(item))
+        if key and key not in seen:
+            seen.add(key)
+            compact.append(item.strip())
+    return compact[:max_items] if max_items else compact
+
+
+def action_items(
+    verdict: Optional[PublicationEvaluation] = None,
+    violations: Optional[List[RuleViolation]] = None,
+    max_items: Optional[int] = None,
+) -> List[str]:
+    """Feedback as a short list of fixes for the writer, most important first.
+
+    Broken rules and failed hard gates come first, then per-post issues and
+    then thread-level recommendations. The decision and the score table are
+    left out: the writer cannot act on them.
+    """
+    items = [
+        f"Post {v.post}: {v.rule}: {v.message}" if v.post else f"{v.rule}: {v.message}"
+        for v in violations or []
+    ]
+    if verdict is not None:
+        items += verdict.failed_gates
+        for post, issues in sorted(verdict.failed_posts().items()):
+            items += [f"Post {post}: {issue}" for issue in issues] or [
+                f"Post {post}: rewrite"
+            ]
+        items += verdict.recommendations
+    return compact_items(items, max_items)
+
+
+def fit_prompt(
+    render: Callable[..., str],
+    data: Dict[str, Any],
+    max_tokens: Optional[int],
+    trim: Sequence[str] = (),
+    model_id: str = "gpt-4.1",
+) -> str:
+    """``render(**data)`` cut down to about *max_tokens* (see
+    :func:`count_tokens`) by trimming *trim* fields.
+
+    Fields are trimmed in the given order: a list loses items from its end
+    down to one (the first item is the most important), any other value is
+    dropped. Fields not in *trim* are never touched, so the result can still
+    be over budget.
+    """
+    data = dict(data)
+    message = render(**data)
+    if max_tokens is None:
+        return message
+    for field in trim:
+        while count_tokens(message, model_id) > max_tokens:
+            value = data.get(field)
+            if isinstance(value, list) and len(value) > 1:
+                data[field] = value[:-1]
+            elif value and not isinstance(value, list):
+                data[field] = None
+            else:
+                break
+            message = render(**data)
+    return message
@@ -0,0 +1,437 @@
+import atexit
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from agno.utils.log import logger
+
+# Default SQLite file for the workflow persistence; override it with the
+# PUBLICATION_DB_FILE environment variable or an explicit ``db_file``. It is
+# runtime state (not tracked): the first connection switches it to WAL and
+# upgrades its schema in place (see MIGRATIONS).
+DEFAULT_DB_FILE = "src/db/publication_generation.db"
+
+# Schema migrations, applied once per database in order. The applied version
+# is tracked with ``PRAGMA user_version``; append new entries, never edit.
+MIGRATIONS: List[Tuple[int, str]] = [
+    (
+        1,
+        """
+        CREATE TABLE IF NOT EXISTS final_prompts (
+            topic TEXT PRIMARY KEY,
+            final_prompt TEXT,
+            timestamp TEXT
+        );
+        """,
+    ),
+    (
+        2,
+        """
+        CREATE TABLE IF NOT EXISTS revision_history (
+            run_id TEXT NOT NULL,
+            topic TEXT NOT NULL,
+            iteration INTEGER NOT NULL,
+            draft_kind TEXT NOT NULL,
+            draft TEXT NOT NULL,
+            draft_size INTEGER NOT NULL,
+            evaluation TEXT,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (run_id, iteration)
+        );
+        CREATE INDEX IF NOT EXISTS idx_revision_history_topic
+            ON revision_history (topic, created_at);
+        """,
+    ),
+    (
+        3,
+        # Archive: timestamp index for keyset pagination and an external
+        # content FTS5 index over the final publications, kept in sync by
+        # triggers (upserts must use ON CONFLICT DO UPDATE, not REPLACE)
+        """
+        CREATE INDEX IF NOT EXISTS idx_final_prompts_timestamp
+            ON final_prompts (timestamp);
+        CREATE VIRTUAL TABLE IF NOT EXISTS final_prompts_fts USING fts5(
+            topic, final_prompt, content='final_prompts', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS final_prompts_ai AFTER INSERT ON final_prompts
+        BEGIN
+            INSERT INTO final_prompts_fts (rowid, topic, final_prompt)
+            VALUES (new.rowid, new.topic, new.final_prompt);
+        END;
+        CREATE TRIGGER IF NOT EXISTS final_prompts_ad AFTER DELETE ON final_prompts
+        BEGIN
+            INSERT INTO final_prompts_fts (final_prompts_fts, rowid, topic, final_prompt)
+            VALUES ('delete', old.rowid, old.topic, old.final_prompt);
+        END;
+        CREATE TRIGGER IF NOT EXISTS final_prompts_au AFTER UPDATE ON final_prompts
+        BEGIN
+            INSERT INTO final_prompts_fts (final_prompts_fts, rowid, topic, final_prompt)
+            VALUES ('delete', old.rowid, old.topic, old.final_prompt);
+            INSERT INTO final_prompts_fts (rowid, topic, final_prompt)
+            VALUES (new.rowid, new.topic, new.final_prompt);
+        END;
+        INSERT INTO final_prompts_fts (final_prompts_fts) VALUES ('rebuild');
+        """,
+    ),
+    (
+        4,
+        # Resumable runs: latest checkpoint of each run (JSON in ``data``)
+        """
+        CREATE TABLE IF NOT EXISTS workflow_checkpoints (
+            run_id TEXT PRIMARY KEY,
+            topic TEXT NOT NULL,
+            phase TEXT NOT NULL,
+            iteration INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_workflow_checkpoints_phase
+            ON workflow_checkpoints (phase, updated_at);
+        """,
+    ),
+]
+
+
+# "batched" (write-behind, see WriteBehindQueue) or "sync" (write before
+# returning); override with the PUBLICATION_DB_DURABILITY environment variable
+DEFAULT_DURABILITY = "batched"
+DURABILITY_MODES = ("batched", "sync")
+
+
+def resolve_db_file(db_file: Optional[str] = None) -> str:
+    """The DB path to use: explicit argument, environment, or default."""
+    return db_file or os.getenv("PUBLICATION_DB_FILE") or DEFAULT_DB_FILE
+
+
+def resolve_durability(durability: Optional[str] = None) -> str:
+    """The durability mode to use: explicit argument, environment, or default."""
+    mode = durability or os.getenv("PUBLICATION_DB_DURABILITY") or DEFAULT_DURABILITY
+    if mode not in DURABILITY_MODES:
+        raise ValueError(
+            f"Unknown durability {mode!r}, expected one of {DURABILITY_MODES}"
+        )
+    return mode
+
+
+class Database:
+    """Shared SQLite access layer: one connection per thread, WAL journaling.
+
+    Connections are opened lazily per thread and reused for the life of the
+    thread, so statements hit sqlite3's prepared-statement cache instead of
+    being re-parsed and nothing pays for a new connection per call. WAL mode
+    lets readers run concurrently with a writer, and ``busy_timeout`` makes
+    writers wait for each other instead of failing with "database is locked".
+    Use :meth:`shared` to get the process-wide instance for a path.
+    """
+
+    _instances: Dict[str, "Database"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_file: Optional[str] = None,
+        migrations: Sequence[Tuple[int, str]] = MIGRATIONS,
+        busy_timeout_ms: int = 5000,
+        cached_statements: int = 256,
+    ):
+        self.db_file = resolve_db_file(db_file)
+        self.migrations = list(migrations)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._migrated = False
+        self._write_behind: Optional["WriteBehindQueue"] = None
+        if self.db_file != ":memory:":
+            Path(self.db_file).parent.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def shared(cls, db_file: Optional[str] = None) -> "Database":
+        """Process-wide ``Database`` for *db_file* (one pool per path)."""
+        path = resolve_db_file(db_file)
+        key = path if path == ":memory:" else str(Path(path).resolve())
+        with cls._instances_lock:
+            db = cls._instances.get(key)
+            if db is None:
+                db = cls._instances[key] = cls(path)
+            return db
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_file,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms};")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection (schema migrated on first use)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        if not self._migrated:
+            self.migrate(conn)
+        return conn
+
+    def migrate(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """Apply pending migrations once; returns the schema version."""
+        conn = conn or self.connection
+        with self._lock:
+            if self._migrated:
+                return self.migrations[-1][0] if self.migrations else 0
+            version = conn.execute("PRAGMA user_version;").fetchone()[0]
+            for target, sql in self.migrations:
+                if target <= version:
+                    continue
+                logger.info(f"[Database] Migrating {self.db_file} to v{target}")
+                with conn:
+                    conn.executescript(sql)
+                    conn.execute(f"PRAGMA user_version={int(target)};")
+                version = target
+            self._migrated = True
+            return version
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Commit on success, roll back on error."""
+        conn = self.connection
+        with conn:
+            yield conn
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        """Run a single statement in its own transaction."""
+        with self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    def executemany(
+        self, sql: str, seq_of_params: Iterable[Sequence[Any]]
+    ) -> sqlite3.Cursor:
+        with self.transaction() as conn:
+            return conn.executemany(sql, seq_of_params)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        return self.connection.execute(sql, params).fetchall()
+
+    @property
+    def write_behind(self) -> "WriteBehindQueue":
+        """The write-behind queue of this database (created on first use)."""
+        if self._write_behind is None:
+            with self._lock:
+                if self._write_behind is None:
+                    self._write_behind = WriteBehindQueue(self)
+        return self._write_behind
+
+    def close(self) -> None:
+        """Flush pending writes and close every connection of this instance."""
+        if self._write_behind is not None:
+            self._write_behind.close()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+# A queued write: a statement with its parameters
+Write = Tuple[str, Sequence[Any]]
+
+
+class WriteBehindQueue:
+    """Groups writes into batched transactions off the caller's critical path.
+
+    :meth:`submit` only enqueues the statement; a background thread commits
+    the queued writes in a single transaction once ``max_batch`` writes are
+    pending or ``flush_interval`` seconds have passed. Writes are applied in
+    submission order. :meth:`defer` schedules housekeeping (e.g. cache
+    eviction) to run once at the end of the next batch, however many times it
+    was requested. Writes may carry an ``overlay`` key/value so readers in
+    this process see them (:meth:`pending`) before they are committed.
+    :meth:`flush` drains the queue synchronously and :meth:`close` runs at
+    interpreter exit, so queued writes are not lost on a normal shutdown.
+    """
+
+    def __init__(
+        self, db: Database, max_batch: int = 100, flush_interval: float = 0.25
+    ):
+        self.db = db
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        # Sequence number of the last submitted / last committed write
+        self.submitted_seq = 0
+        self.flushed_seq = 0
+        self.batches = 0
+        self.errors = 0
+        self._pending: List[Write] = []
+        self._deferred: Dict[str, Callable[[sqlite3.Connection], None]] = {}
+        # Values of queued writes by overlay key, with their sequence number
+        self._overlay: Dict[Any, Tuple[Any, int]] = {}
+        self._cond = threading.Condition()
+        # Serializes batch writes so they are committed in submission order
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        atexit.register(self.close)
+
+    def submit(
+        self,
+        sql: str,
+        params: Sequence[Any] = (),
+        overlay: Optional[Tuple[Any, Any]] = None,
+    ) -> int:
+        """Queue a write; returns its sequence number (see ``flushed_seq``).
+
+        Args:
+            overlay: ``(key, value)`` returned by :meth:`pending` for *key*
+                until this write is committed.
+        """
+        with self._cond:
+            if self._closed:
+                self.db.execute(sql, params)
+                self.submitted_seq += 1
+                self.flushed_seq = self.submitted_seq
+                return self.submitted_seq
+            self._pending.append((sql, params))
+            self.submitted_seq += 1
+            if overlay is not None:
+                self._overlay[overlay[0]] = (overlay[1], self.submitted_seq)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sqlite-write-behind", daemon=True
+                )
+                self._thread.start()
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+            return self.submitted_seq
+
+    def pending(self, key: Any) -> Optional[Any]:
+        """Value of the latest queued, not yet committed write for *key*."""
+        with self._cond:
+            entry = self._overlay.get(key)
+        return entry[0] if entry is not None else None
+
+    def defer(self, key: str, fn: Callable[[sqlite3.Connection], None]) -> None:
+        """Run ``fn(conn)`` once at the end of the next batch."""
+        with self._cond:
+            self._deferred[key] = fn
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.max_batch,
+                    timeout=self.flush_interval,
+                )
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self) -> int:
+        """Commit everything queued so far; returns the number of writes.
+
+        If the batch transaction fails, the writes are retried one by one: a
+        write failing with a ``sqlite3.Error`` is dropped (see ``errors``),
+        and any other failure puts it, and the writes after it, back at the
+        head of the queue for the next flush.
+        """
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+                deferred, self._deferred = self._deferred, {}
+                last_seq = self.submitted_seq
+            if not batch and not deferred:
+                return 0
+            written = len(batch)
+            try:
+                with self.db.transaction() as conn:
+                    self._apply(conn, batch)
+                    for fn in deferred.values():
+                        fn(conn)
+            except Exception as e:
+                # Do not lose the whole batch because of one bad write
+                logger.error(
+                    f"[Database] Batched write failed, retrying one by one: {e}"
+                )
+                written = self._write_one_by_one(batch, deferred)
+            self.batches += 1
+            self.flushed_seq = last_seq - (len(batch) - written)
+            with self._cond:
+                for key in [
+                    k for k, v in self._overlay.items() if v[1] <= self.flushed_seq
+                ]:
+                    del self._overlay[key]
+            return written
+
+    def _write_one_by_one(
+        self,
+        batch: List[Write],
+        deferred: Dict[str, Callable[[sqlite3.Connection], None]],
+    ) -> int:
+        """Fallback of :meth:`flush`; returns how many writes were handled."""
+        for written, (sql, params) in enumerate(batch):
+            try:
+                self.db.execute(sql, params)
+            except sqlite3.Error as write_error:
+                self.errors += 1
+                logger.error(f"[Database] Dropped write {sql[:40]!r}: {write_error}")
+            except Exception as e:
+                logger.error(f"[Database] Write failed, keeping it queued: {e}")
+                with self._cond:
+                    self._pending[:0] = batch[written:]
+                    for key, fn in deferred.items():
+                        self._deferred.setdefault(key, fn)
+                return written
+        for key, fn in deferred.items():
+            try:
+                with self.db.transaction() as conn:
+                    fn(conn)
+            except Exception as e:
+                logger.error(f"[Database] Deferred {key!r} failed: {e}")
+        return len(batch)
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, batch: List[Write]) -> None:
+        """Run consecutive writes of the same statement with executemany."""
+        i = 0
+        while i < len(batch):
+            sql = batch[i][0]
+            j = i
+            while j < len(batch) and batch[j][0] == sql:
+                j += 1
+            conn.executemany(sql, [params for _, params in batch[i:j]])
+            i = j
+
+    def close(self) -> None:
+        """Stop the background thread and flush what is left."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
@@ -0,0 +1,228 @@
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from agno.utils.log import logger
+from pydantic import BaseModel, Field
+
+from .database import Database
+
+# Markdown threads written by the Publisher (see FileSystemTools)
+PUBLICATIONS_DIR = Path(__file__).parent.parent / "publications" / "to-be-published"
+
+_WORD = re.compile(r"\w+")
+_COMBINING = re.compile(r"[\u0300-\u036f]")
+_FRONT_MATTER = re.compile(r"\A---\n.*?\n---\n", re.DOTALL)
+
+
+class DuplicateMatch(BaseModel):
+    """An already published text that a draft is too similar to"""
+
+    key: str = Field(..., description="'final:<topic>' or 'file:<name>'")
+    similarity: float = Field(..., description="Estimated Jaccard similarity")
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase words without accents, markdown, emojis or front matter."""
+    text = _FRONT_MATTER.sub("", text)
+    text = _COMBINING.sub("", unicodedata.normalize("NFKD", text.lower()))
+    return _WORD.findall(text)
+
+
+class MinHasher:
+    """MinHash signatures over word shingles.
+
+    Each shingle is hashed once and the ``num_perm`` permutations are applied
+    as a single vectorised multiply-add-shift over all shingles (uint64
+    arithmetic wraps, the top 32 bits are the permuted hash).
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        high = np.iinfo(np.uint64).max
+        self._a = rng.integers(1, high, size=(num_perm, 1), dtype=np.uint64) | 1
+        self._b = rng.integers(0, high, size=(num_perm, 1), dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[Tuple[str, ...]]:
+        words = normalize(text)
+        size = min(self.shingle_size, len(words)) or 1
+        return set(zip(*(words[i:] for i in range(size)))) or {("",)}
+
+    def signature(self, text: str) -> np.ndarray:
+        # Python's tuple hash is salted per process: fine, signatures are
+        # only kept in memory and rebuilt on startup
+        hashes = np.fromiter(
+            (hash(shingle) & 0xFFFFFFFF for shingle in self.shingles(text)),
+            dtype=np.uint64,
+        )
+        permuted = (self._a * hashes + self._b) >> np.uint64(32)
+        return permuted.min(axis=1)
+
+
+class NearDuplicateIndex:
+    """MinHash + LSH banding index of published texts.
+
+    A query only compares its signature with the texts sharing at least one
+    band bucket, so the cost of a check barely grows with the number of
+    indexed texts. With 32 bands of 4 rows, pairs with a Jaccard similarity
+    above ~0.6 become candidates with >99% probability; candidates are then
+    confirmed against ``threshold`` with the full signature.
+    """
+
+    def __init__(self, threshold: float = 0.8, bands: int = 32, rows: int = 4):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.hasher = MinHasher(num_perm=bands * rows)
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows : (band + 1) * self.rows].tobytes()
+
+    def add(self, key: str, text: str) -> None:
+        """Index (or re-index) *text* under *key*."""
+        signature = self.hasher.signature(text)
+        with self._lock:
+            self._remove(key)
+            self._signatures[key] = signature
+            for band, band_key in self._band_keys(signature):
+                self._buckets[band].setdefault(band_key, set()).add(key)
+
+    def _remove(self, key: str) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def query(
+        self, text: str, threshold: Optional[float] = None
+    ) -> Optional[DuplicateMatch]:
+        """The most similar indexed text at or above the threshold, if any."""
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.hasher.signature(text)
+        with self._lock:
+            candidates: Set[str] = set()
+            for band, band_key in self._band_keys(signature):
+                candidates.update(self._buckets[band].get(band_key, ()))
+            scored = [
+                (float(np.mean(self._signatures[key] == signature)), key)
+                for key in candidates
+            ]
+        if not scored:
+            return None
+        similarity, key = max(scored)
+        if similarity < threshold:
+            return None
+        return DuplicateMatch(key=key, similarity=similarity)
+
+
+class PublicationDeduplicator:
+    """Near-duplicate check of drafts against everything already published.
+
+    Indexes the final publications in *db* and the markdown files in
+    ``publications_dir``. The index is built on the first check and kept up
+    to date by ``Memory`` as publications are saved or deleted; use
+    :meth:`shared` to get the instance for a database file.
+    """
+
+    _instances: Dict[Tuple[str, str], "PublicationDeduplicator"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db: Database,
+        publications_dir: Path = PUBLICATIONS_DIR,
+        threshold: float = 0.8,
+    ):
+        self.db = db
+        self.publications_dir = Path(publications_dir)
+        self.index = NearDuplicateIndex(threshold=threshold)
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @classmethod
+    def shared(
+        cls, db: Database, publications_dir: Path = PUBLICATIONS_DIR
+    ) -> "PublicationDeduplicator":
+        key = (db.db_file, str(publications_dir))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(db, publications_dir)
+            return cls._instances[key]
+
+    def _load(self) -> None:
+        with self._load_lock:
+            if self._loaded:
+                return
+            # Keys added meanwhile by add() are newer than what is stored
+            for topic, text in self.db.query(
+                "SELECT topic, final_prompt FROM final_prompts;"
+            ):
+                if f"final:{topic}" not in self.index:
+                    self.index.add(f"final:{topic}", text)
+            if self.publications_dir.is_dir():
+                for path in sorted(self.publications_dir.glob("*.md")):
+                    if f"file:{path.name}" not in self.index:
+                        self.index.add(
+                            f"file:{path.name}", path.read_text(encoding="utf-8")
+                        )
+            self._loaded = True
+            logger.info(f"[Dedup] Indexed {len(self.index)} published texts")
+
+    def warm_up(self, background: bool = False) -> Optional[threading.Thread]:
+        """Build the index ahead of the first check.
+
+        Args:
+            background (bool): Run in a daemon thread and return it instead of
+                blocking the caller.
+        """
+        if self._loaded:
+            return None
+        if background:
+            thread = threading.Thread(
+                target=self.warm_up, name="dedup-warm-up", daemon=True
+            )
+            thread.start()
+            return thread
+        try:
+            self._load()
+        except Exception as e:
+            logger.warning(f"Duplicate index warm-up failed: {e}")
+        return None
+
+    def add(self, topic: str, publication: str) -> None:
+        self.index.add(f"final:{topic}", publication)
+
+    def remove(self, topic: str) -> None:
+        self.index.remove(f"final:{topic}")
+
+    def check(
+        self, draft: str, threshold: Optional[float] = None
+    ) -> Optional[DuplicateMatch]:
+        """Return the published text *draft* nearly duplicates, if any."""
+        if not self._loaded:
+            self._load()
+        return self.index.query(draft, threshold=threshold)
@@ -0,0 +1,52 @@
+import difflib
+import json
+import re
+from typing import List
+
+HUNK_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def unified_diff_lines(
+    original_content: str, new_content: str, path: str = "", n: int = 3
+) -> List[str]:
+    """Unified diff between two texts, one list item per diff line."""
+    return list(
+        difflib.unified_diff(
+            original_content.splitlines(keepends=True),
+            new_content.splitlines(keepends=True),
+            fromfile=f"a/{path}",
+            tofile=f"b/{path}",
+            n=n,
+        )
+    )
+
+
+def make_delta(original_content: str, new_content: str) -> str:
+    """Encode *new_content* as a context-free unified diff against the original.
+
+    The diff lines are kept as a JSON list (not joined text) so lines without
+    a trailing newline survive the round trip through :func:`apply_delta`.
+    """
+    lines = unified_diff_lines(original_content, new_content, n=0)
+    # File headers carry no information for a stored delta
+    return json.dumps(lines[2:], ensure_ascii=False)
+
+
+def apply_delta(original_content: str, delta: str) -> str:
+    """Rebuild the new content from the original and a :func:`make_delta`."""
+    original = original_content.splitlines(keepends=True)
+    result: List[str] = []
+    position = 0  # next original line (0-based) not yet copied
+    for line in json.loads(delta):
+        match = HUNK_PATTERN.match(line)
+        if match:
+            start, count = int(match.group(1)), match.group(2)
+            count = 1 if count is None else int(count)
+            # For pure insertions (count 0) "start" is the line *before* them
+            hunk_start = start - 1 if count else start
+            result.extend(original[position:hunk_start])
+            position = hunk_start + count
+        elif line.startswith("+"):
+            result.append(line[1:])
+    result.extend(original[position:])
+    return "".join(result)
@@ -0,0 +1,207 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+# Every field is required (no defaults): OpenAI strict structured outputs
+# reject optional properties, see agno's sanitize_response_schema.
+
+
+class CriterionScore(BaseModel):
+    """Score of one soft-quality criterion of the evaluator rubric"""
+
+    criterion: str = Field(..., description="Criterion name, e.g. Claridad")
+    score: float = Field(..., description="Score out of 10")
+
+
+class PostFeedback(BaseModel):
+    """Verdict on one post of a thread (or of a multi-post draft)"""
+
+    post: int = Field(..., description="1-based post number")
+    approved: bool = Field(..., description="False if this post must be rewritten")
+    issues: List[str] = Field(
+        ..., description="What to fix in this post only (empty if approved)"
+    )
+
+
+class PublicationEvaluation(BaseModel):
+    """Structured verdict of the evaluator"""
+
+    approved: bool = Field(
+        ...,
+        description="True only if every hard gate passes and the total score is >= 80",
+    )
+    decision: str = Field(..., description="Publish | Revise | Do Not Publish")
+    failed_gates: List[str] = Field(
+        ..., description="Hard-gate items that failed (empty if all pass)"
+    )
+    scores: List[CriterionScore] = Field(
+        ..., description="Soft-quality score of every rubric criterion"
+    )
+    total_score: Optional[float] = Field(
+        ..., description="Soft-quality total over 100 (null if not scored)"
+    )
+    recommendations: List[str] = Field(
+        ...,
+        description="Thread-level fixes (max 5, empty if approved); fixes of a "
+        "single post go in post_feedback",
+    )
+    post_feedback: List[PostFeedback] = Field(
+        ..., description="Per-post verdicts, one entry per post of the draft"
+    )
+
+    def score_map(self) -> Dict[str, float]:
+        return {s.criterion.strip().lower(): s.score for s in self.scores}
+
+    def failed_posts(self) -> Dict[int, List[str]]:
+        """Issues of every post the evaluator did not approve, by post number."""
+        return {p.post: p.issues for p in self.post_feedback if not p.approved}
+
+    def feedback(self) -> str:
+        """The verdict as markdown, shown to the user and sent to the writer."""
+        lines = [f"**Decision:** {self.decision}"]
+        if self.failed_gates:
+            lines += ["", "**Failed Hard Gates:**", ""]
+            lines += [f"- {gate}" for gate in self.failed_gates]
+        if self.total_score is not None:
+            lines += ["", f"**Soft-Quality Score:** {self.total_score:g} / 100"]
+        if self.scores:
+            lines += ["", "| Criterion | Score/10 |", "|-----------|----------|"]
+            lines += [f"| {s.criterion} | {s.score:g} |" for s in self.scores]
+        if self.recommendations:
+            lines += ["", "**Feedback & Actionable Suggestions:**", ""]
+            lines += [f"- {r}" for r in self.recommendations]
+        failed = self.failed_posts()
+        if failed:
+            lines += ["", "**Per-Post Feedback:**", ""]
+            lines += [
+                f"- Post {post}: {'; '.join(issues) or 'rewrite'}"
+                for post, issues in sorted(failed.items())
+            ]
+        return "\n".join(lines)
+
+
+_FENCE = re.compile(r"\A```(?:json)?\s*\n(.*)\n```\Z", re.DOTALL)
+_DECISION = re.compile(
+    r"\*{0,2}decision:?\*{0,2}:?\s*\**\s*(do not publish|publish|revise)",
+    re.IGNORECASE,
+)
+_LEADING = re.compile(r"\A\W*(do not publish|publish|revise)\b", re.IGNORECASE)
+_TOTAL = re.compile(r"score:?\**:?\s*(\d+(?:\.\d+)?)\s*/\s*100", re.IGNORECASE)
+_SCORE_ROW = re.compile(r"^\|\s*([^|\-][^|]*?)\s*\|\s*(\d+(?:\.\d+)?)\s*\|", re.M)
+_FAILED_GATE = re.compile(r"^\s*[-*]\s*([^:\n]+):\s*✗", re.MULTILINE)
+_BULLET = re.compile(r"^\s*[-*]\s+(.+)$", re.MULTILINE)
+
+
+def _from_dict(data: Dict[str, Any]) -> PublicationEvaluation:
+    scores = data.get("scores") or []
+    if isinstance(scores, dict):
+        scores = [{"criterion": k, "score": v} for k, v in scores.items()]
+    recommendations = data.get("recommendations") or data.get("recommedations") or []
+    if isinstance(recommendations, str):
+        recommendations = [recommendations]
+    decision = str(data.get("decision") or "")
+    approved = data.get("approved")
+    if approved is None:
+        approved = decision.strip().lower() == "publish"
+    return PublicationEvaluation(
+        approved=bool(approved),
+        decision=decision or ("Publish" if approved else "Revise"),
+        failed_gates=list(data.get("failed_gates") or []),
+        scores=scores,
+        total_score=data.get("total_score"),
+        recommendations=list(recommendations),
+        post_feedback=list(data.get("post_feedback") or []),
+    )
+
+
+def _from_markdown(text: str) -> PublicationEvaluation:
+    """Read the evaluator's markdown template (or a bare verdict)."""
+    match = _DECISION.search(text) or _LEADING.search(text)
+    decision = match.group(1).title() if match else "Revise"
+    approved = bool(match) and match.group(1).lower() == "publish"
+    total = _TOTAL.search(text)
+    scores = [
+        CriterionScore(criterion=name, score=float(score))
+        for name, score in _SCORE_ROW.findall(text)
+        if name.lower() not in ("criterion", "criterio")
+    ]
+    failed = _FAILED_GATE.findall(text)
+    _, _, suggestions = text.partition("Suggestions")
+    recommendations = _BULLET.findall(suggestions)
+    if not approved and not recommendations:
+        recommendations = [text.strip()]
+    return PublicationEvaluation(
+        approved=approved and not failed,
+        decision=decision,
+        failed_gates=[gate.strip() for gate in failed],
+        scores=scores,
+        total_score=float(total.group(1)) if total else None,
+        recommendations=recommendations,
+        post_feedback=[],
+    )
+
+
+def parse_evaluation(content: Any) -> PublicationEvaluation:
+    """Turn whatever the evaluator returned into a ``PublicationEvaluation``.
+
+    Accepts the structured output itself, a dict or JSON text (e.g. cached
+    verdicts) and, as a fallback for models without structured outputs, the
+    markdown template of the evaluator prompt. Without an explicit decision
+    the draft is *not* approved.
+    """
+    if isinstance(content, PublicationEvaluation):
+        return content
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    if isinstance(content, dict):
+        return _from_dict(content)
+    text = str(content or "").strip()
+    fenced = _FENCE.match(text)
+    try:
+        data = json.loads(fenced.group(1) if fenced else text)
+        if isinstance(data, dict):
+            return _from_dict(data)
+    except (ValueError, ValidationError):
+        pass
+    return _from_markdown(text)
+
+
+class ScoreTracker:
+    """Per-criterion scores across the iterations of the revision loop.
+
+    The loop has plateaued when ``patience`` consecutive scored evaluations
+    improved neither the total nor any criterion by at least ``min_delta``
+    over the best seen so far.
+    """
+
+    def __init__(self, patience: int = 2, min_delta: float = 1.0):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.history: List[Dict[str, float]] = []
+        self._best: Dict[str, float] = {}
+        self._stale = 0
+
+    def record(self, evaluation: PublicationEvaluation) -> None:
+        scores = evaluation.score_map()
+        if evaluation.total_score is not None:
+            scores["total"] = evaluation.total_score
+        self.record_scores(scores)
+
+    def record_scores(self, scores: Dict[str, float]) -> None:
+        """Record one evaluation given as ``{criterion: score}`` (see ``history``)."""
+        if not scores:
+            return
+        self.history.append(scores)
+        improved = not self._best or any(
+            score >= self._best.get(name, float("-inf")) + self.min_delta
+            for name, score in scores.items()
+        )
+        for name, score in scores.items():
+            self._best[name] = max(score, self._best.get(name, score))
+        self._stale = 0 if improved else self._stale + 1
+
+    @property
+    def plateaued(self) -> bool:
+        return self.patience > 0 and self._stale >= self.patience
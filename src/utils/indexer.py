@@ -0,0 +1,182 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from hashlib import md5
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
+
+from agno.document import Document
+from agno.utils.log import logger
+
+if TYPE_CHECKING:
+    from agno.vectordb.chroma import ChromaDb
+
+
+def default_documents(path: Path, content: str) -> List[Document]:
+    """Build the documents indexed for a file: the whole file as one document."""
+    return [Document(content=content, name=path.name, meta_data={"source": path.name})]
+
+
+def chroma_id(document: Document) -> str:
+    """The id ChromaDb assigns to *document* on insert/upsert.
+
+    It depends on the content only, so files with an identical chunk share the
+    vector: the manifest is the reference count that decides when to drop it.
+    """
+    cleaned_content = document.content.replace("\x00", "\ufffd")
+    return md5(cleaned_content.encode()).hexdigest()
+
+
+@dataclass
+class IndexReport:
+    """Summary of an incremental index sync"""
+
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    embedded: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+class IncrementalIndexer:
+    """Keep a ChromaDb collection in sync with a directory of documents.
+
+    A JSON manifest records the path, mtime, size, content hash and vector ids
+    of every indexed file. On :meth:`sync` only new or modified files are
+    embedded and upserted, and the vectors of removed files are deleted, so the
+    cost of a sync scales with what changed rather than with the corpus size.
+    """
+
+    def __init__(
+        self,
+        docs_dir: Path,
+        vector_db: "ChromaDb",
+        manifest_path: Optional[Path] = None,
+        pattern: str = "*.md",
+        build_documents: Callable[[Path, str], List[Document]] = default_documents,
+        signature: str = "file",
+    ):
+        self.docs_dir = Path(docs_dir)
+        self.vector_db = vector_db
+        self.manifest_path = Path(
+            manifest_path or Path(vector_db.path) / "manifest.json"
+        )
+        self.pattern = pattern
+        self.build_documents = build_documents
+        # Identifies how files are turned into documents (e.g. the chunking
+        # configuration); entries indexed with another signature are rebuilt.
+        self.signature = signature
+
+    def load_manifest(self) -> Dict[str, Dict]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"[Indexer] Ignoring unreadable manifest: {e}")
+            return {}
+
+    def save_manifest(self, manifest: Dict[str, Dict]) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        tmp_path.replace(self.manifest_path)
+
+    def _collection(self):
+        if not self.vector_db.exists():
+            self.vector_db.create()
+        return self.vector_db.client.get_collection(name=self.vector_db.collection_name)
+
+    def sync(self, force: bool = False) -> IndexReport:
+        """Bring the collection up to date with ``docs_dir``.
+
+        Args:
+            force (bool): Re-embed every file even if the manifest says it is
+                unchanged.
+        """
+        report = IndexReport()
+        collection = self._collection()
+        manifest = {} if force else self.load_manifest()
+        # A manifest without a collection behind it is stale
+        if manifest and collection.count() == 0:
+            manifest = {}
+        new_manifest: Dict[str, Dict] = {}
+        # Ids no longer produced by their file; deleted at the end unless
+        # another file still references them
+        released: Set[str] = set()
+
+        for path in sorted(self.docs_dir.glob(self.pattern)):
+            key = path.name
+            stat = path.stat()
+            entry = manifest.get(key)
+            same_signature = (
+                entry is not None and entry.get("signature") == self.signature
+            )
+            if (
+                same_signature
+                and entry["mtime"] == stat.st_mtime
+                and entry["size"] == stat.st_size
+            ):
+                new_manifest[key] = entry
+                report.unchanged.append(key)
+                continue
+
+            content = path.read_text(encoding="utf-8")
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            if same_signature and entry["sha256"] == digest:
+                # Touched but not modified: refresh the stat info only
+                new_manifest[key] = {
+                    **entry,
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                }
+                report.unchanged.append(key)
+                continue
+
+            # Identical chunks of one file share an id; Chroma rejects an
+            # upsert that repeats an id, so keep the first of each
+            documents: Dict[str, Document] = {}
+            for doc in self.build_documents(path, content):
+                documents.setdefault(chroma_id(doc), doc)
+            ids = list(documents)
+            # Vectors already in the collection (e.g. from a previous full load)
+            # do not need to be embedded again.
+            existing = set(collection.get(ids=ids, include=[])["ids"]) if ids else set()
+            to_upsert = [doc for i, doc in documents.items() if i not in existing]
+            if to_upsert:
+                self.vector_db.upsert(documents=to_upsert)
+                report.embedded += len(to_upsert)
+            if entry:
+                released.update(set(entry["ids"]) - set(ids))
+
+            new_manifest[key] = {
+                "path": str(path),
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "sha256": digest,
+                "signature": self.signature,
+                "ids": ids,
+            }
+            (report.updated if entry else report.added).append(key)
+
+        for key, entry in manifest.items():
+            if key not in new_manifest:
+                released.update(entry.get("ids") or ())
+                report.removed.append(key)
+
+        referenced = {i for entry in new_manifest.values() for i in entry["ids"]}
+        orphaned = released - referenced
+        if orphaned:
+            collection.delete(ids=sorted(orphaned))
+
+        self.save_manifest(new_manifest)
+        logger.info(
+            f"[Indexer] added={len(report.added)} updated={len(report.updated)} "
+            f"removed={len(report.removed)} unchanged={len(report.unchanged)} "
+            f"embedded={report.embedded}"
+        )
+        return report
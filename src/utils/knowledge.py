@@ -3,8 +3,12 @@ from agno.knowledge.document import (
     DocumentKnowledgeBase as _BaseKnowledgeBase,
     Document as _BaseDocument,
 )
-from agno.vectordb.chroma import ChromaDb
 import logging
+import threading
+from typing import Any, Dict, List, Optional
+from .chunking import MarkdownChunking
+from .indexer import IncrementalIndexer, IndexReport
+from .retrieval_cache import CachedEmbedder, RetrievalCache
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +19,7 @@ class Document(_BaseDocument):
     """
 
     def __init__(self, content: str, metadata: dict):
-        super().__init__(content)
+        super().__init__(content, name=metadata.get("source"), meta_data=dict(metadata))
         # Store metadata override and assign to __dict__ for compatibility
         self._metadata_override = metadata
         self.__dict__["metadata"] = metadata
@@ -26,27 +30,168 @@ class Document(_BaseDocument):
         return self._metadata_override
 
 
-class Knowledge:
+def chunk_file(path: Path, content: str, chunking: MarkdownChunking):
+    """Split a markdown file into the chunk documents that get indexed."""
+    return chunking.chunk(Document(content, metadata={"source": path.name}))
+
+
+def chunk_files(paths, chunking: MarkdownChunking):
+    """Chunk every file in *paths*."""
+    return [
+        chunk
+        for path in paths
+        for chunk in chunk_file(path, path.read_text(encoding="utf-8"), chunking)
+    ]
+
+
+class _LazyKnowledgeMeta(type):
+    """Exposes the lazily built objects as ``Knowledge.<attr>`` for
+    backwards compatibility with the old eager class attributes."""
+
+    @property
+    def knowledge_base(cls) -> _BaseKnowledgeBase:
+        return cls.get()
+
+    @property
+    def vector_db(cls):
+        return cls.get().vector_db
+
+    @property
+    def documents(cls):
+        return cls.get().documents
+
+
+class Knowledge(metaclass=_LazyKnowledgeMeta):
+    """Shared knowledge base for the agents, built on first use.
+
+    Importing this module no longer reads ``docs_dir`` nor imports ChromaDB:
+    :meth:`get` builds the documents, vector store and knowledge base the first
+    time it is called, and :meth:`warm_up` can do it ahead of time (optionally
+    in a background thread) together with the Chroma client startup.
+    """
+
     # Directory containing source documents to index
     docs_dir = Path(__file__).parent.parent / "docs"
-    # Discover markdown files and log their names
-    _md_paths = list(docs_dir.glob("*.md"))
-    logger.info(
-        f"Knowledge base initializing with {len(_md_paths)} documents: {[p.name for p in _md_paths]}"
-    )
-    # Build Document subclass instances with metadata
-    documents = [
-        Document(path.read_text(encoding="utf-8"), metadata={"source": path.name})
-        for path in _md_paths
-    ]
-    # Configure ChromaDB vector store
-    vector_db = ChromaDb(
-        collection="documents",
-        path="src/db/knowledge",
-        persistent_client=True,
-    )
-    # Instantiate the knowledge base with documents and vector store
-    knowledge_base = _BaseKnowledgeBase(
-        documents=documents,
-        vector_db=vector_db,
-    )
+    # Persistent ChromaDB location
+    db_path = "src/db/knowledge"
+    # Heading-aware splitter: searches return sections, not whole files
+    chunking_strategy = MarkdownChunking(chunk_size=1200, overlap=150)
+
+    # Search results shared by every agent and revision loop; invalidated
+    # by sync_index whenever the index changes
+    retrieval_cache = RetrievalCache(max_entries=512, ttl_seconds=3600)
+
+    _knowledge_base: Optional[_BaseKnowledgeBase] = None
+    _lock = threading.Lock()
+    _warm_up_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def _build(cls) -> _BaseKnowledgeBase:
+        from agno.embedder.openai import OpenAIEmbedder
+        from agno.vectordb.chroma import ChromaDb
+
+        # Discover markdown files and log their names
+        md_paths = list(cls.docs_dir.glob("*.md"))
+        logger.info(
+            f"Knowledge base initializing with {len(md_paths)} documents: {[p.name for p in md_paths]}"
+        )
+        # Configure ChromaDB vector store
+        vector_db = ChromaDb(
+            collection="documents",
+            path=cls.db_path,
+            persistent_client=True,
+            # Repeated queries are not re-embedded
+            embedder=CachedEmbedder(embedder=OpenAIEmbedder()),
+        )
+        # Instantiate the knowledge base with chunked documents and vector store
+        return _BaseKnowledgeBase(
+            documents=chunk_files(md_paths, cls.chunking_strategy),
+            vector_db=vector_db,
+            chunking_strategy=cls.chunking_strategy,
+        )
+
+    @classmethod
+    def get(cls) -> _BaseKnowledgeBase:
+        """Return the shared knowledge base, building it on first use."""
+        if cls._knowledge_base is None:
+            with cls._lock:
+                if cls._knowledge_base is None:
+                    cls._knowledge_base = cls._build()
+        return cls._knowledge_base
+
+    @classmethod
+    def warm_up(cls, background: bool = False) -> Optional[threading.Thread]:
+        """Build the knowledge base and start the Chroma client ahead of time.
+
+        Args:
+            background (bool): Run in a daemon thread and return it instead of
+                blocking the caller.
+        """
+        if background:
+            if cls._warm_up_thread is None or not cls._warm_up_thread.is_alive():
+                cls._warm_up_thread = threading.Thread(
+                    target=cls.warm_up, name="knowledge-warm-up", daemon=True
+                )
+                cls._warm_up_thread.start()
+            return cls._warm_up_thread
+        try:
+            cls.get().vector_db.client
+        except Exception as e:
+            logger.warning(f"Knowledge warm-up failed: {e}")
+        return None
+
+    @classmethod
+    def sync_index(cls, force: bool = False) -> IndexReport:
+        """Incrementally index ``docs_dir``: only new/modified files are embedded
+        and vectors of removed files are deleted (see ``IncrementalIndexer``)."""
+        indexer = IncrementalIndexer(
+            docs_dir=cls.docs_dir,
+            vector_db=cls.get().vector_db,
+            build_documents=lambda path, content: chunk_file(
+                path, content, cls.chunking_strategy
+            ),
+            signature=cls.chunking_strategy.signature,
+        )
+        report = indexer.sync(force=force)
+        if report.changed:
+            cls.retrieval_cache.invalidate()
+        return report
+
+    @classmethod
+    def search(
+        cls,
+        query: str,
+        num_documents: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        agent=None,
+        **kwargs,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Agent ``retriever`` that serves repeated searches from
+        ``retrieval_cache`` and only queries the vector store on a miss."""
+        agent_name = getattr(agent, "name", None) or "unknown"
+        key = cls.retrieval_cache.key(query, num_documents, filters)
+        docs = cls.retrieval_cache.get(key, agent_name)
+        if docs is None:
+            docs = [
+                doc.to_dict()
+                for doc in cls.get().search(
+                    query=query, num_documents=num_documents, filters=filters
+                )
+            ]
+            # Empty results are not cached: they are usually a transient error
+            if docs:
+                cls.retrieval_cache.put(key, docs)
+        return docs or None
+
+    @classmethod
+    def retrieval_stats(cls) -> Dict[str, Any]:
+        """Search-result cache stats per agent plus embedding cache stats."""
+        stats = cls.retrieval_cache.stats()
+        embedder = (
+            getattr(cls._knowledge_base.vector_db, "embedder", None)
+            if cls._knowledge_base is not None
+            else None
+        )
+        if isinstance(embedder, CachedEmbedder):
+            stats["embeddings"] = embedder.stats()
+        return stats
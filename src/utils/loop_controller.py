@@ -0,0 +1,215 @@
+import time
+from difflib import SequenceMatcher
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from .dedup import normalize
+from .evaluation import PublicationEvaluation, ScoreTracker
+from .metrics import PhaseEvent
+from .pre_evaluator import PreEvaluation
+
+# Why a revision loop ended (PhaseEvent.termination of the "loop" phase)
+APPROVED = "approved"
+MAX_REVISIONS = "max_revisions"
+TIME_BUDGET = "time_budget"
+TOKEN_BUDGET = "token_budget"
+COST_BUDGET = "cost_budget"
+SCORE_PLATEAU = "score_plateau"
+REPEATED_FEEDBACK = "repeated_feedback"
+DRAFT_CONVERGED = "draft_converged"
+
+
+class LoopBudget(BaseModel):
+    """Per-topic limits of a workflow run (None means unlimited)"""
+
+    max_seconds: Optional[float] = Field(None, description="Wall-clock seconds")
+    max_tokens: Optional[int] = Field(None, description="Input + output tokens")
+    max_cost: Optional[float] = Field(None, description="Estimated cost in USD")
+
+
+def similarity(a: str, b: str) -> float:
+    """Word-level similarity (0-1) of two texts, ignoring case and accents."""
+    return SequenceMatcher(None, normalize(a), normalize(b), autojunk=False).ratio()
+
+
+class RevisionLoopController:
+    """Decides when the evaluate/revise loop of one topic should stop.
+
+    Every phase of the run is charged against the ``LoopBudget`` (see
+    :meth:`charge`); on top of the budget and ``max_revisions`` the loop
+    stops on diminishing returns: revisions that barely change the draft,
+    the evaluator (or the local rules) repeating its feedback, or scores
+    that plateau. Each scored draft is remembered so that, without an
+    approval, the best one is published instead of the last one; when no
+    draft passed the local rules, the one with the fewest violations is.
+    """
+
+    def __init__(
+        self,
+        max_revisions: int = 10,
+        budget: Optional[LoopBudget] = None,
+        min_draft_change: float = 0.02,
+        repeat_similarity: float = 0.9,
+        plateau_patience: int = 2,
+        plateau_min_delta: float = 1.0,
+    ):
+        self.max_revisions = max_revisions
+        self.budget = budget or LoopBudget()
+        self.min_draft_change = min_draft_change
+        self.repeat_similarity = repeat_similarity
+        self.scores = ScoreTracker(plateau_patience, plateau_min_delta)
+        self.started = time.perf_counter()
+        self.tokens = 0
+        self.cost = 0.0
+        self.reason: Optional[str] = None
+        self.best_draft: Optional[str] = None
+        self.best_score: Optional[float] = None
+        self.best_iteration: Optional[int] = None
+        # Draft with the fewest local rule violations, for runs where no
+        # draft reached the evaluator
+        self.fallback_draft: Optional[str] = None
+        self.fallback_violations: Optional[int] = None
+        self.fallback_iteration: Optional[int] = None
+        self._last_feedback: Optional[str] = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def charge(self, event: PhaseEvent) -> None:
+        """Account the tokens and cost of a recorded phase."""
+        self.tokens += event.input_tokens + event.output_tokens
+        self.cost += event.cost
+
+    def _stop(self, reason: Optional[str]) -> Optional[str]:
+        if reason is not None:
+            self.reason = reason
+        return reason
+
+    def check_budget(self, iteration: int) -> Optional[str]:
+        """Reason to stop before running *iteration*, if any.
+
+        Iteration ``n`` is the n-th revision (and its evaluation), so up to
+        ``max_revisions`` revisions run and the last one is still scored.
+        """
+        budget = self.budget
+        if iteration > self.max_revisions:
+            return self._stop(MAX_REVISIONS)
+        if budget.max_seconds is not None and self.elapsed >= budget.max_seconds:
+            return self._stop(TIME_BUDGET)
+        if budget.max_tokens is not None and self.tokens >= budget.max_tokens:
+            return self._stop(TOKEN_BUDGET)
+        if budget.max_cost is not None and self.cost >= budget.max_cost:
+            return self._stop(COST_BUDGET)
+        return None
+
+    @staticmethod
+    def score_of(verdict: PublicationEvaluation) -> Optional[float]:
+        """Total score over 100, or the criteria mean scaled to 100."""
+        if verdict.total_score is not None:
+            return verdict.total_score
+        if verdict.scores:
+            return 10 * sum(s.score for s in verdict.scores) / len(verdict.scores)
+        return None
+
+    def record_evaluation(
+        self, iteration: int, draft: str, verdict: PublicationEvaluation
+    ) -> Optional[str]:
+        """Keep the best draft and tell whether the loop should stop."""
+        score = self.score_of(verdict)
+        # Ties go to the later draft: it addresses more feedback
+        if score is not None and (self.best_score is None or score >= self.best_score):
+            self.best_draft, self.best_score = draft, score
+            self.best_iteration = iteration
+        if verdict.approved:
+            return self._stop(APPROVED)
+        self.scores.record(verdict)
+        feedback = "\n".join(
+            verdict.failed_gates
+            + verdict.recommendations
+            + [
+                f"{n}: {i}"
+                for n, issues in verdict.failed_posts().items()
+                for i in issues
+            ]
+        )
+        if self._repeated(feedback):
+            return self._stop(REPEATED_FEEDBACK)
+        if self.scores.plateaued:
+            return self._stop(SCORE_PLATEAU)
+        return None
+
+    def record_pre_evaluation(
+        self, iteration: int, draft: str, pre_evaluation: PreEvaluation
+    ) -> Optional[str]:
+        """Like :meth:`record_evaluation` for a draft the local rules rejected."""
+        violations = len(pre_evaluation.violations)
+        # Ties go to the later draft, as in record_evaluation
+        if self.fallback_violations is None or violations <= self.fallback_violations:
+            self.fallback_draft, self.fallback_violations = draft, violations
+            self.fallback_iteration = iteration
+        feedback = "\n".join(
+            f"{v.post}: {v.rule}: {v.message}" for v in pre_evaluation.violations
+        )
+        if self._repeated(feedback):
+            return self._stop(REPEATED_FEEDBACK)
+        return None
+
+    def _repeated(self, feedback: str) -> bool:
+        """Whether *feedback* nearly repeats the previous one (and remember it)."""
+        repeated = (
+            self._last_feedback is not None
+            and bool(feedback)
+            and similarity(feedback, self._last_feedback) >= self.repeat_similarity
+        )
+        self._last_feedback = feedback
+        return repeated
+
+    def record_revision(self, previous: str, draft: str) -> Optional[str]:
+        """Stop when a revision changed less than ``min_draft_change``."""
+        if 1.0 - similarity(previous, draft) < self.min_draft_change:
+            return self._stop(DRAFT_CONVERGED)
+        return None
+
+    def state(self) -> Dict[str, Any]:
+        """What :meth:`restore` needs to continue the loop in another process."""
+        return {
+            "elapsed": self.elapsed,
+            "tokens": self.tokens,
+            "cost": self.cost,
+            "best_draft": self.best_draft,
+            "best_score": self.best_score,
+            "best_iteration": self.best_iteration,
+            "fallback_draft": self.fallback_draft,
+            "fallback_violations": self.fallback_violations,
+            "fallback_iteration": self.fallback_iteration,
+            "last_feedback": self._last_feedback,
+            "scores": self.scores.history,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Continue from a :meth:`state` (spent budget, best draft, history)."""
+        self.started = time.perf_counter() - state.get("elapsed", 0.0)
+        self.tokens = state.get("tokens", 0)
+        self.cost = state.get("cost", 0.0)
+        self.best_draft = state.get("best_draft")
+        self.best_score = state.get("best_score")
+        self.best_iteration = state.get("best_iteration")
+        self.fallback_draft = state.get("fallback_draft")
+        self.fallback_violations = state.get("fallback_violations")
+        self.fallback_iteration = state.get("fallback_iteration")
+        self._last_feedback = state.get("last_feedback")
+        for scores in state.get("scores", []):
+            self.scores.record_scores(scores)
+
+    def final_draft(self, draft: str) -> str:
+        """Draft to publish: the current one if approved, else the best scored
+        or, if none was scored, the one with the fewest rule violations."""
+        if self.reason == APPROVED:
+            return draft
+        if self.best_draft is not None:
+            return self.best_draft
+        if self.fallback_draft is not None:
+            return self.fallback_draft
+        return draft
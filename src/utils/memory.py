@@ -1,10 +1,30 @@
-from typing import Dict, Optional
+from typing import List, Optional
 from datetime import datetime
 from agno.storage.sqlite import SqliteStorage
 from agno.utils.log import logger
 from pydantic import BaseModel, Field
 from agno.memory import AgentMemory
-import sqlite3
+from .archive import ArchivePage, PublicationArchive
+from .checkpoints import Checkpoint, CheckpointStore
+from .database import Database, resolve_durability
+from .dedup import DuplicateMatch, PublicationDeduplicator
+from .evaluation import PublicationEvaluation  # noqa: F401 (re-export)
+from .phase_cache import PhaseCache
+from .revision_history import Revision, RevisionHistory
+
+# Statements against the final_prompts table (schema in database.MIGRATIONS);
+# kept constant so the per-thread connections reuse the prepared statements
+UPSERT_FINAL_SQL = """INSERT INTO final_prompts (topic, final_prompt, timestamp)
+                       VALUES (?, ?, ?)
+                       ON CONFLICT (topic) DO UPDATE SET
+                       final_prompt = excluded.final_prompt,
+                       timestamp = excluded.timestamp;"""
+SELECT_FINAL_SQL = (
+    "SELECT topic, final_prompt, timestamp FROM final_prompts WHERE topic = ?;"
+)
+LIST_FINAL_SQL = """SELECT topic, final_prompt, timestamp
+                     FROM final_prompts ORDER BY timestamp DESC LIMIT ? OFFSET ?;"""
+DELETE_FINAL_SQL = "DELETE FROM final_prompts WHERE topic = ?;"
 
 
 class Publication(BaseModel):
@@ -26,23 +46,24 @@ class GenerataedPublication(BaseModel):
     improved_publication: str = Field(..., description="Final and approved publication")
 
 
-class PublicationEvaluation(BaseModel):
-    """Model for storing publication evaluation"""
-
-    publication: str = Field(..., description="The publication being evaluated")
-    evaluation: Dict[str, str] = Field(..., description="Evaluation Results")
-    recommedations: str = Field(..., description="Suggested improvments")
-    approved: bool = Field(
-        ..., description="If the publication is approved to be published"
-    )
-
-
 class Memory(AgentMemory):
-    def __init__(self, *args, session_id=None, storage=None, **kwargs):
+    def __init__(
+        self,
+        *args,
+        session_id=None,
+        storage=None,
+        phase_cache=None,
+        db: Optional[Database] = None,
+        db_file: Optional[str] = None,
+        durability: Optional[str] = None,
+        **kwargs,
+    ):
+        # Pooled, WAL-mode connection layer shared by every Memory on this file
+        db = db or Database.shared(db_file)
         if storage is None:
             storage = SqliteStorage(
                 table_name="publication_generation_workflows",
-                db_file="src/db/publication_generation.db",
+                db_file=db.db_file,
             )
         if session_id is not None:
             kwargs["session_id"] = session_id
@@ -52,6 +73,26 @@ class Memory(AgentMemory):
         # Pydantic immutability workaround: attach storage & table explicitly
         object.__setattr__(self, "storage", storage)
         object.__setattr__(self, "final_prompts_table", storage.get_table())
+        object.__setattr__(self, "db", db)
+        # "batched": phase artifacts and final publications are written behind
+        # the workflow in grouped transactions; "sync": written immediately
+        object.__setattr__(self, "durability", resolve_durability(durability))
+        # Durable, content-addressed cache of phase outputs (survives restarts)
+        object.__setattr__(
+            self,
+            "phase_cache",
+            phase_cache or PhaseCache(db_file=db.db_file, durability=self.durability),
+        )
+        # Every draft/evaluation pair of the revision loop (delta-compressed)
+        object.__setattr__(
+            self, "revisions", RevisionHistory(db, durability=self.durability)
+        )
+        # Latest checkpoint of every workflow run (see PublicationWorkflow.resume)
+        object.__setattr__(self, "checkpoints", CheckpointStore(db))
+        # Keyset-paginated, full-text searchable view of the final publications
+        object.__setattr__(self, "archive", PublicationArchive(db))
+        # Near-duplicate index of published content (shared per database)
+        object.__setattr__(self, "duplicates", PublicationDeduplicator.shared(db))
 
         # Guarantee an in‑memory dict for caching if AgentMemory didn't create one
         if not hasattr(self, "session_state"):
@@ -60,37 +101,100 @@ class Memory(AgentMemory):
         logger.info("Ensured 'final_prompts' table exists for permanent storage.")
 
     # --- Explicit cache methods for each phase ---
-    def get_cached_initial_publication(self, topic: str) -> Optional[str]:
+    def get_cached_initial_publication(
+        self, topic: str, key: Optional[str] = None
+    ) -> Optional[str]:
         logger.debug(f"Checking cache for topic '{topic}' - initial_publication phase")
+        if key is not None:
+            return self.phase_cache.get(key, phase="draft")
         return self.session_state.get("initial_publications", {}).get(topic)
 
-    def add_initial_publication_to_cache(self, topic: str, data: str):
+    def add_initial_publication_to_cache(
+        self, topic: str, data: str, key: Optional[str] = None
+    ):
         logger.debug(f"Caching initial publication for topic '{topic}'")
         self.session_state.setdefault("initial_publications", {})[topic] = data
+        if key is not None:
+            self.phase_cache.put(key, data, phase="draft")
 
-    def get_planned_publication(self, topic: str) -> Optional[str]:
+    def get_planned_publication(
+        self, topic: str, key: Optional[str] = None
+    ) -> Optional[str]:
         logger.debug(f"Checking cache for topic '{topic}' - planned_publication phase")
+        if key is not None:
+            return self.phase_cache.get(key, phase="plan")
         return self.session_state.get("planned_publications", {}).get(topic)
 
-    def add_planened_publication(self, topic: str, data: str):
+    def add_planened_publication(
+        self, topic: str, data: str, key: Optional[str] = None
+    ):
         logger.debug(f"Caching planned publication for topic '{topic}'")
         self.session_state.setdefault("planned_publications", {})[topic] = data
+        if key is not None:
+            self.phase_cache.put(key, data, phase="plan")
 
-    def get_cached_evaluation(self, topic: str) -> Optional[str]:
+    def get_cached_evaluation(
+        self, topic: str, key: Optional[str] = None
+    ) -> Optional[str]:
         logger.debug(f"Checking cache for topic '{topic}' - evaluation phase")
+        if key is not None:
+            return self.phase_cache.get(key, phase="evaluation")
         return self.session_state.get("evaluations", {}).get(topic)
 
-    def add_evaluation_to_cache(self, topic: str, data: str):
+    def add_evaluation_to_cache(self, topic: str, data: str, key: Optional[str] = None):
         logger.debug(f"Caching evaluation for topic '{topic}'")
         self.session_state.setdefault("evaluations", {})[topic] = data
+        if key is not None:
+            self.phase_cache.put(key, data, phase="evaluation")
 
-    def get_cached_improved_publication(self, topic: str) -> Optional[str]:
+    def get_cached_improved_publication(
+        self, topic: str, key: Optional[str] = None
+    ) -> Optional[str]:
         logger.debug(f"Checking cache for topic '{topic}' - improved_publication phase")
+        if key is not None:
+            return self.phase_cache.get(key, phase="revision")
         return self.session_state.get("improved_publications", {}).get(topic)
 
-    def add_improved_publication_to_cache(self, topic: str, data: str):
+    def add_improved_publication_to_cache(
+        self, topic: str, data: str, key: Optional[str] = None
+    ):
         logger.debug(f"Caching improved publication for topic '{topic}'")
         self.session_state.setdefault("improved_publications", {})[topic] = data
+        if key is not None:
+            self.phase_cache.put(key, data, phase="revision")
+
+    def add_revision_to_history(
+        self,
+        run_id: str,
+        topic: str,
+        iteration: int,
+        draft: str,
+        evaluation: Optional[str] = None,
+    ) -> None:
+        logger.debug(f"Recording revision {iteration} for topic '{topic}'")
+        self.revisions.record(run_id, topic, iteration, draft, evaluation)
+
+    def get_revision_history(self, run_id: str) -> List[Revision]:
+        """Every draft/evaluation pair of a workflow run, in order."""
+        return self.revisions.history(run_id)
+
+    def save_checkpoint(self, checkpoint: Checkpoint) -> None:
+        logger.debug(
+            f"Checkpoint of run '{checkpoint.run_id}': {checkpoint.phase} "
+            f"(iteration {checkpoint.iteration})"
+        )
+        try:
+            self.checkpoints.save(checkpoint)
+        except Exception as e:
+            logger.error(f"Failed to save checkpoint of run '{checkpoint.run_id}': {e}")
+
+    def get_checkpoint(self, run_id: str) -> Optional[Checkpoint]:
+        """Latest checkpoint of a workflow run (or None)."""
+        return self.checkpoints.get(run_id)
+
+    def list_unfinished_runs(self, limit: int = 100) -> List[Checkpoint]:
+        """Checkpoints of the runs that stopped before publishing."""
+        return self.checkpoints.unfinished(limit)
 
     def save_final_publication(self, topic: str, publication: str) -> None:
         """Upsert the approved publication into *final_prompts* table."""
@@ -101,32 +205,14 @@ class Memory(AgentMemory):
             f"[Memory] session_state final_publications updated for topic: {topic}"
         )
 
+        self.duplicates.add(topic, publication)
+
         try:
-            logger.debug(
-                f"[Memory] Connecting to SQLite DB for final_prompts upsert (topic={topic})"
-            )
-            # Use raw SQLite connection (works regardless of SQLAlchemy presence)
-            # Determine DB file path from storage or default
-            db_path = "src/db/publication_generation.db"
-            logger.debug(f"[Memory] DB path set to {db_path}")
-
-            conn = sqlite3.connect(db_path)
-            logger.debug(f"[Memory] SQLite connection established at {db_path}")
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS final_prompts (
-                    topic TEXT PRIMARY KEY,
-                    final_prompt TEXT,
-                    timestamp TEXT
-                );
-                """
-            )
-            conn.execute(
-                """INSERT OR REPLACE INTO final_prompts (topic, final_prompt, timestamp)
-                   VALUES (?, ?, ?);""",
-                (topic, publication, datetime.utcnow().isoformat()),
-            )
-            conn.commit()
+            params = (topic, publication, datetime.utcnow().isoformat())
+            if self.durability == "batched":
+                self.db.write_behind.submit(UPSERT_FINAL_SQL, params)
+            else:
+                self.db.execute(UPSERT_FINAL_SQL, params)
             logger.debug(
                 f"[Memory] commit successful for save_final_publication topic: {topic}"
             )
@@ -150,38 +236,14 @@ class Memory(AgentMemory):
             logger.debug(
                 f"[Memory] Querying DB for final_publication for topic: {topic}"
             )
-            if hasattr(self.final_prompts_table, "select"):
-                row = (
-                    self.final_prompts_table.select()
-                    .where(self.final_prompts_table.c.topic == topic)
-                    .execute()
-                    .fetchone()
+            self.flush()
+            rows = self.db.query(SELECT_FINAL_SQL, (topic,))
+            if rows:
+                return Publication(
+                    topic=rows[0][0],
+                    final_publication=rows[0][1],
+                    timestamp=datetime.fromisoformat(rows[0][2]),
                 )
-                if row:
-                    logger.debug(
-                        f"[Memory] Retrieved final_publication from table for topic: {topic}"
-                    )
-                    return Publication(
-                        topic=row["topic"],
-                        final_publication=row["final_prompt"],
-                        timestamp=datetime.fromisoformat(row["timestamp"]),
-                    )
-            else:
-                logger.debug(
-                    f"[Memory] Using raw SQL to fetch final_publication for topic: {topic}"
-                )
-                sql = "SELECT topic, final_prompt, timestamp FROM final_prompts WHERE topic = ?;"
-                cur = self.storage.execute(sql, (topic,))
-                row = cur.fetchone()
-                if row:
-                    logger.debug(
-                        f"[Memory] Retrieved final_publication via raw SQL for topic: {topic}"
-                    )
-                    return Publication(
-                        topic=row[0],
-                        final_publication=row[1],
-                        timestamp=datetime.fromisoformat(row[2]),
-                    )
         except Exception as e:
             logger.error(f"Error fetching final publication for topic '{topic}': {e}")
         return None
@@ -193,35 +255,15 @@ class Memory(AgentMemory):
         )
         publications = []
         try:
-            if hasattr(self.final_prompts_table, "select"):
-                rows = (
-                    self.final_prompts_table.select()
-                    .order_by(self.final_prompts_table.c.timestamp.desc())
-                    .limit(limit)
-                    .offset(offset)
-                    .execute()
-                    .fetchall()
-                )
-                for r in rows:
-                    publications.append(
-                        Publication(
-                            topic=r["topic"],
-                            final_publication=r["final_prompt"],
-                            timestamp=datetime.fromisoformat(r["timestamp"]),
-                        )
-                    )
-            else:
-                sql = """SELECT topic, final_prompt, timestamp
-                         FROM final_prompts ORDER BY timestamp DESC LIMIT ? OFFSET ?"""
-                cur = self.storage.execute(sql, (limit, offset))
-                for row in cur.fetchall():
-                    publications.append(
-                        Publication(
-                            topic=row[0],
-                            final_publication=row[1],
-                            timestamp=datetime.fromisoformat(row[2]),
-                        )
+            self.flush()
+            for row in self.db.query(LIST_FINAL_SQL, (limit, offset)):
+                publications.append(
+                    Publication(
+                        topic=row[0],
+                        final_publication=row[1],
+                        timestamp=datetime.fromisoformat(row[2]),
                     )
+                )
         except Exception as e:
             logger.error(f"Error listing final publications: {e}")
         logger.debug(
@@ -229,27 +271,60 @@ class Memory(AgentMemory):
         )
         return publications
 
+    def find_duplicate_publication(
+        self, draft: str, threshold: Optional[float] = None
+    ) -> Optional[DuplicateMatch]:
+        """Already published content that *draft* nearly duplicates, if any."""
+        try:
+            return self.duplicates.check(draft, threshold=threshold)
+        except Exception as e:
+            logger.error(f"Duplicate check failed: {e}")
+            return None
+
+    def browse_final_publications(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> ArchivePage:
+        """Page through the archive newest first; pass ``next_cursor`` back in."""
+        self.flush()
+        return self.archive.browse(limit=limit, cursor=cursor, since=since, until=until)
+
+    def search_final_publications(
+        self,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> ArchivePage:
+        """Full-text search of the final publications, newest matches first."""
+        logger.debug(f"[Memory] search_final_publications called with query={query!r}")
+        self.flush()
+        return self.archive.search(
+            query, limit=limit, cursor=cursor, since=since, until=until
+        )
+
     def delete_final_publication(self, topic: str) -> bool:
         """Remove a publication from permanent storage. Returns *True* if deleted.*"""
         logger.debug(f"[Memory] delete_final_publication called for topic: {topic}")
         removed = False
         try:
-            if hasattr(self.final_prompts_table, "delete"):
-                result = (
-                    self.final_prompts_table.delete()
-                    .where(self.final_prompts_table.c.topic == topic)
-                    .execute()
-                )
-                removed = result.rowcount > 0 if hasattr(result, "rowcount") else True
-            else:
-                sql = "DELETE FROM final_prompts WHERE topic = ?;"
-                cur = self.storage.execute(sql, (topic,))
-                removed = cur.rowcount > 0 if hasattr(cur, "rowcount") else True
+            self.flush()
+            removed = self.db.execute(DELETE_FINAL_SQL, (topic,)).rowcount > 0
         except Exception as e:
             logger.error(f"Error deleting final publication '{topic}': {e}")
+        self.duplicates.remove(topic)
         # Remove from in-memory cache
         pop_result = self.session_state.get("final_publications", {}).pop(topic, None)
         logger.debug(
             f"[Memory] session_state.pop returned {pop_result!r} for topic: {topic}"
         )
         return removed
+
+    def flush(self) -> None:
+        """Commit the writes queued by the write-behind queue (if any)."""
+        if self.durability == "batched":
+            self.db.write_behind.flush()
@@ -0,0 +1,291 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from statistics import median
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from agno.utils.log import logger
+
+# Name of the tool agno registers for ``search_knowledge=True``
+KNOWLEDGE_SEARCH_TOOL = "search_knowledge_base"
+
+# USD per 1M (input, cached input, output) tokens, used to estimate the cost
+# of a phase
+MODEL_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "o4-mini": (1.10, 0.275, 4.40),
+    "o3": (2.00, 0.50, 8.00),
+}
+
+
+def estimate_cost(
+    model_id: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0
+) -> float:
+    """Estimated USD cost of a model call (0 for models without a price)."""
+    input_price, cached_price, output_price = MODEL_PRICES.get(
+        model_id, (0.0, 0.0, 0.0)
+    )
+    return (
+        (input_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + output_tokens * output_price
+    ) / 1_000_000
+
+
+@dataclass
+class PhaseEvent:
+    """Measurements for one phase (or revision iteration) of a workflow run"""
+
+    run_id: Optional[str]
+    session_id: Optional[str]
+    topic: str
+    phase: str
+    iteration: int = 0
+    label: str = ""
+    agent: str = ""
+    model_id: str = ""
+    # "hit", "miss" or None when the phase is not cached / caching is off
+    cache: Optional[str] = None
+    duration: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    # Input tokens served from the provider's prompt cache
+    cached_tokens: int = 0
+    # Estimated USD, see MODEL_PRICES
+    cost: float = 0.0
+    knowledge_searches: int = 0
+    knowledge_search_time: float = 0.0
+    # Calls per tool name (FileSystemTools etc.), knowledge searches excluded
+    tool_calls: Dict[str, int] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+    # Retries of transient provider errors and seconds queued for a
+    # rate-limit slot (see utils.scheduler)
+    retries: int = 0
+    queue_time: float = 0.0
+    # Why the revision loop ended ("loop" phase only), e.g. "approved"
+    termination: Optional[str] = None
+    # Writer prompt tokens of a revision, as sent and as the full draft plus
+    # the full evaluation would have been ("compaction" phase only)
+    prompt_tokens: int = 0
+    uncompacted_prompt_tokens: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _total(value: Any) -> int:
+    """agno aggregates run metrics as one list entry per model call."""
+    if isinstance(value, (list, tuple)):
+        return int(sum(v for v in value if isinstance(v, (int, float))))
+    return int(value or 0)
+
+
+def _tool_time(tool: Dict[str, Any]) -> float:
+    metrics = tool.get("metrics")
+    elapsed = getattr(metrics, "time", None)
+    if elapsed is None and isinstance(metrics, dict):
+        elapsed = metrics.get("time")
+    return float(elapsed or 0.0)
+
+
+def apply_run_response(event: PhaseEvent, response: Any) -> PhaseEvent:
+    """Fill token and tool-call fields of *event* from an agent RunResponse."""
+    if response is None:
+        return event
+    metrics = getattr(response, "metrics", None) or {}
+    event.input_tokens = _total(metrics.get("input_tokens"))
+    event.output_tokens = _total(metrics.get("output_tokens"))
+    event.cached_tokens = _total(metrics.get("cached_tokens"))
+    event.cost = estimate_cost(
+        event.model_id, event.input_tokens, event.output_tokens, event.cached_tokens
+    )
+    for tool in getattr(response, "tools", None) or []:
+        name = tool.get("tool_name") or "unknown"
+        if name == KNOWLEDGE_SEARCH_TOOL:
+            event.knowledge_searches += 1
+            event.knowledge_search_time += _tool_time(tool)
+        else:
+            event.tool_calls[name] = event.tool_calls.get(name, 0) + 1
+    return event
+
+
+class MetricsRegistry:
+    """In-process store of ``PhaseEvent``s, optionally mirrored to a JSONL file.
+
+    Every recorded event is appended to ``jsonl_path`` (one JSON object per
+    line) when it is set, so runs can be analysed offline.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None, max_events: int = 10000):
+        self.jsonl_path = jsonl_path
+        self.max_events = max_events
+        self._events: List[PhaseEvent] = []
+        self._lock = threading.Lock()
+
+    def record(self, event: PhaseEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+            if len(self._events) > self.max_events:
+                del self._events[: len(self._events) - self.max_events]
+            if self.jsonl_path:
+                try:
+                    with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+                except OSError as e:
+                    logger.warning(f"[Metrics] Could not write {self.jsonl_path}: {e}")
+
+    def events(
+        self, run_id: Optional[str] = None, session_id: Optional[str] = None
+    ) -> List[PhaseEvent]:
+        with self._lock:
+            return [
+                e
+                for e in self._events
+                if (run_id is None or e.run_id == run_id)
+                and (session_id is None or e.session_id == session_id)
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+
+def summarize(events: Iterable[PhaseEvent]) -> Dict[str, Dict[str, Any]]:
+    """Aggregate events per phase: calls, cache hits, time, tokens and cost.
+
+    The "loop" phase also counts why the revision loops ended.
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    durations: Dict[str, List[float]] = {}
+    for e in events:
+        row = summary.setdefault(
+            e.phase,
+            {
+                "calls": 0,
+                "cache_hits": 0,
+                "errors": 0,
+                "total_time": 0.0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cached_tokens": 0,
+                "cost": 0.0,
+                "knowledge_searches": 0,
+                "knowledge_search_time": 0.0,
+                "tool_calls": 0,
+                "retries": 0,
+                "queue_time": 0.0,
+            },
+        )
+        if e.cache == "hit":
+            row["cache_hits"] += 1
+        else:
+            row["calls"] += 1
+            durations.setdefault(e.phase, []).append(e.duration)
+        row["errors"] += e.status != "ok"
+        row["total_time"] += e.duration
+        row["input_tokens"] += e.input_tokens
+        row["output_tokens"] += e.output_tokens
+        row["cached_tokens"] += e.cached_tokens
+        row["cost"] += e.cost
+        row["knowledge_searches"] += e.knowledge_searches
+        row["knowledge_search_time"] += e.knowledge_search_time
+        row["tool_calls"] += sum(e.tool_calls.values())
+        row["retries"] += e.retries
+        row["queue_time"] += e.queue_time
+        if e.termination:
+            terminations = row.setdefault("terminations", {})
+            terminations[e.termination] = terminations.get(e.termination, 0) + 1
+    for phase, values in durations.items():
+        summary[phase]["p50"] = median(values)
+        summary[phase]["max"] = max(values)
+    return summary
+
+
+def prompt_cache_stats(events: Iterable[PhaseEvent]) -> Dict[str, Dict[str, Any]]:
+    """Input tokens served from the prompt cache, per agent."""
+    stats: Dict[str, Dict[str, Any]] = {}
+    for e in events:
+        if e.cache == "hit" or not e.input_tokens:
+            continue
+        row = stats.setdefault(
+            e.agent, {"calls": 0, "input_tokens": 0, "cached_tokens": 0}
+        )
+        row["calls"] += 1
+        row["input_tokens"] += e.input_tokens
+        row["cached_tokens"] += e.cached_tokens
+    for row in stats.values():
+        row["cached_ratio"] = row["cached_tokens"] / row["input_tokens"]
+    return stats
+
+
+def compaction_stats(events: Iterable[PhaseEvent]) -> Dict[int, Dict[str, Any]]:
+    """Revision prompt tokens before and after compaction, per iteration."""
+    stats: Dict[int, Dict[str, Any]] = {}
+    for e in events:
+        if e.phase != "compaction":
+            continue
+        row = stats.setdefault(e.iteration, {"before": 0, "after": 0})
+        row["before"] += e.uncompacted_prompt_tokens
+        row["after"] += e.prompt_tokens
+    for row in stats.values():
+        row["saved_ratio"] = 1 - row["after"] / row["before"] if row["before"] else 0.0
+    return stats
+
+
+def summary_table(events: Iterable[PhaseEvent], title: str = "Phase metrics"):
+    """Render :func:`summarize` as a rich table."""
+    from rich.table import Table
+
+    table = Table(title=title)
+    for column in (
+        "Phase",
+        "Calls",
+        "Cache hits",
+        "Errors",
+        "Total (s)",
+        "p50 (s)",
+        "Max (s)",
+        "Tokens in/out",
+        "Cached in",
+        "Cost ($)",
+        "KB searches",
+        "Tool calls",
+        "Retries (queued s)",
+        "Stopped by",
+    ):
+        table.add_column(column)
+    for phase, row in summarize(events).items():
+        table.add_row(
+            phase,
+            str(row["calls"]),
+            str(row["cache_hits"]),
+            str(row["errors"]),
+            f"{row['total_time']:.2f}",
+            f"{row.get('p50', 0.0):.2f}",
+            f"{row.get('max', 0.0):.2f}",
+            f"{row['input_tokens']}/{row['output_tokens']}",
+            f"{row['cached_tokens'] / row['input_tokens']:.0%}"
+            if row["input_tokens"]
+            else "-",
+            f"{row['cost']:.4f}",
+            f"{row['knowledge_searches']} ({row['knowledge_search_time']:.2f}s)",
+            str(row["tool_calls"]),
+            f"{row['retries']} ({row['queue_time']:.2f}s)",
+            ", ".join(
+                f"{reason} ×{count}"
+                for reason, count in row.get("terminations", {}).items()
+            ),
+        )
+    return table
+
+
+# Process-wide registry; set WORKFLOW_METRICS_FILE to also write JSONL events
+metrics = MetricsRegistry(jsonl_path=os.getenv("WORKFLOW_METRICS_FILE"))
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import Any
+
+from agno.models.message import Message
+from agno.models.openai import OpenAIResponses as _OpenAIResponses
+
+
+def _get(obj: Any, name: str) -> Any:
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+@dataclass
+class OpenAIResponses(_OpenAIResponses):
+    """agno's ``OpenAIResponses`` that also reports cached prompt tokens.
+
+    agno reads ``cached_tokens`` from ``prompt_tokens_details`` (Chat
+    Completions usage); the Responses API reports them in
+    ``input_tokens_details``, so without this they are always 0.
+    """
+
+    def _add_usage_metrics_to_assistant_message(
+        self, assistant_message: Message, response_usage: Any
+    ) -> None:
+        super()._add_usage_metrics_to_assistant_message(
+            assistant_message, response_usage
+        )
+        details = _get(response_usage, "input_tokens_details")
+        cached = _get(details, "cached_tokens") if details is not None else None
+        if cached:
+            assistant_message.metrics.cached_tokens = cached
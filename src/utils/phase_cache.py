@@ -0,0 +1,194 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from agno.utils.log import logger
+
+from .database import Database, resolve_durability
+
+
+class PhaseCache:
+    """Durable, content-addressed cache for workflow phase outputs.
+
+    Entries are keyed by a hash of everything that determines a phase's output
+    (phase, topic, prompt template content, model id and the phase inputs), so
+    a cached value is only reused when none of those changed. Entries expire
+    after ``ttl_seconds`` and the least recently used ones are evicted once the
+    table grows beyond ``max_entries``. Storage goes through the shared
+    ``Database`` for ``db_file`` (the workflow DB by default).
+
+    With ``durability="batched"`` writes (new entries, access times and
+    eviction) go through the database's write-behind queue. Queued entries are
+    served from the queue's overlay, so readers in this process see a put
+    before it is committed.
+    """
+
+    def __init__(
+        self,
+        db_file: Optional[str] = None,
+        table_name: str = "phase_cache",
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        max_entries: Optional[int] = 5000,
+        durability: Optional[str] = None,
+    ):
+        self.db = Database.shared(db_file)
+        self.durability = resolve_durability(durability)
+        self.db_file = self.db.db_file
+        self.table_name = table_name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.by_phase: Dict[str, Dict[str, int]] = {}
+        # Guards the counters; SQLite access is per-thread (see Database)
+        self._lock = threading.Lock()
+        with self.db.transaction() as conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    key TEXT PRIMARY KEY,
+                    phase TEXT,
+                    value TEXT,
+                    created_at REAL,
+                    last_access REAL
+                );
+                """
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_last_access "
+                f"ON {self.table_name} (last_access);"
+            )
+
+    @staticmethod
+    def make_key(
+        phase: str,
+        topic: str,
+        template: str = "",
+        model_id: str = "",
+        **inputs: Any,
+    ) -> str:
+        """Build the cache key for a phase from all of its inputs."""
+        payload = {
+            "phase": phase,
+            "topic": topic,
+            "template": hashlib.sha256(template.encode("utf-8")).hexdigest(),
+            "model_id": model_id,
+            "inputs": inputs,
+        }
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _count(self, phase: str, outcome: str) -> None:
+        with self._lock:
+            counters = self.by_phase.setdefault(phase, {"hits": 0, "misses": 0})
+            counters[outcome] += 1
+            if outcome == "hits":
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def batched(self) -> bool:
+        return self.durability == "batched"
+
+    def _select(self, key: str):
+        rows = self.db.query(
+            f"SELECT value, created_at FROM {self.table_name} WHERE key = ?;", (key,)
+        )
+        return rows[0] if rows else None
+
+    def get(self, key: str, phase: str = "") -> Optional[str]:
+        """Return the cached value for *key*, or None on a miss or expiry."""
+        now = time.time()
+        row = (
+            self.db.write_behind.pending((self.table_name, key))
+            if self.batched
+            else None
+        )
+        if row is not None:
+            self._count(phase, "hits")
+            return row[0]
+        row = self._select(key)
+        if row is not None and self._expired(row[1], now):
+            self.db.execute(f"DELETE FROM {self.table_name} WHERE key = ?;", (key,))
+            with self._lock:
+                self.evictions += 1
+            row = None
+        if row is not None:
+            self._write(
+                f"UPDATE {self.table_name} SET last_access = ? WHERE key = ?;",
+                (now, key),
+            )
+        if row is None:
+            self._count(phase, "misses")
+            return None
+        self._count(phase, "hits")
+        logger.debug(f"[PhaseCache] hit for phase '{phase}' ({key[:12]})")
+        return row[0]
+
+    def put(self, key: str, value: str, phase: str = "") -> None:
+        """Store *value* under *key* and apply TTL/size eviction."""
+        now = time.time()
+        sql = f"""INSERT OR REPLACE INTO {self.table_name}
+                    (key, phase, value, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?);"""
+        params = (key, phase, value, now, now)
+        if self.batched:
+            queue = self.db.write_behind
+            queue.submit(sql, params, overlay=((self.table_name, key), (value, now)))
+            # Once per batch, not once per put
+            queue.defer(
+                f"evict:{self.table_name}", lambda conn: self._evict(conn, time.time())
+            )
+            return
+        with self.db.transaction() as conn:
+            conn.execute(sql, params)
+            self._evict(conn, now)
+
+    def _write(self, sql: str, params) -> None:
+        if self.batched:
+            self.db.write_behind.submit(sql, params)
+        else:
+            self.db.execute(sql, params)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and created_at + self.ttl_seconds < now
+
+    def _evict(self, conn, now: float) -> None:
+        evicted = 0
+        if self.ttl_seconds is not None:
+            cur = conn.execute(
+                f"DELETE FROM {self.table_name} WHERE created_at < ?;",
+                (now - self.ttl_seconds,),
+            )
+            evicted += max(cur.rowcount, 0)
+        if self.max_entries is not None:
+            cur = conn.execute(
+                f"""DELETE FROM {self.table_name} WHERE key IN (
+                        SELECT key FROM {self.table_name}
+                        ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    );""",
+                (self.max_entries,),
+            )
+            evicted += max(cur.rowcount, 0)
+        with self._lock:
+            self.evictions += evicted
+
+    def clear(self) -> None:
+        if self.batched:
+            self.db.write_behind.flush()
+        self.db.execute(f"DELETE FROM {self.table_name};")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process, overall and per phase."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "by_phase": {k: dict(v) for k, v in self.by_phase.items()},
+        }
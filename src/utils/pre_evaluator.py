@@ -0,0 +1,303 @@
+import json
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .dedup import normalize
+
+# Hard gates of src/docs/formatoPublicaciones.md (§3, §6) and the evaluator
+# prompt that can be checked without a model
+MAX_POST_CHARS = 280  # X limit for a single post
+MAX_THREAD_POST_CHARS = 250  # "Hilo: 3-7 tweets de ≤ 250 car. c/u"
+THREAD_POSTS = (3, 7)
+MAX_HASHTAGS = 2
+# Engagement bait (normalized: lowercase, no accents)
+BANNED_PHRASES = (
+    "dale like",
+    "dale rt",
+    "dale retweet",
+    "retuitea si",
+    "rt si",
+    "comparte si",
+    "sigueme para mas",
+    "follow back",
+    "link en bio",
+    "haz click aqui",
+)
+
+_FRONT_MATTER = re.compile(r"\A---\n.*?\n---\n", re.DOTALL)
+_FENCE = re.compile(r"\A```(?:json)?\s*\n(.*)\n```\Z", re.DOTALL)
+_RULE_LINE = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$", re.MULTILINE)
+# Thread numbering at the start of a line: "1/", "2/7", "1️⃣", "Tweet 3:"
+_THREAD_MARKER = re.compile(
+    r"^\s*(?:#+\s*)?(?:\d+\s*/\s*\d*|\d️?⃣|(?:tweet|post)\s+\d+\s*:)",
+    re.MULTILINE | re.IGNORECASE,
+)
+_TITLE_LINE = re.compile(r"^\s*#{1,2}\s.*$", re.MULTILINE)
+_HEADING_MARK = re.compile(r"^\s*#{3,6}\s+", re.MULTILINE)
+_EMPHASIS = re.compile(r"\*\*|__")
+_HASHTAG = re.compile(r"(?<![\w&])#\w+")
+
+
+def _clean(post: str) -> str:
+    """Post text as it would be published: no titles or markdown markup."""
+    post = _TITLE_LINE.sub("", post)
+    post = _HEADING_MARK.sub("", post)
+    post = _EMPHASIS.sub("", post)
+    return re.sub(r"\n{3,}", "\n\n", post).strip()
+
+
+class PostSpan(NamedTuple):
+    """Where a post sits in its draft: ``draft[start:end]`` is its source"""
+
+    start: int
+    end: int
+    # The post as published (see _clean)
+    text: str
+    # Key holding the text when the post is a JSON object, "" for a JSON string
+    json_key: Optional[str] = None
+
+
+_JSON_TEXT_KEYS = ("text", "content", "tweet", "post")
+
+
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _json_spans(draft: str, start: int, end: int) -> Optional[List[PostSpan]]:
+    """Spans of the items of a JSON array in ``draft[start:end]``, if it is one."""
+    try:
+        items = json.loads(draft[start:end])
+    except ValueError:
+        return None
+    if not isinstance(items, list) or not items:
+        return None
+    decoder = json.JSONDecoder()
+    spans = []
+    i = draft.index("[", start) + 1
+    for item in items:
+        i, _ = _strip_span(draft, i, end)
+        _, item_end = decoder.raw_decode(draft, i)
+        key = ""
+        if isinstance(item, dict):
+            key = next((k for k in _JSON_TEXT_KEYS if k in item), "text")
+            item = item.get(key, "")
+        spans.append(PostSpan(i, item_end, _clean(str(item)), key))
+        i, _ = _strip_span(draft, item_end, end)
+        if draft.startswith(",", i):
+            i += 1
+    return spans
+
+
+def locate_posts(draft: str) -> List[PostSpan]:
+    """The posts of a writer draft with their position in it.
+
+    Understands a JSON array of posts (optionally in a ```json fence), posts
+    separated by markdown rules (``---``) and thread numbering ("1/", "1️⃣").
+    Anything else is a single post.
+    """
+    start, end = _strip_span(draft, 0, len(draft))
+    front = _FRONT_MATTER.match(draft[start:end] + "\n")
+    if front:
+        start, end = _strip_span(draft, start + min(front.end(), end - start), end)
+    text = draft[start:end]
+    fenced = _FENCE.match(text)
+    if fenced:
+        spans = _json_spans(draft, start + fenced.start(1), start + fenced.end(1))
+    else:
+        spans = _json_spans(draft, start, end)
+    if spans is not None:
+        return [span for span in spans if span.text]
+
+    bounds = [0]
+    for rule in _RULE_LINE.finditer(text):
+        bounds.extend([rule.start(), rule.end()])
+    bounds.append(len(text))
+    pieces = list(zip(bounds[::2], bounds[1::2]))
+    if len([1 for a, b in pieces if _clean(text[a:b])]) < 2:
+        starts = [m.start() for m in _THREAD_MARKER.finditer(text)]
+        if len(starts) >= 2:
+            bounds = [0] + starts + [len(text)]
+            pieces = list(zip(bounds, bounds[1:]))
+    spans = []
+    for a, b in pieces:
+        a, b = _strip_span(draft, start + a, start + b)
+        post = _clean(draft[a:b])
+        if post:
+            spans.append(PostSpan(a, b, post))
+    return spans
+
+
+def split_posts(draft: str) -> List[str]:
+    """Split a writer draft into the individual posts it contains."""
+    return [span.text for span in locate_posts(draft)]
+
+
+def replace_posts(draft: str, posts: Dict[int, str]) -> str:
+    """*draft* with the given posts (by 1-based number) replaced.
+
+    Only the replaced posts change: everything else (front matter, titles,
+    markup, separators and the other posts) is kept byte for byte.
+    """
+    spans = locate_posts(draft)
+    for number in sorted(posts, reverse=True):
+        if not 1 <= number <= len(spans):
+            raise ValueError(f"The draft has no post {number} ({len(spans)} posts)")
+        span = spans[number - 1]
+        text = posts[number].strip()
+        if span.json_key is not None:
+            item = json.loads(draft[span.start : span.end])
+            if isinstance(item, dict):
+                item = {**item, span.json_key: text}
+            else:
+                item = text
+            text = json.dumps(item, ensure_ascii=False)
+        draft = draft[: span.start] + text + draft[span.end :]
+    return draft
+
+
+class RuleViolation(BaseModel):
+    """A hard rule broken by a draft"""
+
+    rule: str = Field(..., description="Rule id, e.g. 'char_limit'")
+    message: str = Field(..., description="What is wrong and how to fix it")
+    post: Optional[int] = Field(None, description="1-based post number, if any")
+
+
+class PreEvaluation(BaseModel):
+    """Result of the local rule checks on a draft"""
+
+    posts: List[str] = Field(default_factory=list)
+    violations: List[RuleViolation] = Field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+    def feedback(self) -> str:
+        """Violations in the evaluator's output format, for the writer."""
+        lines = [
+            "**Decision:** Revise (automatic pre-evaluation: hard rules failed)",
+            "",
+            "**Hard-Gate Violations:**",
+            "",
+        ]
+        for violation in self.violations:
+            where = f"[post {violation.post}] " if violation.post else ""
+            lines.append(f"- {where}{violation.rule}: {violation.message}")
+        return "\n".join(lines)
+
+
+Rule = Callable[[List[str], int], List[RuleViolation]]
+
+
+def check_post_count(posts: List[str], num_posts: int) -> List[RuleViolation]:
+    low, high = THREAD_POSTS
+    if num_posts > 1 and len(posts) != num_posts:
+        expected = f"exactly {num_posts} posts"
+    elif num_posts <= 1 and len(posts) != 1 and not low <= len(posts) <= high:
+        expected = f"a single post or a thread of {low}-{high} posts"
+    else:
+        return []
+    return [
+        RuleViolation(
+            rule="post_count",
+            message=f"found {len(posts)} posts, expected {expected}",
+        )
+    ]
+
+
+def check_char_limit(posts: List[str], num_posts: int) -> List[RuleViolation]:
+    thread = num_posts <= 1 and len(posts) > 1
+    limit = MAX_THREAD_POST_CHARS if thread else MAX_POST_CHARS
+    return [
+        RuleViolation(
+            rule="char_limit",
+            message=f"{len(post)} characters, limit is {limit}; shorten it",
+            post=number,
+        )
+        for number, post in enumerate(posts, 1)
+        if len(post) > limit
+    ]
+
+
+def check_hashtags(posts: List[str], num_posts: int) -> List[RuleViolation]:
+    violations = []
+    counts = [len(_HASHTAG.findall(post)) for post in posts]
+    for number, count in enumerate(counts, 1):
+        if count > MAX_HASHTAGS:
+            violations.append(
+                RuleViolation(
+                    rule="hashtags",
+                    message=f"{count} hashtags, use at most {MAX_HASHTAGS} at the end",
+                    post=number,
+                )
+            )
+    if num_posts <= 1 and len(posts) > 1:
+        # A thread needs its hashtags somewhere, usually in the last post
+        if not any(counts):
+            violations.append(
+                RuleViolation(
+                    rule="hashtags",
+                    message="the thread has no hashtags; add 1-2 at the end",
+                )
+            )
+    else:
+        for number, count in enumerate(counts, 1):
+            if not count:
+                violations.append(
+                    RuleViolation(
+                        rule="hashtags",
+                        message="missing hashtags; add 1-2 at the end",
+                        post=number,
+                    )
+                )
+    return violations
+
+
+def check_banned_phrases(posts: List[str], num_posts: int) -> List[RuleViolation]:
+    violations = []
+    for number, post in enumerate(posts, 1):
+        words = f" {' '.join(normalize(post))} "
+        for phrase in BANNED_PHRASES:
+            if f" {phrase} " in words:
+                violations.append(
+                    RuleViolation(
+                        rule="banned_phrase",
+                        message=f"remove the engagement bait '{phrase}'",
+                        post=number,
+                    )
+                )
+    return violations
+
+
+DEFAULT_RULES: List[Rule] = [
+    check_post_count,
+    check_char_limit,
+    check_hashtags,
+    check_banned_phrases,
+]
+
+
+class PreEvaluator:
+    """Deterministic checks of the hard rules, run before the LLM evaluator.
+
+    Drafts that break a rule go straight back to the writer with the list of
+    violations; only drafts that pass every rule cost an evaluator call.
+    """
+
+    def __init__(self, rules: Optional[List[Rule]] = None):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+
+    def evaluate(self, draft: str, num_posts: int = 1) -> PreEvaluation:
+        posts = split_posts(draft)
+        violations = [
+            violation for rule in self.rules for violation in rule(posts, num_posts)
+        ]
+        return PreEvaluation(posts=posts, violations=violations)
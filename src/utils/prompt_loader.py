@@ -1,5 +1,125 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 from string import Template
+from typing import Dict, Optional, Tuple
+
+# Prompt templates of the agents (``<name>.md``)
+PROMPTS_DIR = Path(__file__).parent.parent / "agents" / "prompts"
+
+
+@dataclass
+class _CompiledTemplate:
+    """A template file read and compiled once, with its rendered outputs"""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    source: str
+    template: Template
+    checked: float = 0.0
+    # Rendered text per argument set, least recently used first
+    rendered: "OrderedDict[Tuple, str]" = field(default_factory=OrderedDict)
+
+
+class TemplateRegistry:
+    """Prompt templates loaded and compiled once per process.
+
+    A template file is read the first time it is used (or by :meth:`preload`)
+    and re-read only when its mtime or size changes; the file is ``stat``-ed
+    at most once every ``check_interval`` seconds. Rendered output is
+    memoized per set of arguments.
+    """
+
+    def __init__(
+        self,
+        prompts_dir: Path = PROMPTS_DIR,
+        check_interval: float = 1.0,
+        max_rendered: int = 64,
+    ):
+        self.prompts_dir = Path(prompts_dir)
+        self.check_interval = check_interval
+        self.max_rendered = max_rendered
+        self._templates: Dict[str, _CompiledTemplate] = {}
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "renders": 0, "render_hits": 0}
+
+    def preload(self) -> int:
+        """Load and compile every template of ``prompts_dir``."""
+        names = [path.stem for path in sorted(self.prompts_dir.glob("*.md"))]
+        for name in names:
+            self._get(name)
+        return len(names)
+
+    def _compile(self, path: Path, stat: os.stat_result) -> _CompiledTemplate:
+        source = path.read_text(encoding="utf-8")
+        self._stats["loads"] += 1
+        return _CompiledTemplate(
+            path=path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            source=source,
+            template=Template(source),
+            checked=time.monotonic(),
+        )
+
+    def _get(self, name: str) -> _CompiledTemplate:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._templates.get(name)
+            if entry is not None and now - entry.checked < self.check_interval:
+                return entry
+            path = entry.path if entry else self.prompts_dir / f"{name}.md"
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self._templates.pop(name, None)
+                raise FileNotFoundError(f"Prompt template not found: {path}") from None
+            if (
+                entry is None
+                or stat.st_mtime_ns != entry.mtime_ns
+                or stat.st_size != entry.size
+            ):
+                entry = self._templates[name] = self._compile(path, stat)
+            entry.checked = now
+            return entry
+
+    def source(self, name: str) -> str:
+        """Raw, uninterpolated content of a template."""
+        return self._get(name).source
+
+    def render(self, name: str, **kwargs) -> str:
+        """Template *name* with ``kwargs`` substituted (``safe_substitute``)."""
+        entry = self._get(name)
+        key = tuple(sorted((k, str(v)) for k, v in kwargs.items()))
+        with self._lock:
+            self._stats["renders"] += 1
+            text = entry.rendered.get(key)
+            if text is not None:
+                self._stats["render_hits"] += 1
+                entry.rendered.move_to_end(key)
+                return text
+        text = entry.template.safe_substitute(**kwargs)
+        with self._lock:
+            entry.rendered[key] = text
+            if len(entry.rendered) > self.max_rendered:
+                entry.rendered.popitem(last=False)
+        return text
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Forget one template (or all): the next use reads the file again."""
+        with self._lock:
+            if name is None:
+                self._templates.clear()
+            else:
+                self._templates.pop(name, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, templates=len(self._templates))
 
 
 class PromptLoader:
@@ -7,14 +127,15 @@ class PromptLoader:
     Utility for loading and interpolating prompt templates from the agents/prompts directory.
     """
 
+    # Shared by every agent and workflow of the process
+    registry = TemplateRegistry()
+
+    @staticmethod
+    def source(template_name: str) -> str:
+        """Return the raw, uninterpolated content of a template."""
+        return PromptLoader.registry.source(template_name)
+
     @staticmethod
     def load(template_name: str, **kwargs) -> str:
         """Load a text template by name and substitute provided variables."""
-        # Determine the prompts directory relative to this file
-        base = Path(__file__).parent
-        prompts_dir = base.parent / "agents" / "prompts"
-        template_path = prompts_dir / f"{template_name}.md"
-        if not template_path.exists():
-            raise FileNotFoundError(f"Prompt template not found: {template_path}")
-        content = template_path.read_text(encoding="utf-8")
-        return Template(content).safe_substitute(**kwargs)
+        return PromptLoader.registry.render(template_name, **kwargs)
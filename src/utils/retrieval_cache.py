@@ -0,0 +1,145 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from agno.embedder.base import Embedder
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+@dataclass
+class CachedEmbedder(Embedder):
+    """Embedder wrapper that never embeds the same text twice.
+
+    Keeps an LRU of ``max_entries`` texts; the wrapped embedder is only called
+    on a miss. Embeddings depend only on the text and the embedding model, so
+    the cache does not need to be invalidated when the index changes.
+    """
+
+    embedder: Optional[Embedder] = None
+    max_entries: int = 2048
+    hits: int = 0
+    misses: int = 0
+    _cache: "OrderedDict[str, Tuple[List[float], Optional[Dict]]]" = field(
+        default_factory=OrderedDict, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        if self.embedder is None:
+            raise ValueError("CachedEmbedder needs an embedder to wrap")
+        self.dimensions = self.embedder.dimensions
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                # Cached embeddings cost nothing: report no usage
+                return cached[0], None
+            self.misses += 1
+        embedding, usage = self.embedder.get_embedding_and_usage(text)
+        if embedding:
+            with self._lock:
+                self._cache[text] = (embedding, usage)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return embedding, usage
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": _hit_rate(self.hits, self.misses),
+            "size": len(self._cache),
+        }
+
+
+class RetrievalCache:
+    """LRU/TTL cache of knowledge search results shared by all agents.
+
+    Entries are keyed on the normalized query, the number of documents and the
+    filters. :meth:`invalidate` drops everything and must be called whenever
+    the underlying index changes. Hits and misses are tracked per agent.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: Optional[float] = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.invalidations = 0
+        self.by_agent: Dict[str, Dict[str, int]] = {}
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Lowercase, collapse whitespace and strip surrounding punctuation."""
+        query = re.sub(r"\s+", " ", query.lower()).strip()
+        return query.strip(" .,;:!?¿¡\"'")
+
+    def key(
+        self,
+        query: str,
+        num_documents: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        return json.dumps(
+            [self.normalize(query), num_documents, filters],
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+
+    def _count(self, agent_name: str, outcome: str) -> None:
+        counters = self.by_agent.setdefault(agent_name, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+    def get(self, key: str, agent_name: str = "") -> Optional[List[Dict]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None:
+                if entry[0] + self.ttl_seconds < now:
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                self._count(agent_name, "misses")
+                return None
+            self._entries.move_to_end(key)
+            self._count(agent_name, "hits")
+            return [dict(doc) for doc in entry[1]]
+
+    def put(self, key: str, documents: List[Dict]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), [dict(doc) for doc in documents])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every cached result (the index changed)."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        by_agent = {
+            name: {**counters, "hit_rate": _hit_rate(**counters)}
+            for name, counters in self.by_agent.items()
+        }
+        return {
+            "size": len(self._entries),
+            "invalidations": self.invalidations,
+            "by_agent": by_agent,
+        }
@@ -0,0 +1,156 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .database import Database, resolve_durability
+from .diffs import apply_delta, make_delta
+
+UPSERT_REVISION_SQL = """INSERT OR REPLACE INTO revision_history
+    (run_id, topic, iteration, draft_kind, draft, draft_size, evaluation, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?);"""
+SELECT_REVISIONS_SQL = """SELECT topic, iteration, draft_kind, draft, evaluation, created_at
+    FROM revision_history
+    WHERE run_id = ? AND iteration <= ? AND iteration >= COALESCE((
+        SELECT MAX(iteration) FROM revision_history
+        WHERE run_id = ? AND iteration <= ? AND draft_kind = 'snapshot'
+    ), 0)
+    ORDER BY iteration;"""
+SELECT_RUNS_SQL = """SELECT run_id, MIN(created_at) FROM revision_history
+    WHERE topic = ? GROUP BY run_id ORDER BY 2;"""
+STATS_SQL = """SELECT COUNT(*), SUM(draft_kind = 'snapshot'),
+    COALESCE(SUM(draft_size), 0), COALESCE(SUM(LENGTH(draft)), 0)
+    FROM revision_history WHERE (? IS NULL OR run_id = ?);"""
+
+
+class Revision(BaseModel):
+    """A draft of the revision loop together with the evaluation it received"""
+
+    run_id: str = Field(..., description="Workflow run the revision belongs to")
+    topic: str = Field(..., description="The original topic for the publication")
+    iteration: int = Field(..., description="Revision loop iteration (0 = draft)")
+    draft: str = Field(..., description="Full text of the draft")
+    evaluation: Optional[str] = Field(None, description="Evaluator feedback")
+    created_at: datetime = Field(..., description="When the revision was stored")
+
+
+class RevisionHistory:
+    """Every draft/evaluation pair of the revision loop, per run and iteration.
+
+    Drafts are stored as difflib deltas against the previous iteration, with
+    a full snapshot at iteration 0, every ``snapshot_every`` iterations and
+    whenever a delta would not be smaller than the draft. Rebuilding any
+    revision applies at most ``snapshot_every - 1`` deltas to the nearest
+    snapshot, so storage grows with the size of the edits rather than with
+    full copies of every draft.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        durability: Optional[str] = None,
+        snapshot_every: int = 5,
+    ):
+        self.db = db
+        self.durability = resolve_durability(durability)
+        self.snapshot_every = snapshot_every
+        # run_id -> (iteration, draft, deltas since the last snapshot)
+        self._last: Dict[str, Tuple[int, str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        run_id: str,
+        topic: str,
+        iteration: int,
+        draft: str,
+        evaluation: Optional[str] = None,
+    ) -> str:
+        """Store a revision; returns how the draft was stored (snapshot/delta)."""
+        with self._lock:
+            last = self._last.get(run_id)
+            kind, stored, since_snapshot = "snapshot", draft, 0
+            if (
+                last is not None
+                and last[0] == iteration - 1
+                and last[2] + 1 < self.snapshot_every
+            ):
+                delta = make_delta(last[1], draft)
+                if len(delta) < len(draft):
+                    kind, stored, since_snapshot = "delta", delta, last[2] + 1
+            self._last[run_id] = (iteration, draft, since_snapshot)
+        params = (
+            run_id,
+            topic,
+            iteration,
+            kind,
+            stored,
+            len(draft),
+            evaluation,
+            datetime.utcnow().isoformat(),
+        )
+        if self.durability == "batched":
+            self.db.write_behind.submit(UPSERT_REVISION_SQL, params)
+        else:
+            self.db.execute(UPSERT_REVISION_SQL, params)
+        return kind
+
+    def _flush(self) -> None:
+        if self.durability == "batched":
+            self.db.write_behind.flush()
+
+    def _rebuild(self, run_id: str, rows: List[Tuple]) -> List[Revision]:
+        revisions: List[Revision] = []
+        draft = ""
+        for topic, iteration, kind, stored, evaluation, created_at in rows:
+            draft = stored if kind == "snapshot" else apply_delta(draft, stored)
+            revisions.append(
+                Revision(
+                    run_id=run_id,
+                    topic=topic,
+                    iteration=iteration,
+                    draft=draft,
+                    evaluation=evaluation,
+                    created_at=datetime.fromisoformat(created_at),
+                )
+            )
+        return revisions
+
+    def get(self, run_id: str, iteration: int) -> Optional[Revision]:
+        """Rebuild a single revision from its nearest snapshot."""
+        self._flush()
+        rows = self.db.query(
+            SELECT_REVISIONS_SQL, (run_id, iteration, run_id, iteration)
+        )
+        revisions = self._rebuild(run_id, rows)
+        if not revisions or revisions[-1].iteration != iteration:
+            return None
+        return revisions[-1]
+
+    def history(self, run_id: str) -> List[Revision]:
+        """Every revision of a run, in iteration order."""
+        self._flush()
+        rows = self.db.query(
+            """SELECT topic, iteration, draft_kind, draft, evaluation, created_at
+               FROM revision_history WHERE run_id = ? ORDER BY iteration;""",
+            (run_id,),
+        )
+        return self._rebuild(run_id, rows)
+
+    def runs(self, topic: str) -> List[str]:
+        """Run ids with a revision history for *topic*, oldest first."""
+        self._flush()
+        return [row[0] for row in self.db.query(SELECT_RUNS_SQL, (topic,))]
+
+    def stats(self, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Stored vs full size of the drafts (overall or for one run)."""
+        self._flush()
+        count, snapshots, full, stored = self.db.query(STATS_SQL, (run_id, run_id))[0]
+        return {
+            "revisions": count,
+            "snapshots": snapshots or 0,
+            "full_bytes": full,
+            "stored_bytes": stored,
+            "ratio": stored / full if full else 0.0,
+        }
@@ -0,0 +1,356 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import openai
+from agno.utils.log import logger
+from pydantic import BaseModel, Field
+
+# Calls closer to a finished publication go first: a queued publish frees
+# a topic, a queued plan only starts one
+PRIORITIES: Dict[str, int] = {
+    "publish": 0,
+    "evaluation": 1,
+    "revision": 2,
+    "draft": 3,
+    "plan": 4,
+}
+# Transient HTTP statuses worth retrying
+RETRYABLE_STATUS = (408, 409, 429, 500, 502, 503, 504)
+WINDOW = 60.0
+
+
+class ModelLimits(BaseModel):
+    """Rate limits of one model (None means unlimited)"""
+
+    rpm: Optional[int] = Field(None, description="Requests per minute")
+    tpm: Optional[int] = Field(None, description="Tokens per minute")
+
+
+# OpenAI usage tier 1; set WORKFLOW_RATE_LIMITS (JSON, e.g.
+# '{"gpt-4.1": {"rpm": 5000, "tpm": 450000}}') for the limits of the account
+DEFAULT_MODEL_LIMITS: Dict[str, ModelLimits] = {
+    "gpt-4.1": ModelLimits(rpm=500, tpm=30_000),
+    "gpt-4.1-mini": ModelLimits(rpm=500, tpm=200_000),
+    "gpt-4.1-nano": ModelLimits(rpm=500, tpm=200_000),
+    "gpt-4o": ModelLimits(rpm=500, tpm=30_000),
+    "gpt-4o-mini": ModelLimits(rpm=500, tpm=200_000),
+    "o4-mini": ModelLimits(rpm=500, tpm=200_000),
+    "o3": ModelLimits(rpm=500, tpm=30_000),
+}
+
+
+def load_limits(raw: Optional[str] = None) -> Dict[str, ModelLimits]:
+    """Default limits updated with the ``WORKFLOW_RATE_LIMITS`` JSON (if any)."""
+    raw = raw if raw is not None else os.getenv("WORKFLOW_RATE_LIMITS")
+    limits = dict(DEFAULT_MODEL_LIMITS)
+    if raw:
+        try:
+            for model_id, values in json.loads(raw).items():
+                limits[model_id] = ModelLimits(**values)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"[Scheduler] Ignoring invalid WORKFLOW_RATE_LIMITS: {e}")
+    return limits
+
+
+def _chain(error: BaseException) -> List[BaseException]:
+    """*error* and the exceptions it was raised from (agno wraps openai's)."""
+    chain = []
+    while error is not None and error not in chain:
+        chain.append(error)
+        error = error.__cause__ or error.__context__
+    return chain
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """HTTP status of a provider error, or 0 for timeouts/connection errors.
+
+    None means the error is not a transient provider error (a bug, a bad
+    request wrapped by agno as a generic 502, ...).
+    """
+    chain = _chain(error)
+    for e in chain:
+        if isinstance(e, (openai.APIConnectionError, TimeoutError)):
+            return 0
+        if isinstance(e, openai.APIStatusError):
+            return e.status_code
+    root = chain[-1]
+    status = getattr(root, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked to wait (``retry-after[-ms]`` headers)."""
+    for e in _chain(error):
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        if not headers:
+            continue
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except ValueError:
+            return None
+    return None
+
+
+def usage_tokens(result: Any) -> Optional[int]:
+    """Input + output tokens of an agent RunResponse, if it reports them."""
+    metrics = getattr(result, "metrics", None)
+    if not isinstance(metrics, dict):
+        return None
+    total = 0
+    for name in ("input_tokens", "output_tokens"):
+        value = metrics.get(name) or 0
+        total += sum(value) if isinstance(value, list) else value
+    return total or None
+
+
+@dataclass
+class CallStats:
+    """What the scheduler did for one call"""
+
+    # Seconds spent queued for a rate-limit slot (all attempts)
+    wait: float = 0.0
+    retries: int = 0
+
+
+class RequestScheduler:
+    """Admission, priorities and retries for the model calls of a process.
+
+    Calls of the same model share sliding one-minute windows of requests and
+    tokens (the estimate at admission, replaced by the real usage when the
+    response reports it). A call waits until its model has room, and while
+    calls wait the one with the highest phase priority (see ``PRIORITIES``)
+    goes first, in arrival order within a priority. Transient provider errors
+    (429, 5xx, timeouts) are retried with jittered exponential backoff; a
+    ``retry-after`` from a 429 pauses every call of that model.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ModelLimits]] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        poll_interval: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        seed: Optional[int] = None,
+    ):
+        self.limits = load_limits() if limits is None else dict(limits)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._random = random.Random(seed)
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        # Per model: [timestamp, tokens] of admitted calls, queued calls as
+        # (priority, seq) and the end of a provider-requested pause
+        self._windows: Dict[str, Deque[List[float]]] = {}
+        self._waiting: Dict[str, List[Tuple[int, int]]] = {}
+        self._paused_until: Dict[str, float] = {}
+        self._stats = {"calls": 0, "retries": 0, "failures": 0, "wait": 0.0}
+
+    # --- admission --- #
+    def _enqueue(self, model_id: str, phase: str) -> Tuple[int, int]:
+        ticket = (PRIORITIES.get(phase, len(PRIORITIES)), next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting.setdefault(model_id, []), ticket)
+        return ticket
+
+    def _dequeue(self, model_id: str, ticket: Tuple[int, int]) -> None:
+        with self._cond:
+            waiting = self._waiting[model_id]
+            if ticket in waiting:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+            self._cond.notify_all()
+
+    def _try_admit(
+        self, model_id: str, ticket: Tuple[int, int], tokens: int
+    ) -> Tuple[Optional[List[float]], Optional[float]]:
+        """Admit the call or tell how long to wait (None: until notified)."""
+        now = self.clock()
+        waiting = self._waiting[model_id]
+        if waiting[0] != ticket:
+            return None, None
+        paused = self._paused_until.get(model_id, 0.0) - now
+        if paused > 0:
+            return None, paused
+        window = self._windows.setdefault(model_id, deque())
+        while window and window[0][0] <= now - WINDOW:
+            window.popleft()
+        limits = self.limits.get(model_id) or ModelLimits()
+        wait = 0.0
+        if limits.rpm and len(window) >= limits.rpm:
+            wait = window[-limits.rpm][0] + WINDOW - now
+        if limits.tpm and window:
+            excess = sum(entry[1] for entry in window) + tokens - limits.tpm
+            for started, used in window:
+                if excess <= 0:
+                    break
+                excess -= used
+                wait = max(wait, started + WINDOW - now)
+        if wait > 0:
+            return None, wait
+        heapq.heappop(waiting)
+        entry = [now, float(tokens)]
+        window.append(entry)
+        self._cond.notify_all()
+        return entry, 0.0
+
+    def acquire(self, model_id: str, phase: str = "", tokens: int = 0) -> List[float]:
+        """Block until the call may be sent; returns its window entry."""
+        ticket = self._enqueue(model_id, phase)
+        try:
+            with self._cond:
+                while True:
+                    entry, wait = self._try_admit(model_id, ticket, tokens)
+                    if entry is not None:
+                        return entry
+                    self._cond.wait(wait)
+        except BaseException:
+            self._dequeue(model_id, ticket)
+            raise
+
+    async def aacquire(
+        self, model_id: str, phase: str = "", tokens: int = 0
+    ) -> List[float]:
+        """Async version of :meth:`acquire` (polls instead of blocking)."""
+        ticket = self._enqueue(model_id, phase)
+        try:
+            while True:
+                with self._cond:
+                    entry, wait = self._try_admit(model_id, ticket, tokens)
+                if entry is not None:
+                    return entry
+                await asyncio.sleep(min(wait or self.poll_interval, self.max_delay))
+        except BaseException:
+            self._dequeue(model_id, ticket)
+            raise
+
+    def _settle(self, entry: List[float], result: Any) -> None:
+        """Charge the real usage of a call instead of its estimate."""
+        tokens = usage_tokens(result)
+        if tokens is not None:
+            with self._cond:
+                entry[1] = float(tokens)
+                self._cond.notify_all()
+
+    # --- retries --- #
+    def _retry_delay(
+        self, model_id: str, error: BaseException, attempt: int
+    ) -> Optional[float]:
+        """Seconds to wait before retrying, or None to give up."""
+        status = error_status(error)
+        if attempt >= self.max_retries or (
+            status is None or (status and status not in RETRYABLE_STATUS)
+        ):
+            return None
+        backoff = min(self.max_delay, self.base_delay * 2**attempt)
+        delay = self._random.uniform(backoff / 2, backoff)
+        hinted = retry_after(error)
+        if hinted is not None:
+            delay = max(delay, min(hinted, self.max_delay))
+            if status == 429:
+                # The limit is shared: hold back every call of this model
+                with self._cond:
+                    until = self.clock() + delay
+                    self._paused_until[model_id] = max(
+                        self._paused_until.get(model_id, 0.0), until
+                    )
+        return delay
+
+    def _failed(
+        self, model_id: str, error: Exception, attempt: int, stats: CallStats
+    ) -> float:
+        delay = self._retry_delay(model_id, error, attempt)
+        if delay is None:
+            with self._cond:
+                self._stats["failures"] += 1
+            raise error
+        stats.retries += 1
+        with self._cond:
+            self._stats["retries"] += 1
+        logger.warning(
+            f"[Scheduler] {model_id} call failed ({error}); retry "
+            f"{attempt + 1}/{self.max_retries} in {delay:.1f}s"
+        )
+        return delay
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        model_id: str = "",
+        phase: str = "",
+        tokens: int = 0,
+        stats: Optional[CallStats] = None,
+    ) -> Any:
+        """Run ``fn()`` when *model_id* has room, retrying transient errors."""
+        stats = stats if stats is not None else CallStats()
+        for attempt in itertools.count():
+            queued = time.perf_counter()
+            entry = self.acquire(model_id, phase, tokens)
+            stats.wait += time.perf_counter() - queued
+            try:
+                result = fn()
+            except Exception as e:
+                time.sleep(self._failed(model_id, e, attempt, stats))
+                continue
+            self._done(entry, result, stats)
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        model_id: str = "",
+        phase: str = "",
+        tokens: int = 0,
+        stats: Optional[CallStats] = None,
+    ) -> Any:
+        """Async version of :meth:`call`; *fn* returns an awaitable."""
+        stats = stats if stats is not None else CallStats()
+        for attempt in itertools.count():
+            queued = time.perf_counter()
+            entry = await self.aacquire(model_id, phase, tokens)
+            stats.wait += time.perf_counter() - queued
+            try:
+                result = await fn()
+            except Exception as e:
+                await asyncio.sleep(self._failed(model_id, e, attempt, stats))
+                continue
+            self._done(entry, result, stats)
+            return result
+
+    def _done(self, entry: List[float], result: Any, stats: CallStats) -> None:
+        self._settle(entry, result)
+        with self._cond:
+            self._stats["calls"] += 1
+            self._stats["wait"] += stats.wait
+
+    # --- introspection --- #
+    def usage(self, model_id: str) -> Dict[str, float]:
+        """Requests and tokens of *model_id* in the current window."""
+        now = self.clock()
+        with self._cond:
+            window = [e for e in self._windows.get(model_id, ()) if e[0] > now - WINDOW]
+        return {"requests": len(window), "tokens": sum(e[1] for e in window)}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return dict(self._stats)
+
+
+# Process-wide scheduler shared by every workflow (and batch topic)
+scheduler = RequestScheduler()
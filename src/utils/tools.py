@@ -1,10 +1,10 @@
 import os
-import difflib
 from rich.syntax import Syntax
 from rich.console import Console
 from rich.panel import Panel
 from agno.tools import Toolkit
 from agno.utils.log import logger
+from .diffs import unified_diff_lines
 
 console = Console()
 
@@ -75,15 +75,7 @@ class FileSystemTools(Toolkit):
         self, original_content: str, new_content: str, path: str
     ) -> str:
         """Internal helper to generate diff, apply changes, and return summary."""
-        diff = list(
-            difflib.unified_diff(
-                original_content.splitlines(keepends=True),
-                new_content.splitlines(keepends=True),
-                fromfile=f"a/{path}",
-                tofile=f"b/{path}",
-                n=3,
-            )
-        )
+        diff = unified_diff_lines(original_content, new_content, path)
 
         if not diff:
             return "No changes detected."